@@ -0,0 +1,84 @@
+"""Local stand-in for the Rownd API shared by the benchmarks."""
+import base64
+import time
+import jwt
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+APP_ID = "app_bench"
+KID = "sig-bench"
+
+
+class Stub:
+    """Serves the auth config, JWKS and user data for one signing key"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.key = Ed25519PrivateKey.generate()
+        self.server = None
+        self.base_url = None
+
+    def token(self, user_id: str = "user_bench") -> str:
+        now = int(time.time())
+        return jwt.encode(
+            {
+                "jti": f"bench-{user_id}",
+                "aud": [f"app:{APP_ID}"],
+                "sub": user_id,
+                "iat": now,
+                "exp": now + 3600,
+                "iss": "https://api.rownd.io",
+                "https://auth.rownd.io/app_user_id": user_id,
+                "https://auth.rownd.io/is_verified_user": True,
+                "https://auth.rownd.io/auth_level": "verified",
+            },
+            self.key,
+            algorithm="EdDSA",
+            headers={"kid": KID},
+        )
+
+    def jwk(self) -> dict:
+        raw = self.key.public_key().public_bytes(
+            serialization.Encoding.Raw, serialization.PublicFormat.Raw
+        )
+        x = base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+        return {"kty": "OKP", "crv": "Ed25519", "alg": "EdDSA", "kid": KID, "x": x}
+
+    def app(self) -> web.Application:
+        import asyncio
+
+        async def config(request):
+            return web.json_response({
+                "issuer": "https://api.rownd.io",
+                "jwks_uri": f"{self.base_url}/hub/auth/keys",
+                "token_endpoint": f"{self.base_url}/hub/auth/token",
+            })
+
+        async def keys(request):
+            return web.json_response({"keys": [self.jwk()]})
+
+        async def user_data(request):
+            await asyncio.sleep(self.latency)
+            user_id = request.match_info["user_id"]
+            return web.json_response({
+                "data": {"user_id": user_id, "email": f"{user_id}@example.com"},
+                "auth_level": "verified",
+                "state": "enabled",
+            })
+
+        app = web.Application()
+        app.router.add_get("/hub/auth/.well-known/oauth-authorization-server", config)
+        app.router.add_get("/hub/auth/keys", keys)
+        app.router.add_get("/applications/{app_id}/users/{user_id}/data", user_data)
+        return app
+
+    async def __aenter__(self):
+        self.server = TestServer(self.app())
+        await self.server.start_server()
+        self.base_url = str(self.server.make_url("")).rstrip("/")
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.server.close()
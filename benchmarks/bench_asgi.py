@@ -0,0 +1,81 @@
+"""Requests/second through the ASGI middleware against a local Rownd stub.
+
+    python benchmarks/bench_asgi.py [requests] [concurrency]
+
+Compares a bare ASGI endpoint, the old pattern of bridging each request
+to the client with ``asyncio.run`` on a worker thread, and the native
+middleware with and without fetching the user.
+"""
+import asyncio
+import sys
+import time
+try:
+    from ._stub import APP_ID, Stub
+except ImportError:  # run as a script, with benchmarks/ on sys.path
+    from _stub import APP_ID, Stub
+from rownd_flask import RowndClient
+from rownd_flask.asgi import RowndMiddleware
+
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def bridged(client):
+    async def app(scope, receive, send):
+        token = dict(scope["headers"])[b"authorization"].decode()[len("Bearer "):]
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, asyncio.run, client.auth.validate_token(token))
+        await endpoint(scope, receive, send)
+    return app
+
+
+async def drive(app, token, requests, concurrency):
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    remaining = requests
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            status = []
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+
+            await app({"type": "http", "path": "/", "headers": headers}, receive, send)
+            assert status == [200], status
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    async with Stub() as stub:
+        client = RowndClient(
+            app_key="key_bench", app_secret="secret_bench", app_id=APP_ID, base_url=stub.base_url
+        )
+        token = stub.token()
+        await client.auth.validate_token(token)  # warm the key and token caches
+
+        for name, app, n in (
+            ("bare endpoint", endpoint, requests),
+            ("asyncio.run bridge", bridged(client), requests // 5),
+            ("middleware", RowndMiddleware(endpoint, client), requests),
+            ("middleware + fetch_user", RowndMiddleware(endpoint, client, fetch_user=True), requests // 5),
+        ):
+            rps = await drive(app, token, n, concurrency)
+            print(f"{name:26s} {rps:10.0f} req/s")
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""Bytes on the wire and client CPU for compressed user and group payloads.
+
+    python benchmarks/bench_compression.py [requests] [rows]
+
+Runs a stub API in a child process, so that ``time.process_time`` here
+only counts the client. Downloads a page of ``rows`` group members with
+each response encoding the client can negotiate, then uploads a user
+with as much data through ``compress_requests``. Response encodings are
+precomputed by the stub; brotli is only tried when it is installed.
+"""
+import asyncio
+import gzip
+import multiprocessing
+import socket
+import sys
+import time
+from aiohttp import web
+from rownd_flask.utils.codec import dumps
+from rownd_flask.utils.http import Transport
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def payloads(rows):
+    page = dumps({"total_results": rows, "results": [
+        {"id": f"member_{i}", "user_id": f"user_{i}", "roles": ["member"], "state": "active",
+         "profile": {"email": f"user_{i}@example.com", "first_name": "Ada", "last_name": "Lovelace"}}
+        for i in range(rows)
+    ]})
+    user = {"data": {f"field_{i}": f"value {i} for user_1" for i in range(rows * 4)}}
+    return page, user
+
+
+def serve(port, rows):
+    page, _ = payloads(rows)
+    encoded = {"identity": page, "gzip": gzip.compress(page, 6)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(page, quality=4)
+    wire = {"bytes": 0}
+
+    async def members(request):
+        accepted = request.headers.get("Accept-Encoding", "")
+        encoding = next((e for e in ("br", "gzip") if e in encoded and e in accepted), "identity")
+        wire["bytes"] += len(encoded[encoding])
+        headers = {"Content-Type": "application/json"}
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return web.Response(body=encoded[encoding], headers=headers)
+
+    async def user(request):
+        wire["bytes"] += int(request.headers["Content-Length"])
+        await request.read()
+        return web.json_response({})
+
+    async def stats(request):
+        sent, wire["bytes"] = wire["bytes"], 0
+        return web.json_response({"bytes": sent})
+
+    app = web.Application(client_max_size=1 << 26)
+    app.router.add_get("/groups/members", members)
+    app.router.add_put("/users/user_1/data", user)
+    app.router.add_get("/stats", stats)
+    web.run_app(app, host="127.0.0.1", port=port, print=None)
+
+
+async def run(transport, n, base, method, path, headers=None, json=None):
+    cpu = time.process_time()
+    for _ in range(n):
+        response = await transport.request(method, base + path, headers=headers, json=json)
+        response.json()
+    cpu = time.process_time() - cpu
+    wire = (await transport.request("GET", f"{base}/stats")).json()["bytes"]
+    return wire / n, cpu / n * 1000
+
+
+def report(name, wire, cpu):
+    print(f"{name:34s} {wire / 1024:9.1f} KiB/request {cpu:7.2f} ms CPU/request")
+
+
+async def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = multiprocessing.Process(target=serve, args=(port, rows), daemon=True)
+    server.start()
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.05)
+        else:
+            writer.close()
+            break
+
+    transport = Transport(coalesce=False, concurrency=False)
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    for encoding in encodings:
+        report(f"download {rows} members, {encoding}", *await run(
+            transport, n, base, "GET", "/groups/members", headers={"Accept-Encoding": encoding},
+        ))
+    await transport.aclose()
+
+    _, user = payloads(rows)
+    for name, threshold in (("upload user, identity", None), ("upload user, gzip", 1024)):
+        transport = Transport(coalesce=False, concurrency=False, compress_requests=threshold)
+        report(name, *await run(transport, n, base, "PUT", "/users/user_1/data", json=user))
+        await transport.aclose()
+    server.terminate()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
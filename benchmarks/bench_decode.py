@@ -0,0 +1,92 @@
+"""Decode time and memory per object for user and group responses.
+
+    python benchmarks/bench_decode.py [objects]
+
+Compares the stdlib ``json`` plus the old ``User.__init__`` (attributes in
+a ``__dict__`` and a second dict of additional fields) with the fast
+decoder (``rownd_flask.utils.codec``) plus the slotted models. Group pages
+used to be returned as raw dicts, so their rows show what the typed
+objects cost on top of decoding: rows are built when first read, so a
+page costs about its decoding until all of its rows are read.
+"""
+import json
+import sys
+import time
+import tracemalloc
+from rownd_flask.models import Group, User
+from rownd_flask.models.base import decode_page
+from rownd_flask.utils.codec import BACKEND, loads
+
+USER = json.dumps({
+    "data": {"user_id": "user_1", "email": "ada@example.com", "first_name": "Ada", "last_name": "Lovelace"},
+    "auth_level": "verified",
+    "state": "enabled",
+    "verified_data": {"email": "ada@example.com"},
+    "groups": [],
+    "meta": {"created": "2024-01-01T00:00:00Z"},
+    "connection_map": {},
+    "rownd_user": "user_1",
+}).encode()
+
+GROUPS = json.dumps({"total_results": 50, "results": [
+    {"id": f"group_{i}", "name": f"Group {i}", "admission_policy": "open", "meta": {}}
+    for i in range(50)
+]}).encode()
+
+
+class LegacyUser:
+    """The previous ``User``: a __dict__ per object plus _additional_fields"""
+
+    def __init__(self, id, **kwargs):
+        self.id = id
+        self.data = kwargs.get('data', {})
+        self.auth_level = kwargs.get('auth_level')
+        self.state = kwargs.get('state')
+        self.verified_data = kwargs.get('verified_data')
+        self.groups = kwargs.get('groups', [])
+        self.meta = kwargs.get('meta', {})
+        self.connection_map = kwargs.get('connection_map', {})
+        self.rownd_user = kwargs.get('rownd_user')
+        self._additional_fields = {
+            k: v for k, v in kwargs.items()
+            if k not in ['data', 'auth_level', 'state', 'verified_data',
+                         'groups', 'meta', 'connection_map', 'rownd_user']
+        }
+
+
+def timed(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def memory_per_object(make, n):
+    """Bytes allocated per object, excluding the decoded payload shared by all"""
+    payload = loads(USER)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [make(payload) for _ in range(n)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objects
+    return (size - n * 8) / n  # minus the list's slot per object
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(f"fast decoder: {BACKEND}")
+    print(f"{'user, json + old User':32s} {timed(lambda: LegacyUser('user_1', **json.loads(USER)), n):7.2f} us")
+    print(f"{'user, fast + slotted User':32s} {timed(lambda: User.from_dict(loads(USER), id='user_1'), n):7.2f} us")
+    print(f"{'50 groups, json + dicts':32s} {timed(lambda: json.loads(GROUPS), n // 50):7.2f} us")
+    print(f"{'50 groups, fast + dicts':32s} {timed(lambda: loads(GROUPS), n // 50):7.2f} us")
+    print(f"{'50 groups, fast + Group':32s} {timed(lambda: decode_page(loads(GROUPS), Group), n // 50):7.2f} us")
+    print(f"{'50 groups, fast + Group, read':32s} "
+          f"{timed(lambda: list(decode_page(loads(GROUPS), Group)['results']), n // 50):7.2f} us")
+    print(f"{'bytes per old User':32s} {memory_per_object(lambda p: LegacyUser('user_1', **p), n):7.0f}")
+    print(f"{'bytes per slotted User':32s} {memory_per_object(lambda p: User.from_dict(p, id='user_1'), n):7.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Pooled HTTP/1.1 against multiplexed HTTP/2 under concurrent load.
+
+    python benchmarks/bench_http2.py [requests] [concurrency] [latency_ms]
+
+Serves user data from a local hypercorn server that speaks both HTTP/1.1
+and plain-text HTTP/2, with a fixed per-request latency, and drives
+``get_user`` through each transport, with GET coalescing off so every
+call is its own request. Reports requests/second and how many
+connections the server saw. Needs ``pip install rownd-flask[http2] hypercorn``.
+"""
+import asyncio
+import socket
+import sys
+import time
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+from rownd_flask import RowndClient
+from rownd_flask.utils.http import Transport
+from rownd_flask.utils.http2 import HTTP2Transport
+
+APP_ID = "app_bench"
+BODY = b'{"data": {"first_name": "Ada", "email": "ada@example.com"}}'
+
+
+def upstream(latency, peers):
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        peers.add(scope["client"])
+        await asyncio.sleep(latency)
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": BODY})
+    return app
+
+
+async def drive(client, requests, concurrency):
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await client.users.get_user("user_bench")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 20) / 1000
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.loglevel = "WARNING"
+    config.h2_max_concurrent_streams = 1000
+    config.keep_alive_max_requests = 10 ** 9
+    peers = set()
+    shutdown = asyncio.Event()
+    server = asyncio.ensure_future(serve(upstream(latency, peers), config, shutdown_trigger=shutdown.wait))
+    await asyncio.sleep(0.5)
+
+    for name, transport in (
+        ("HTTP/1.1 pool", Transport(pool_size=100, concurrency=False, coalesce=False)),
+        ("HTTP/2 multiplexed", HTTP2Transport(
+            pool_size=100, concurrency=False, coalesce=False, prior_knowledge=True,
+        )),
+    ):
+        client = RowndClient(
+            app_key="key_bench", app_secret="secret_bench", app_id=APP_ID,
+            base_url=f"http://127.0.0.1:{port}", transport=transport,
+        )
+        await drive(client, concurrency, concurrency)  # open the connections
+        peers.clear()
+        rps = await drive(client, requests, concurrency)
+        print(f"{name:20s} {rps:10.0f} req/s  {len(peers):4d} connections")
+        await transport.aclose()
+
+    shutdown.set()
+    await server
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
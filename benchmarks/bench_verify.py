@@ -0,0 +1,63 @@
+"""Compare the single-pass EdDSA verifier with the old two-pass jwt.decode path.
+
+    python benchmarks/bench_verify.py [iterations]
+"""
+import sys
+import time
+import timeit
+import jwt
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from rownd_flask.utils.jwt import verify_token
+
+AUDIENCE = "app:app_bench"
+
+
+def two_pass(token, public_key):
+    jwt.get_unverified_header(token)
+    jwt.decode(
+        token, key=public_key, algorithms=["EdDSA"], audience=AUDIENCE,
+        options={"verify_exp": False, "verify_iat": False},
+    )
+    return jwt.decode(
+        token, key=public_key, algorithms=["EdDSA"],
+        options={"verify_aud": False, "require": ["exp", "iat"]},
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    private_key = Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+    now = int(time.time())
+    token = jwt.encode(
+        {
+            "jti": "bench",
+            "aud": [AUDIENCE],
+            "sub": "user_bench",
+            "iat": now,
+            "exp": now + 3600,
+            "iss": "https://api.rownd.io",
+            "https://auth.rownd.io/app_user_id": "user_bench",
+            "https://auth.rownd.io/is_verified_user": True,
+            "https://auth.rownd.io/auth_level": "verified",
+        },
+        private_key,
+        algorithm="EdDSA",
+        headers={"kid": "sig-bench"},
+    )
+    assert two_pass(token, public_key) == verify_token(token, public_key, AUDIENCE)
+
+    results = {}
+    for name, fn in (
+        ("two-pass jwt.decode", lambda: two_pass(token, public_key)),
+        ("single-pass verify_token", lambda: verify_token(token, public_key, AUDIENCE)),
+    ):
+        best = min(timeit.repeat(fn, number=iterations, repeat=5))
+        results[name] = best / iterations * 1e6
+        print(f"{name:28s} {results[name]:8.1f} us/token")
+    baseline, single = results.values()
+    print(f"{'speedup':28s} {baseline / single:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
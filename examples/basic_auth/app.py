@@ -47,16 +47,14 @@ async def test_validate():
     try:
         validation = await app.rownd_client.auth.validate_token(TEST_TOKEN)
         
-        # Extract claims like in Go integration tests
-        user_id = validation.decoded_token.get('https://auth.rownd.io/app_user_id')
-        is_verified = validation.decoded_token.get('https://auth.rownd.io/is_verified_user')
-        auth_level = validation.decoded_token.get('https://auth.rownd.io/auth_level')
+        # Rownd claims are exposed as attributes on validation.claims
+        claims = validation.claims
         
         return jsonify({
             "valid": True,
-            "user_id": user_id,
-            "is_verified": is_verified,
-            "auth_level": auth_level,
+            "user_id": claims.user_id,
+            "is_verified": claims.is_verified,
+            "auth_level": claims.auth_level,
             "decoded_token": validation.decoded_token
         })
     except Exception as e:
@@ -1,3 +1,8 @@
 from .client import RowndClient
+from .decorators import require_auth
+from .extension import RowndFlask
+from .registry import RowndRegistry
+from .revocation import RevocationList
+from .sync import RowndClientSync
 
-__all__ = ['RowndClient']
+__all__ = ['RowndClient', 'RowndClientSync', 'RowndFlask', 'RowndRegistry', 'RevocationList', 'require_auth']
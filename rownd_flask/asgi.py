@@ -0,0 +1,172 @@
+from typing import Any, Dict, Iterable, Optional
+import json
+from .client import RowndClient
+from .exceptions import APIError, AuthenticationError, AuthorizationError, RowndError
+from .models.auth import TokenValidationResponse
+from .models.users import User
+from .policies import Policy
+
+try:
+    from starlette.exceptions import HTTPException
+    from starlette.requests import HTTPConnection
+except ImportError:  # pragma: no cover - starlette is optional
+    HTTPException = None
+    HTTPConnection = Any
+
+# Key under which the middleware stores its results in the ASGI scope
+SCOPE_KEY = "rownd"
+
+
+def _bearer_token(scope: Dict[str, Any]) -> Optional[str]:
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            return value.decode("latin-1").replace("Bearer ", "")
+    return None
+
+
+class RowndMiddleware:
+    """ASGI middleware validating Rownd tokens on the server's own event loop.
+
+    Works with any ASGI framework (Starlette, FastAPI, Quart, ...). On
+    success, ``scope["rownd"]`` holds ``{"token_info": ..., "user": ...}``;
+    the user is only fetched when ``fetch_user`` is set, overlapping with
+    signature verification when ``speculative`` is set. Rejected tokens
+    are answered with the same 401 JSON body as ``require_auth``, and
+    upstream failures (``APIError``, e.g. a JWKS fetch timing out) with a
+    503; either way the request passes through unauthenticated when
+    ``required`` is False.
+    Tokens refused by the claim policy (``min_auth_level``,
+    ``require_verified``, ``allow_anonymous``) get a 403 without their
+    user being fetched.
+    """
+
+    def __init__(
+        self,
+        app,
+        client: RowndClient,
+        fetch_user: bool = False,
+        required: bool = True,
+        exclude_paths: Iterable[str] = (),
+        speculative: bool = False,
+        min_auth_level: Optional[str] = None,
+        require_verified: bool = False,
+        allow_anonymous: bool = True,
+    ):
+        self.app = app
+        self.client = client
+        self.fetch_user = fetch_user
+        self.speculative = speculative
+        self.required = required
+        self.exclude_paths = frozenset(exclude_paths)
+        self.policy = Policy.from_options(min_auth_level, require_verified, allow_anonymous)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket") or scope.get("path") in self.exclude_paths:
+            return await self.app(scope, receive, send)
+
+        token = _bearer_token(scope)
+        if token is None:
+            if self.required:
+                return await self._reject(scope, send, "No authorization header")
+            return await self.app(scope, receive, send)
+
+        try:
+            token_info, user = await self.client.authenticate(
+                token, self.fetch_user, self.speculative, self.policy
+            )
+        except AuthorizationError as e:
+            return await self._reject(scope, send, str(e), status=403)
+        except RowndError as e:
+            if self.required:
+                # An upstream failure is not the token's fault
+                status = 503 if isinstance(e, APIError) else 401
+                return await self._reject(scope, send, str(e), status=status)
+            return await self.app(scope, receive, send)
+
+        scope[SCOPE_KEY] = {"token_info": token_info, "user": user}
+        await self.app(scope, receive, send)
+
+    async def _reject(self, scope, send, message: str, status: int = 401) -> None:
+        if scope["type"] == "websocket":
+            # Closing before accept makes the server answer the handshake with 403
+            await send({"type": "websocket.close", "code": 1008})
+            return
+        body = json.dumps({"error": message}).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        if status == 401:
+            headers.append((b"www-authenticate", b"Bearer"))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+def get_token_info(scope: Dict[str, Any]) -> Optional[TokenValidationResponse]:
+    """Token info the middleware validated for this request, if any"""
+    state = scope.get(SCOPE_KEY)
+    return state["token_info"] if state else None
+
+
+def get_user(scope: Dict[str, Any]) -> Optional[User]:
+    """User the middleware fetched for this request, if any"""
+    state = scope.get(SCOPE_KEY)
+    return state["user"] if state else None
+
+
+class RequireAuth:
+    """Dependency returning the request's token info, e.g. ``Depends(RequireAuth(client))``.
+
+    Reuses the middleware's result when it ran, and otherwise validates
+    the Authorization header itself and memoizes the result on the scope.
+    With ``fetch_user`` it returns ``(token_info, user)`` instead. Errors
+    become a 401 ``HTTPException`` under Starlette/FastAPI, and an
+    ``AuthenticationError`` elsewhere; a token refused by the claim
+    policy becomes a 403 or an ``AuthorizationError``.
+    """
+
+    def __init__(
+        self,
+        client: RowndClient,
+        fetch_user: bool = False,
+        speculative: bool = False,
+        min_auth_level: Optional[str] = None,
+        require_verified: bool = False,
+        allow_anonymous: bool = True,
+    ):
+        self.client = client
+        self.fetch_user = fetch_user
+        self.speculative = speculative
+        self.policy = Policy.from_options(min_auth_level, require_verified, allow_anonymous)
+
+    async def __call__(self, request: HTTPConnection):
+        scope = request.scope
+        try:
+            state = scope.get(SCOPE_KEY)
+            if state is None:
+                token = _bearer_token(scope)
+                if token is None:
+                    raise AuthenticationError("No authorization header")
+                token_info, user = await self.client.authenticate(
+                    token, self.fetch_user, self.speculative, self.policy
+                )
+                state = scope[SCOPE_KEY] = {"token_info": token_info, "user": user}
+            # Decided before any user fetch below
+            if self.policy is not None:
+                self.policy.enforce(state["token_info"])
+            if not self.fetch_user:
+                return state["token_info"]
+            if state["user"] is None:
+                token_info = state["token_info"]
+                state["user"] = await self.client.users.get_user(token_info.user_id, token_info)
+            return state["token_info"], state["user"]
+        except RowndError as e:
+            if HTTPException is not None:
+                if isinstance(e, AuthorizationError):
+                    raise HTTPException(status_code=403, detail=str(e)) from e
+                if isinstance(e, APIError):
+                    raise HTTPException(status_code=503, detail=str(e)) from e
+                raise HTTPException(
+                    status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"}
+                ) from e
+            raise
@@ -1,11 +1,19 @@
-from typing import Optional, Dict, Any
-import aiohttp
-import requests
+from typing import Optional, Dict, Any, Tuple, Union
+import asyncio
+import time
 from .models.auth import TokenValidationResponse, RowndAuth
-from .models.users import RowndUsers
+from .models.jwks import KeyProvider
+from .models.users import RowndUsers, User
 from .models.groups import GroupManager
 from .models.smart_links import SmartLinkManager
 from .exceptions import ConfigurationError, APIError
+from .policies import Policy
+from .revocation import RevocationList
+from .utils.batch import precheck
+from .utils.http import Transport
+from .utils.jwt import parse_unverified
+from .utils.ratelimit import AdaptiveLimiter
+from .utils.retry import RetryPolicy
 
 class RowndClient:
     def __init__(
@@ -14,6 +22,27 @@ class RowndClient:
         app_secret: str,
         app_id: Optional[str] = None,
         base_url: str = "https://api.rownd.io",
+        token_cache_size: int = 1024,
+        negative_cache_size: int = 1024,
+        background_refresh: bool = False,
+        stale_grace: float = 300.0,
+        cache_dir: Optional[str] = None,
+        pool_size: int = 100,
+        pool_per_host: int = 0,
+        keepalive_timeout: float = 30.0,
+        retry: Optional[RetryPolicy] = None,
+        breaker_threshold: int = 5,
+        breaker_reset_timeout: float = 30.0,
+        rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        concurrency: Union[AdaptiveLimiter, bool, None] = None,
+        http2: bool = False,
+        coalesce: bool = True,
+        timeout: Optional[float] = 30.0,
+        compress_requests: Optional[int] = None,
+        pool_hosts: int = 10,
+        transport: Optional[Transport] = None,
+        key_provider: Optional[KeyProvider] = None,
+        revocations: Optional[RevocationList] = None,
     ):
         if not app_key or not app_secret:
             raise ConfigurationError("app_key and app_secret are required")
@@ -22,29 +51,147 @@ class RowndClient:
         self.app_secret = app_secret
         self.app_id = app_id
         self.base_url = base_url
+        self.token_cache_size = token_cache_size
+        self.negative_cache_size = negative_cache_size
+        self.background_refresh = background_refresh
+        self.stale_grace = stale_grace
+        self.cache_dir = cache_dir
+        self.revocations = revocations
         
-        # Initialize HTTP sessions
-        self._session = requests.Session()
-        self._async_session = None
-        
-        # Set default headers
-        self._headers = {
-            "x-rownd-app-key": app_key,
-            "x-rownd-app-secret": app_secret,
-            "Content-Type": "application/json",
-        }
-        self._session.headers.update(self._headers)
+        # One pooled transport for every component, possibly shared with other clients
+        self._owns_transport = transport is None
+        if transport is None:
+            transport_class = Transport
+            if http2:
+                from .utils.http2 import HTTP2Transport as transport_class
+        self._transport = transport or transport_class(
+            pool_size, pool_per_host, keepalive_timeout,
+            retry=retry,
+            breaker_threshold=breaker_threshold,
+            breaker_reset_timeout=breaker_reset_timeout,
+            rate_limits=rate_limits,
+            concurrency=concurrency,
+            coalesce=coalesce,
+            timeout=timeout,
+            compress_requests=compress_requests,
+            pool_hosts=pool_hosts,
+        )
         
         # Initialize components
-        self.auth = RowndAuth(self)
+        self.auth = RowndAuth(self, keys=key_provider)
         self.users = RowndUsers(self)
-        self.groups = GroupManager(base_url, app_key, app_secret)
-        self.smart_links = SmartLinkManager(base_url, app_key, app_secret)
+        self.groups = GroupManager(base_url, app_key, app_secret, transport=self._transport)
+        self.smart_links = SmartLinkManager(base_url, app_key, app_secret, transport=self._transport)
+
+    @property
+    def transport(self) -> Transport:
+        """The HTTP transport every component of this client sends through"""
+        return self._transport
+
+    async def authenticate(
+        self,
+        token: str,
+        fetch_user: bool = False,
+        speculative: bool = False,
+        policy: Optional[Policy] = None,
+    ) -> Tuple[TokenValidationResponse, Optional[User]]:
+        """Validate a token and optionally fetch its user.
+
+        A token already in the cache is answered without awaiting. With
+        ``speculative``, a cold token's user fetch starts from the
+        unverified payload while the signature is checked, so the two
+        overlap, provided the token passes every check short of its
+        signature. The fetch is cancelled if verification fails and redone
+        if the verified token names a different user or app.
+
+        A token refused by ``policy`` raises ``AuthorizationError`` before
+        its user is fetched.
+        """
+        token_info = self.auth.validate_cached(token)
+        if token_info is None:
+            return await self._authenticate_uncached(token, fetch_user, speculative, policy)
+        if policy is not None:
+            policy.enforce(token_info)
+        user = await self.users.get_user(token_info.user_id, token_info) if fetch_user else None
+        return token_info, user
+
+    async def _authenticate_uncached(
+        self, token: str, fetch_user: bool, speculative: bool, policy: Optional[Policy] = None
+    ) -> Tuple[TokenValidationResponse, Optional[User]]:
+        if not (fetch_user and speculative):
+            token_info = await self.auth.validate_token(token)
+            if policy is not None:
+                policy.enforce(token_info)
+            user = await self.users.get_user(token_info.user_id, token_info) if fetch_user else None
+            return token_info, user
+
+        user_id = self._speculative_user_id(token, policy)
+        if user_id is None:
+            return await self._authenticate_uncached(token, fetch_user, False, policy)
+
+        # No token_info: the URL is built from our own app_id, never the unverified aud.
+        # Uncoalesced, so cancelling the fetch aborts the upstream request itself
+        fetch = asyncio.ensure_future(self.users.get_user(user_id, coalesce=False))
+        # Let the fetch put its request on the wire before verifying
+        await asyncio.sleep(0)
+        try:
+            token_info = await self.auth.validate_token(token)
+            if policy is not None:
+                policy.enforce(token_info)
+        except BaseException:
+            fetch.cancel()
+            fetch.add_done_callback(_discard)
+            raise
+        if (token_info.user_id, token_info.claims.app_id or self.app_id) != (user_id, self.app_id):
+            fetch.cancel()
+            fetch.add_done_callback(_discard)
+            return token_info, await self.users.get_user(token_info.user_id, token_info)
+        return token_info, await fetch
+
+    def _speculative_user_id(self, token: str, policy: Optional[Policy] = None) -> Optional[str]:
+        """The user to prefetch for an unverified token, or None not to speculate.
+
+        Only tokens that pass every check short of the signature qualify:
+        not a remembered rejection, addressed to this app, unexpired,
+        signed with a known kid once keys are loaded, and allowed by
+        ``policy`` on its unverified claims. A forged token can
+        then at most cost one read of a user of our own app.
+        """
+        if not self.app_id or self.auth.negative_cache.get(token) is not None:
+            return None
+        kids = self.auth.keys.key_ring.kids() or None
+        if precheck(token, kids, self.auth._audience, time.time()) is not None:
+            return None
+        try:
+            unverified = TokenValidationResponse(parse_unverified(token)[1], token)
+            user_id = unverified.user_id
+        except Exception:
+            return None
+        if policy is not None and policy.check(unverified) is not None:
+            return None
+        if not isinstance(user_id, str) or not user_id or '/' in user_id:
+            return None
+        return user_id
 
     async def __aenter__(self):
-        self._async_session = aiohttp.ClientSession(headers=self._headers)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._async_session:
-            await self._async_session.close()
+        await self.aclose()
+
+    def close(self):
+        """Close the blocking connection pool if this client owns it"""
+        if self._owns_transport:
+            self._transport.close()
+
+    async def aclose(self):
+        """Stop background work and close the transport if this client owns it"""
+        await self.auth.close()
+        if self._owns_transport:
+            await self._transport.aclose()
+
+
+def _discard(task: asyncio.Future) -> None:
+    # Retrieve the outcome of an abandoned fetch so it is never logged as unhandled
+    if not task.cancelled():
+        task.exception()
@@ -1,26 +1,60 @@
 from functools import wraps
-from flask import request, jsonify, current_app
-from .exceptions import RowndError
+from typing import Optional
+import inspect
+from flask import request, jsonify
+from .exceptions import APIError, AuthorizationError, RowndError
+from .extension import get_extension
+from .policies import Policy
+
+def _authenticate(fetch_user: bool, policy: Optional[Policy], kwargs):
+    """Validate the request's token into ``kwargs``, or return an error response"""
+    auth_header = request.headers.get('Authorization')
+    if not auth_header:
+        return jsonify({"error": "No authorization header"}), 401
+
+    token = auth_header.replace('Bearer ', '')
+
+    try:
+        # The policy is decided before the user is fetched
+        token_info, user = get_extension().authenticate(token, fetch_user, policy)
+    except AuthorizationError as e:
+        return jsonify({"error": str(e)}), 403
+    except APIError as e:
+        # Rownd failed or did not answer in time; the token may well be valid
+        return jsonify({"error": str(e)}), 503
+    except RowndError as e:
+        return jsonify({"error": str(e)}), 401
+
+    if fetch_user:
+        kwargs['user'] = user
+    kwargs['token_info'] = token_info
+    return None
+
+def require_auth(
+    fetch_user: bool = False,
+    min_auth_level: Optional[str] = None,
+    require_verified: bool = False,
+    allow_anonymous: bool = True,
+):
+    # Compiled once here, not per request
+    policy = Policy.from_options(min_auth_level, require_verified, allow_anonymous)
 
-def require_auth(fetch_user: bool = False):
     def decorator(f):
+        if inspect.iscoroutinefunction(f):
+            @wraps(f)
+            async def decorated_coroutine(*args, **kwargs):
+                error = _authenticate(fetch_user, policy, kwargs)
+                if error is not None:
+                    return error
+                return await f(*args, **kwargs)
+            return decorated_coroutine
+
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            auth_header = request.headers.get('Authorization')
-            if not auth_header:
-                return jsonify({"error": "No authorization header"}), 401
-
-            token = auth_header.replace('Bearer ', '')
-            
-            try:
-                token_info = current_app.rownd_client.validate_token(token)
-                if fetch_user:
-                    user = current_app.rownd_client.get_user(token_info.user_id)
-                    kwargs['user'] = user
-                kwargs['token_info'] = token_info
-                return f(*args, **kwargs)
-            except RowndError as e:
-                return jsonify({"error": str(e)}), 401
-            
+            error = _authenticate(fetch_user, policy, kwargs)
+            if error is not None:
+                return error
+            return f(*args, **kwargs)
+
         return decorated_function
     return decorator
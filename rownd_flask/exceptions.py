@@ -6,6 +6,10 @@ class AuthenticationError(RowndError):
     """Raised when authentication fails"""
     pass
 
+class AuthorizationError(RowndError):
+    """Raised when a valid token does not satisfy a claim policy"""
+    pass
+
 class APIError(RowndError):
     """Raised when API calls fail"""
     def __init__(self, message: str, status_code: int = None, response: dict = None):
@@ -13,6 +17,14 @@ class APIError(RowndError):
         self.status_code = status_code
         self.response = response
 
+class CircuitOpenError(APIError):
+    """Raised without calling the API while its circuit breaker is open"""
+    pass
+
+class RowndTimeoutError(APIError):
+    """Raised when a call runs out of its deadline"""
+    pass
+
 class ValidationError(RowndError):
     """Raised when validation fails"""
     pass
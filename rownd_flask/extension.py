@@ -0,0 +1,121 @@
+from typing import Any, Optional, Tuple
+from flask import Flask, current_app, g
+from .client import RowndClient
+from .exceptions import ConfigurationError
+from .models.auth import TokenValidationResponse
+from .models.users import User
+from .policies import Policy
+from .utils.loop import get_background_loop
+
+# Per-request memo slots on flask.g
+_TOKEN_INFO = "_rownd_token_info"
+_TOKEN = "_rownd_token"
+_USER = "_rownd_user"
+
+
+class RowndFlask:
+    """Flask extension wiring a ``RowndClient`` into an app.
+
+    The client's coroutines run on one long-lived background event loop,
+    so connection pools and caches survive across requests. Within a
+    request, the token is validated at most once and the user fetched at
+    most once; both are memoized on ``flask.g`` for nested decorators and
+    helpers.
+
+    Configure through ``ROWND_APP_KEY``, ``ROWND_APP_SECRET``,
+    ``ROWND_APP_ID`` and ``ROWND_BASE_URL``, or pass a ready client. With
+    ``speculative`` (or ``ROWND_SPECULATIVE_USER_FETCH``), views that need
+    the user fetch it while the token's signature is being verified.
+    """
+
+    def __init__(
+        self,
+        app: Optional[Flask] = None,
+        client: Optional[RowndClient] = None,
+        speculative: Optional[bool] = None,
+    ):
+        self.client = client
+        self.speculative = speculative
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        if self.client is None:
+            app_key = app.config.get("ROWND_APP_KEY")
+            app_secret = app.config.get("ROWND_APP_SECRET")
+            if not app_key or not app_secret:
+                raise ConfigurationError("ROWND_APP_KEY and ROWND_APP_SECRET must be configured")
+            self.client = RowndClient(
+                app_key=app_key,
+                app_secret=app_secret,
+                app_id=app.config.get("ROWND_APP_ID"),
+                base_url=app.config.get("ROWND_BASE_URL", "https://api.rownd.io"),
+            )
+        if self.speculative is None:
+            self.speculative = bool(app.config.get("ROWND_SPECULATIVE_USER_FETCH", False))
+        app.extensions["rownd"] = self
+        app.rownd_client = self.client
+
+    def run(self, coro, timeout: Optional[float] = None) -> Any:
+        """Run one of the client's coroutines from synchronous code"""
+        return get_background_loop().run(coro, timeout)
+
+    def authenticate(
+        self, token: str, fetch_user: bool = False, policy: Optional[Policy] = None
+    ) -> Tuple[TokenValidationResponse, Optional[User]]:
+        """Validate a token, check ``policy`` and optionally fetch its user, memoized for the request"""
+        token_info = g.get(_TOKEN_INFO)
+        if token_info is None or g.get(_TOKEN) != token:
+            # Warm cache: answer in this thread without hopping to the loop
+            token_info = self.client.auth.validate_cached(token)
+            user = None
+            if token_info is None:
+                token_info, user = self.run(
+                    self.client._authenticate_uncached(token, fetch_user, self.speculative, policy)
+                )
+            setattr(g, _TOKEN, token)
+            setattr(g, _TOKEN_INFO, token_info)
+            setattr(g, _USER, user)
+        if policy is not None:
+            policy.enforce(token_info)
+        if not fetch_user:
+            return token_info, None
+        return token_info, self.get_user(token_info)
+
+    def validate_token(self, token: str) -> TokenValidationResponse:
+        """Validate a token, memoized for the rest of the request"""
+        return self.authenticate(token)[0]
+
+    def get_user(self, token_info: TokenValidationResponse) -> User:
+        """Fetch the token's user, memoized for the rest of the request"""
+        user = g.get(_USER)
+        if user is None or g.get(_TOKEN_INFO) is not token_info:
+            user = self.run(self.client.users.get_user(token_info.user_id, token_info))
+            if g.get(_TOKEN_INFO) is token_info:
+                setattr(g, _USER, user)
+        return user
+
+    def close(self) -> None:
+        """Close the client on the loop its async sessions belong to"""
+        self.run(self.client.aclose())
+
+
+def get_extension() -> RowndFlask:
+    """The current app's extension, created on demand for ``app.rownd_client``"""
+    extension = current_app.extensions.get("rownd")
+    if extension is None:
+        client = getattr(current_app, "rownd_client", None)
+        if client is None:
+            raise ConfigurationError("RowndFlask has not been initialised for this app")
+        extension = RowndFlask(current_app, client=client)
+    return extension
+
+
+def current_token_info() -> Optional[TokenValidationResponse]:
+    """Token info validated earlier in this request, if any"""
+    return g.get(_TOKEN_INFO)
+
+
+def current_user() -> Optional[User]:
+    """User fetched earlier in this request, if any"""
+    return g.get(_USER)
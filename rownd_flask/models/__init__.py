@@ -1,10 +1,11 @@
-from .auth import TokenValidationResponse, AuthTokens, AuthInitRequest, AuthInitResponse, AuthCompleteRequest, AuthCompleteResponse
+from .auth import TokenValidationResponse, TokenClaims, AuthTokens, AuthInitRequest, AuthInitResponse, AuthCompleteRequest, AuthCompleteResponse
 from .users import User, RowndUsers
-from .groups import Group, GroupInvite, GroupManager
+from .groups import Group, GroupInvite, GroupMember, GroupManager
 from .smart_links import SmartLinkManager
 
 __all__ = [
     'TokenValidationResponse',
+    'TokenClaims',
     'AuthTokens',
     'AuthInitRequest',
     'AuthInitResponse',
@@ -14,6 +15,7 @@ __all__ = [
     'RowndUsers',
     'Group',
     'GroupInvite',
+    'GroupMember',
     'GroupManager',
     'SmartLinkManager'
 ]
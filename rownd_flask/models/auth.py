@@ -1,14 +1,24 @@
-from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Iterable, AsyncIterator, Union
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
 from datetime import datetime
 import json
 from base64 import b64decode, urlsafe_b64decode
 import time
-from jwt import decode, get_unverified_header, InvalidTokenError, ExpiredSignatureError, InvalidSignatureError, InvalidAudienceError
-from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+import os
+import asyncio
+import logging
 from ..exceptions import RowndError, AuthenticationError, APIError
+from ..utils.batch import precheck, verify_chunk
+from ..utils.cache import NegativeCache, TokenCache
+from ..utils.jwt import parse_token, verify_parsed
+from .jwks import (
+    KeyProvider, CACHE_TTL, REFRESH_AHEAD, REFRESH_RETRY_INTERVAL, UNKNOWN_KID_REFRESH_INTERVAL
+)
 from .models import TokenValidationResponse, JWKS, WellKnownConfig
-import requests
 
 # Auth level constants
 AUTH_LEVEL_INSTANT = "instant"
@@ -22,6 +32,10 @@ CLAIM_IS_VERIFIED_USER = "https://auth.rownd.io/is_verified_user"
 CLAIM_IS_ANONYMOUS = "https://auth.rownd.io/is_anonymous"
 CLAIM_AUTH_LEVEL = "https://auth.rownd.io/auth_level"
 
+NEGATIVE_CACHE_TTL = 60
+
+logger = logging.getLogger(__name__)
+
 @dataclass
 class AuthTokens:
     access_token: str
@@ -50,10 +64,82 @@ class AuthCompleteRequest:
 class AuthCompleteResponse:
     redirect_url: str
 
+def _audiences(claims: Dict[str, Any]) -> tuple:
+    aud = claims.get('aud')
+    if isinstance(aud, str):
+        return (aud,)
+    if isinstance(aud, list):
+        return tuple(a for a in aud if isinstance(a, str))
+    return ()
+
+def _app_id(claims: Dict[str, Any]) -> Optional[str]:
+    for aud in _audiences(claims):
+        if aud.startswith('app:'):
+            return aud[4:]
+    return None
+
+# How each TokenClaims attribute is derived from the raw claims
+_CLAIM_ACCESSORS = {
+    'user_id': lambda c: c.get(CLAIM_USER_ID),
+    'app_id': _app_id,
+    'auth_level': lambda c: c.get(CLAIM_AUTH_LEVEL),
+    'is_verified': lambda c: bool(c.get(CLAIM_IS_VERIFIED_USER, False)),
+    'is_anonymous': lambda c: bool(c.get(CLAIM_IS_ANONYMOUS, False)),
+    'exp': lambda c: c.get('exp'),
+    'aud': _audiences,
+}
+
+class TokenClaims(Mapping):
+    """Verified token claims with the Rownd-specific ones as attributes.
+
+    Each attribute is computed on first access and stored in its slot, so
+    later reads are plain attribute loads. The raw claims remain available
+    through the read-only mapping interface.
+    """
+
+    __slots__ = ('_raw',) + tuple(_CLAIM_ACCESSORS)
+
+    def __init__(self, raw: Dict[str, Any]):
+        self._raw = raw
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached while a slot is still unset
+        accessor = _CLAIM_ACCESSORS.get(name)
+        if accessor is None:
+            raise AttributeError(name)
+        value = accessor(self._raw)
+        setattr(self, name, value)
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        return self._raw[key]
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __repr__(self) -> str:
+        return f"TokenClaims({self._raw!r})"
+
 @dataclass
 class TokenValidationResponse:
     decoded_token: Dict[str, Any]
     access_token: str
+    claims: Optional[TokenClaims] = field(default=None, repr=False, compare=False)
+    # Policy decisions, kept with the cached validation (see policies.Policy)
+    _decisions: Dict[Any, Optional[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if self.claims is None:
+            self.claims = TokenClaims(self.decoded_token)
+
+    @property
+    def user_id(self) -> Optional[str]:
+        return self.claims.user_id
 
 @dataclass
 class MagicLinkResponse:
@@ -69,148 +155,234 @@ class JWKS:
     keys: list[Dict[str, Any]]
 
 class RowndAuth:
-    def __init__(self, client):
+    def __init__(self, client, keys: Optional[KeyProvider] = None):
         self.app_key = client.app_key
         self.app_secret = client.app_secret
         self.app_id = client.app_id
         self.base_url = client.base_url
-        self._jwks_cache = None
-        self._jwks_cache_time = None
-        self._config_cache = None
-        self._config_cache_time = None
+        self._audience = f"app:{self.app_id}"
+        self.token_cache = TokenCache(getattr(client, 'token_cache_size', 1024))
+        self.negative_cache = NegativeCache(
+            getattr(client, 'negative_cache_size', 1024), NEGATIVE_CACHE_TTL
+        )
+        self._owns_keys = keys is None
+        if keys is None:
+            keys = KeyProvider(
+                self.base_url,
+                stale_grace=getattr(client, 'stale_grace', 300.0),
+                background_refresh=getattr(client, 'background_refresh', False),
+                cache_dir=getattr(client, 'cache_dir', None),
+                app_id=self.app_id,
+                transport=getattr(client, '_transport', None),
+            )
+        self.keys = keys
+        self.keys.register_token_cache(self.token_cache)
+        self.revocations = getattr(client, 'revocations', None)
         self.client = client
 
     async def validate_token(self, token: str) -> TokenValidationResponse:
+        # Replays of a recently rejected token fail fast with the same reason
+        rejected = self.negative_cache.get(token)
+        if rejected is not None:
+            raise AuthenticationError(rejected)
+
         try:
+            if self.keys.background_refresh:
+                self.keys.start_background_refresh()
             config = await self._get_well_known_config()
             jwks = await self._get_jwks(config.jwks_uri)
+
+            cached = self.token_cache.get(token)
+            if cached is not None:
+                self._check_revoked(cached)
+                return cached
             
-            # Get unverified headers to find key ID
+            # Split and decode the header once; the verifier reuses it
             try:
-                headers = get_unverified_header(token)
-            except Exception as e:
-                raise AuthenticationError("Invalid token format")
-
-            if 'kid' not in headers:
-                raise AuthenticationError("No 'kid' in token headers")
+                parsed = parse_token(token)
+                headers = parsed.header
+                if 'kid' not in headers:
+                    raise AuthenticationError("No 'kid' in token headers")
+            except AuthenticationError as e:
+                self.negative_cache.set(token, str(e))
+                raise
 
-            # Find matching key
-            key_data = None
-            for jwk_key in jwks.keys:
-                if jwk_key.get('kid') == headers['kid']:
-                    key_data = jwk_key
-                    break
-
-            if not key_data:
+            public_key = self.keys.key_ring.get(headers['kid'])
+            if public_key is None and await self.keys.refresh_for_unknown_kid(config.jwks_uri):
+                public_key = self.keys.key_ring.get(headers['kid'])
+            if public_key is None:
                 raise AuthenticationError(f"No matching key found for kid: {headers['kid']}")
 
-            # Convert JWK to public key
-            try:
-                padded_x = key_data['x'] + '=' * (-len(key_data['x']) % 4)
-                x = urlsafe_b64decode(padded_x.encode('utf-8'))
-                public_key = Ed25519PublicKey.from_public_bytes(x)
-            except Exception as e:
-                raise AuthenticationError("Invalid key format")
-
+            # An unknown kid is not remembered: a key rotation may yet make it valid
             try:
-                # Verify and decode token
-                decoded_token = decode(
-                    token,
-                    key=public_key,
-                    algorithms=['EdDSA'],
-                    options={
-                        'verify_aud': True,
-                        'verify_exp': False,  # Temporarily disable other validations
-                        'verify_iat': False,
-                        'verify_iss': False,
-                        'require_exp': False,
-                        'require_iat': False,
-                    },
-                    audience=f"app:{self.app_id}"
-                )
-
-                # Now check expiration and other claims
-                decoded_token = decode(
-                    token,
-                    key=public_key,
-                    algorithms=['EdDSA'],
-                    options={
-                        'verify_aud': False,  # Already validated
-                        'verify_exp': True,
-                        'verify_iat': True,
-                        'verify_iss': True,
-                        'require_exp': True,
-                        'require_iat': True,
-                    }
-                )
-            except InvalidAudienceError:
-                raise AuthenticationError("Invalid audience")
-            except ExpiredSignatureError:
-                raise AuthenticationError("Token has expired")
-            except Exception as e:
-                raise AuthenticationError(f"Token validation failed: {str(e)}")
+                decoded_token = verify_parsed(parsed, public_key, self._audience)
+            except AuthenticationError as e:
+                self.negative_cache.set(token, str(e))
+                raise
 
-            return TokenValidationResponse(
+            validation = TokenValidationResponse(
                 decoded_token=decoded_token,
                 access_token=token
             )
+            self.token_cache.set(token, validation, decoded_token['exp'], headers['kid'])
+            self._check_revoked(validation)
+            return validation
 
-        except AuthenticationError:
+        except (AuthenticationError, APIError):
+            # An unreachable or failing upstream says nothing about the token
             raise
         except Exception as e:
             raise AuthenticationError(f"Unexpected error: {str(e)}")
 
-    async def _get_well_known_config(self) -> WellKnownConfig:
-        """Internal method to fetch and cache well-known config"""
-        if (self._config_cache and self._config_cache_time and 
-            (time.time() - self._config_cache_time) < 3600):
-            return self._config_cache
+    def validate_cached(self, token: str) -> Optional[TokenValidationResponse]:
+        """Answer from the token caches alone, without awaiting anything.
+
+        Returns the cached validation, raises for a remembered rejection, or
+        returns None when the caller has to go through ``validate_token``.
+        Lets synchronous callers skip the hop onto an event loop when the
+        cache is warm.
+        """
+        rejected = self.negative_cache.get(token)
+        if rejected is not None:
+            raise AuthenticationError(rejected)
+        if not self.keys.is_fresh():
+            return None
+        cached = self.token_cache.get(token)
+        if cached is not None:
+            self._check_revoked(cached)
+        return cached
+
+    def _check_revoked(self, validation: TokenValidationResponse) -> None:
+        # Checked on cache hits too, so a revocation takes effect immediately
+        reason = self._revoked_reason(validation)
+        if reason is not None:
+            raise AuthenticationError(reason)
+
+    def _revoked_reason(self, validation: TokenValidationResponse) -> Optional[str]:
+        if self.revocations is None:
+            return None
+        return self.revocations.check(validation.claims)
+
+    async def validate_tokens(
+        self,
+        tokens: Iterable[str],
+        chunk_size: int = 256,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> AsyncIterator[Union[TokenValidationResponse, AuthenticationError]]:
+        """Validate many tokens, spreading signature checks across processes.
+
+        Yields one ``TokenValidationResponse`` or ``AuthenticationError`` per
+        input token, in input order. Cache hits and tokens that fail the cheap
+        header/kid/aud/exp checks are answered without touching the pool;
+        the rest are verified in chunks of ``chunk_size`` on ``executor``
+        (a ``ProcessPoolExecutor`` with ``max_workers`` processes by default).
+        ``max_workers`` chunks are kept in flight (the CPU count if unset), so
+        pass it along with your own ``executor`` to match its size. Tokens
+        whose chunk the pool fails to verify get an ``AuthenticationError``.
+        """
+        config = await self._get_well_known_config()
+        await self._get_jwks(config.jwks_uri)
+        audience = self._audience
+        raw_keys = self.keys.key_ring.raw_keys()
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        window = chunk_size * (max_workers or os.cpu_count() or 1)
+        it = iter(tokens)
+        pending = deque()
+        try:
+            # Keep one window in flight while the previous one is drained
+            while True:
+                batch = list(islice(it, window))
+                if batch:
+                    pending.append(self._submit_batch(batch, raw_keys, audience, chunk_size, executor))
+                if pending and (len(pending) > 1 or not batch):
+                    for result in await self._collect_batch(*pending.popleft()):
+                        yield result
+                elif not pending:
+                    break
+        finally:
+            for _, _, futures in pending:
+                for future in futures:
+                    future.cancel()
+            if own_executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit_batch(self, batch, raw_keys, audience, chunk_size, executor):
+        loop = asyncio.get_running_loop()
+        now = time.time()
+        slots = []
+        unverified = []
+        for token in batch:
+            cached = self.token_cache.get(token, now)
+            if cached is not None:
+                reason = self._revoked_reason(cached)
+                slots.append(cached if reason is None else AuthenticationError(reason))
+                continue
+            error = precheck(token, raw_keys, audience, now)
+            if error is not None:
+                slots.append(AuthenticationError(error))
+                continue
+            slots.append(None)
+            unverified.append(token)
+        chunks = [unverified[i:i + chunk_size] for i in range(0, len(unverified), chunk_size)]
+        futures = []
+        for chunk in chunks:
+            try:
+                future = loop.run_in_executor(executor, verify_chunk, raw_keys, audience, chunk)
+            except Exception as e:  # e.g. a pool that was already shut down
+                future = loop.create_future()
+                future.set_exception(e)
+            futures.append(future)
+        return slots, chunks, futures
 
-        url = f"{self.base_url}/hub/auth/.well-known/oauth-authorization-server"
-        response = requests.get(url)
-        if response.status_code != 200:
-            raise APIError("Failed to fetch well-known config")
+    async def _collect_batch(self, slots, chunks, futures):
+        verified = []
+        for chunk, future in zip(chunks, futures):
+            try:
+                results = await future
+            except Exception as e:
+                logger.error(f"Batch verification of {len(chunk)} tokens failed: {e!r}")
+                verified.extend(AuthenticationError(f"Token verification failed: {e}") for _ in chunk)
+                continue
+            for token, (claims, error) in zip(chunk, results):
+                if error is not None:
+                    verified.append(AuthenticationError(error))
+                    continue
+                validation = TokenValidationResponse(decoded_token=claims, access_token=token)
+                kid = parse_token(token).header['kid']
+                self.token_cache.set(token, validation, claims['exp'], kid)
+                reason = self._revoked_reason(validation)
+                verified.append(validation if reason is None else AuthenticationError(reason))
+        verified = iter(verified)
+        return [next(verified) if slot is None else slot for slot in slots]
 
-        config_data = response.json()
-        self._config_cache = WellKnownConfig(**config_data)
-        self._config_cache_time = time.time()
-        return self._config_cache
+    async def _get_well_known_config(self) -> WellKnownConfig:
+        """Internal method to fetch and cache well-known config"""
+        return await self.keys.get_config()
 
     async def _get_jwks(self, jwks_uri: str) -> JWKS:
         """Internal method to fetch and cache JWKS"""
-        if (self._jwks_cache and self._jwks_cache_time and 
-            (time.time() - self._jwks_cache_time) < 3600):
-            return self._jwks_cache
+        return await self.keys.get_jwks(jwks_uri)
 
-        response = requests.get(jwks_uri)
-        if response.status_code != 200:
-            raise APIError("Failed to fetch JWKS")
+    def start_background_refresh(self) -> None:
+        self.keys.start_background_refresh()
 
-        jwks_data = response.json()
-        self._jwks_cache = JWKS(**jwks_data)
-        self._jwks_cache_time = time.time()
-        return self._jwks_cache
+    async def stop_background_refresh(self) -> None:
+        await self.keys.stop_background_refresh()
 
-    def _decode_ed25519_public_key(self, x: str) -> bytes:
-        """Decode EdDSA public key from base64url format"""
-        try:
-            return base64.urlsafe_b64decode(x + '=' * (-len(x) % 4))
-        except Exception as e:
-            raise AuthenticationError(f"Failed to decode public key: {str(e)}")
+    async def close(self) -> None:
+        """Release the key provider unless it is shared with other clients"""
+        if self._owns_keys:
+            await self.keys.close()
 
     async def _make_request(self, method: str, url: str, headers: dict = None) -> dict:
         """Make HTTP request with proper error handling"""
-        try:
-            response = requests.request(
-                method,
-                url,
-                headers=headers
-            )
-            
-            if response.status_code != 200:
-                raise APIError(f"Request failed: {response.text}")
-                
-            return response.json()
+        response = await self.client._transport.request(method, url, headers=headers)
+        
+        if response.status != 200:
+            raise APIError(f"Request failed: {response.text}")
             
-        except requests.RequestException as e:
-            raise APIError(f"Request failed: {str(e)}")
+        return response.json()
@@ -0,0 +1,161 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Tuple
+
+
+class Model(Mapping):
+    """Compact API object with one slot per known field.
+
+    ``from_dict`` fills the slots straight from a decoded response body
+    without copying it; fields the SDK does not know about yet are kept in
+    ``extra`` (``None`` when there are none). For code written against the
+    raw dicts, models also read like a read-only mapping:
+    ``group["name"]`` and ``members.get("roles")`` still work, and
+    ``to_dict()`` gives a plain dict back for serialization.
+
+    Subclasses list their fields in ``_fields`` as ``(name, default)``
+    pairs. A callable default (``dict``, ``list``) is called for a fresh
+    value, and ``_nested`` maps list fields to the model of their items,
+    which are built as a ``ModelList``.
+    """
+    __slots__ = ('extra',)
+    _fields: Tuple[Tuple[str, Any], ...] = ()
+    _nested: Dict[str, type] = {}
+    _names: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._names = frozenset(name for name, _ in cls._fields)
+        cls._build = staticmethod(_compile_builder(cls))
+
+    def __init__(self, **kwargs):
+        for name, default in self._fields:
+            value = kwargs.pop(name) if name in kwargs else (default() if callable(default) else default)
+            setattr(self, name, value)
+        self.extra = kwargs or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], **known: Any) -> "Model":
+        """Build from a decoded response, with ``known`` overriding its fields"""
+        obj = cls._build(data)
+        for name, value in known.items():
+            setattr(obj, name, value)
+        return obj
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {}
+        for name, _ in self._fields:
+            value = getattr(self, name)
+            if name in self._nested and value:
+                value = [item.to_dict() if isinstance(item, Model) else item for item in value]
+            result[name] = value
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._names:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for name, _ in self._fields:
+            yield name
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return len(self._fields) + len(self.extra or ())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name, _ in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+
+class ModelList(Sequence):
+    """Read-only list of models, each built from its dict on first access.
+
+    Building every row of a page up front costs more than decoding it, so
+    rows are only turned into models when read, once each. Iterating the
+    whole list still builds every row. Compares equal to a list of the
+    same models or dicts.
+    """
+    __slots__ = ('_items', '_build')
+
+    def __init__(self, items: List[Any], model: type):
+        # A copy: the decoded response is left as it was
+        self._items = list(items)
+        self._build = model._build
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        item = self._items[index]
+        if type(item) is dict:
+            item = self._items[index] = self._build(item)
+        return item
+
+    def __iter__(self) -> Iterator[Any]:
+        items, build = self._items, self._build
+        for i, item in enumerate(items):
+            if type(item) is dict:
+                item = items[i] = build(item)
+            yield item
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, ModelList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+def decode_page(data: Any, model: type) -> Any:
+    """Decode a response that is either one object or a ``{"results": [...]}`` page.
+
+    A page comes back as a new dict whose ``results`` is a ``ModelList``.
+    """
+    if not isinstance(data, dict):
+        return data
+    results = data.get('results')
+    if isinstance(results, list):
+        page = dict(data)
+        page['results'] = ModelList(results, model)
+        return page
+    return model.from_dict(data)
+
+
+_MISSING = object()
+
+
+def _compile_builder(cls: type) -> Callable[[Dict[str, Any]], Model]:
+    """Generate a function filling ``cls``'s slots from a dict, field by field.
+
+    Straight-line attribute stores run several times faster than looping
+    over the fields with ``setattr``, which matters for large pages.
+    """
+    lines = ["def build(data):", " obj = new(cls)", " get = data.get"]
+    scope = {"new": object.__new__, "cls": cls, "MISSING": _MISSING}
+    for i, (name, default) in enumerate(cls._fields):
+        scope[f"default_{i}"] = default
+        if callable(default):
+            lines.append(f" value = get({name!r}, MISSING)")
+            lines.append(f" obj.{name} = default_{i}() if value is MISSING else value")
+        else:
+            lines.append(f" obj.{name} = get({name!r}, default_{i})")
+    scope["ModelList"] = ModelList
+    for name, model in cls._nested.items():
+        scope[f"model_{name}"] = model
+        lines.append(f" if obj.{name}:")
+        lines.append(f"  obj.{name} = ModelList(obj.{name}, model_{name})")
+    scope["names"] = cls._names
+    lines.append(" obj.extra = None if names.issuperset(data) else "
+                 "{k: v for k, v in data.items() if k not in names}")
+    lines.append(" return obj")
+    exec("\n".join(lines), scope)
+    return scope["build"]
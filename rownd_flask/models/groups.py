@@ -1,60 +1,68 @@
-from dataclasses import dataclass
 from typing import Dict, Any, Optional, List
-import aiohttp
 import logging
 from ..exceptions import APIError
+from ..utils.http import Transport
+from .base import Model, decode_page
 import json
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-@dataclass
-class GroupInvite:
-    id: str
-    group_id: str
-    email: str
-    status: str
-    expires_at: Optional[str] = None
-
-@dataclass
-class Group:
-    id: str
-    name: str
-    description: Optional[str] = None
-    members: Optional[List[Dict[str, Any]]] = None
-    invites: Optional[List[GroupInvite]] = None
-
-@dataclass
-class GroupMember:
-    id: str
-    user_id: str
-    roles: List[str]
-    state: str
-    profile: Optional[Dict[str, Any]] = None
+class GroupInvite(Model):
+    __slots__ = ('id', 'group_id', 'user_id', 'email', 'roles', 'status', 'link', 'expires_at')
+    _fields = (
+        ('id', None),
+        ('group_id', None),
+        ('user_id', None),
+        ('email', None),
+        ('roles', list),
+        ('status', None),
+        ('link', None),
+        ('expires_at', None),
+    )
+
+class GroupMember(Model):
+    __slots__ = ('id', 'user_id', 'roles', 'state', 'profile')
+    _fields = (
+        ('id', None),
+        ('user_id', None),
+        ('roles', list),
+        ('state', None),
+        ('profile', None),
+    )
+
+class Group(Model):
+    __slots__ = ('id', 'name', 'description', 'admission_policy', 'meta', 'members', 'invites')
+    _fields = (
+        ('id', None),
+        ('name', None),
+        ('description', None),
+        ('admission_policy', None),
+        ('meta', dict),
+        ('members', None),
+        ('invites', None),
+    )
+    _nested = {'members': GroupMember, 'invites': GroupInvite}
 
 class GroupManager:
-    def __init__(self, base_url, app_key, app_secret):
+    def __init__(self, base_url, app_key, app_secret, transport=None):
         self.base_url = base_url
         self.headers = {
             "x-rownd-app-key": app_key,
             "x-rownd-app-secret": app_secret,
             "Content-Type": "application/json"
         }
-        self._session = None
-
-    async def _get_session(self):
-        if self._session is None:
-            self._session = aiohttp.ClientSession(headers=self.headers)
-        return self._session
+        # The transport may be shared with other apps, so credentials go per request
+        self._transport = transport or Transport()
 
     async def _handle_response_error(self, response):
         """Handle API error responses with detailed logging"""
         try:
-            error_text = await response.text()
+            error_text = response.text
             logger.debug(f"Raw error response: {error_text}")
             
             try:
-                error_data = await response.json()
+                error_data = response.json()
                 error_message = error_data.get('message', error_text)
                 error_code = error_data.get('code', str(response.status))
                 logger.error(f"Rownd API error: {response.status} - {error_code} - {error_message}")
@@ -69,30 +77,28 @@ class GroupManager:
 
     async def _make_request(self, method, url, json=None):
         """Make API request with error handling and logging"""
-        session = await self._get_session()
         logger.debug(f"Making {method} request to {url}")
         if json:
             logger.debug(f"Request payload: {json}")
             
         try:
-            async with session.request(method, url, json=json) as response:
-                logger.debug(f"Response status: {response.status}")
-                logger.debug(f"Response headers: {response.headers}")
-                
-                if not response.ok:
-                    error_text = await response.text()
-                    logger.debug(f"Error response body: {error_text}")
-                    await self._handle_response_error(response)
-                
-                if response.status == 204:
-                    return True
-                    
-                data = await response.json()
-                logger.debug(f"Response data: {data}")
-                return data
-        except aiohttp.ClientError as e:
-            logger.error(f"HTTP request failed: {e}")
-            raise APIError(f"HTTP request failed: {str(e)}")
+            response = await self._transport.request(method, url, headers=self.headers, json=json)
+        except APIError as e:
+            logger.error(f"{e}")
+            raise
+        logger.debug(f"Response status: {response.status}")
+        logger.debug(f"Response headers: {response.headers}")
+        
+        if not response.ok:
+            logger.debug(f"Error response body: {response.text}")
+            await self._handle_response_error(response)
+        
+        if response.status == 204:
+            return True
+            
+        data = response.json()
+        logger.debug(f"Response data: {data}")
+        return data
 
     async def create_group(self, app_id, name, admission_policy, meta=None):
         url = f"{self.base_url}/applications/{app_id}/groups"
@@ -101,15 +107,15 @@ class GroupManager:
             "admission_policy": admission_policy,
             "meta": meta or {}
         }
-        return await self._make_request("POST", url, json=payload)
+        return decode_page(await self._make_request("POST", url, json=payload), Group)
 
     async def get_group(self, app_id, group_id):
         url = f"{self.base_url}/applications/{app_id}/groups/{group_id}"
-        return await self._make_request("GET", url)
+        return decode_page(await self._make_request("GET", url), Group)
 
     async def list_groups(self, app_id):
         url = f"{self.base_url}/applications/{app_id}/groups"
-        return await self._make_request("GET", url)
+        return decode_page(await self._make_request("GET", url), Group)
 
     async def update_group(self, app_id, group_id, name=None, admission_policy=None, meta=None):
         url = f"{self.base_url}/applications/{app_id}/groups/{group_id}"
@@ -118,7 +124,7 @@ class GroupManager:
             "admission_policy": admission_policy,
             "meta": meta
         }
-        return await self._make_request("PUT", url, json=payload)
+        return decode_page(await self._make_request("PUT", url, json=payload), Group)
 
     async def delete_group(self, app_id, group_id):
         url = f"{self.base_url}/applications/{app_id}/groups/{group_id}"
@@ -131,11 +137,11 @@ class GroupManager:
             "roles": roles,
             "state": state
         }
-        return await self._make_request("POST", url, json=payload)
+        return decode_page(await self._make_request("POST", url, json=payload), GroupMember)
 
     async def list_group_members(self, app_id, group_id):
         url = f"{self.base_url}/applications/{app_id}/groups/{group_id}/members"
-        return await self._make_request("GET", url)
+        return decode_page(await self._make_request("GET", url), GroupMember)
 
     async def update_group_member(self, app_id, group_id, member_id, user_id, roles, state):
         url = f"{self.base_url}/applications/{app_id}/groups/{group_id}/members/{member_id}"
@@ -144,7 +150,7 @@ class GroupManager:
             "roles": roles,
             "state": state
         }
-        return await self._make_request("PUT", url, json=payload)
+        return decode_page(await self._make_request("PUT", url, json=payload), GroupMember)
 
     async def delete_group_member(self, app_id, group_id, member_id):
         url = f"{self.base_url}/applications/{app_id}/groups/{group_id}/members/{member_id}"
@@ -185,7 +191,7 @@ class GroupManager:
         try:
             response = await self._make_request("POST", url, json=payload)
             print(f"\nResponse: {json.dumps(response, indent=2)}\n")
-            return response
+            return decode_page(response, GroupInvite)
         except Exception as e:
             logger.error(f"Failed to create group invite: {e}")
             raise
@@ -0,0 +1,237 @@
+from dataclasses import asdict
+from typing import Optional
+import asyncio
+import logging
+import time
+import weakref
+from ..exceptions import APIError, RowndTimeoutError
+from ..utils.cache import TokenCache
+from ..utils.deadline import detached
+from ..utils.disk_cache import DiskCache
+from ..utils.http import Transport
+from ..utils.jwt import KeyRing
+from ..utils.singleflight import SingleFlight
+from .models import JWKS, WellKnownConfig
+
+# JWKS / well-known config caching
+CACHE_TTL = 3600
+REFRESH_AHEAD = 300
+REFRESH_RETRY_INTERVAL = 30
+UNKNOWN_KID_REFRESH_INTERVAL = 30
+
+logger = logging.getLogger(__name__)
+
+
+class KeyProvider:
+    """Fetches, caches and refreshes the well-known config and JWKS for one base_url.
+
+    Every ``RowndAuth`` talking to the same Rownd deployment can share one
+    provider, and with it one key ring, one set of fetches and one refresh
+    schedule. Token caches registered with the provider are purged of
+    entries whose kid disappears from the JWKS.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        stale_grace: float = 300.0,
+        background_refresh: bool = False,
+        cache_dir: Optional[str] = None,
+        app_id: Optional[str] = None,
+        transport: Optional[Transport] = None,
+    ):
+        self.base_url = base_url
+        self.stale_grace = stale_grace
+        self.background_refresh = background_refresh
+        self._jwks_cache = None
+        self._jwks_cache_time = None
+        self._config_cache = None
+        self._config_cache_time = None
+        self._key_ring = KeyRing()
+        self._flight = SingleFlight()
+        self._owns_transport = transport is None
+        self._transport = transport or Transport()
+        self._token_caches = weakref.WeakSet()
+        self._refresh_task = None
+        self._revalidations = set()
+        self._last_forced_refresh = 0.0
+        self._disk_cache = None
+
+        if cache_dir:
+            self._disk_cache = DiskCache(cache_dir, base_url, app_id)
+            self._load_disk_cache()
+
+    @property
+    def key_ring(self) -> KeyRing:
+        return self._key_ring
+
+    def is_fresh(self) -> bool:
+        """Whether both cached documents can be used without touching the loop"""
+        now = time.time()
+        return (
+            self._config_cache_time is not None and self._jwks_cache_time is not None
+            and now - self._config_cache_time < CACHE_TTL
+            and now - self._jwks_cache_time < CACHE_TTL
+        )
+
+    def register_token_cache(self, token_cache: TokenCache) -> None:
+        self._token_caches.add(token_cache)
+
+    async def get_config(self) -> WellKnownConfig:
+        """Return the well-known config, fetching it if needed"""
+        return await self._get_cached(
+            'config', self._config_cache, self._config_cache_time,
+            self._fetch_well_known_config
+        )
+
+    async def _fetch_well_known_config(self) -> WellKnownConfig:
+        url = f"{self.base_url}/hub/auth/.well-known/oauth-authorization-server"
+        config_data = await self._fetch_json(url, "Failed to fetch well-known config")
+        self._config_cache = WellKnownConfig(**config_data)
+        self._config_cache_time = time.time()
+        if self._disk_cache:
+            self._disk_cache.save(config={
+                'data': asdict(self._config_cache),
+                'fetched_at': self._config_cache_time,
+            })
+        return self._config_cache
+
+    async def get_jwks(self, jwks_uri: str) -> JWKS:
+        """Return the JWKS, fetching it if needed"""
+        return await self._get_cached(
+            ('jwks', jwks_uri), self._jwks_cache, self._jwks_cache_time,
+            lambda: self._fetch_jwks(jwks_uri)
+        )
+
+    async def _get_cached(self, key, cached, fetched_at, fetch):
+        """Serve a cached document, revalidating it in the background once stale.
+
+        Within CACHE_TTL the copy is fresh. Up to ``stale_grace`` seconds past
+        that it is still served while a single background refresh runs, so
+        an expiring cache or an upstream outage costs no request latency.
+        Beyond the grace period callers wait for a (shared) fetch.
+        """
+        if cached is not None and fetched_at is not None:
+            age = time.time() - fetched_at
+            if age < CACHE_TTL:
+                return cached
+            if age < CACHE_TTL + self.stale_grace:
+                self._revalidate(key, fetch)
+                return cached
+        # Concurrent cache misses share a single upstream fetch
+        return await self._flight.do(key, fetch)
+
+    def _revalidate(self, key, fetch) -> None:
+        if self._flight.in_flight(key):
+            return
+        task = detached(asyncio.get_running_loop().create_task, self._flight.do(key, fetch))
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidation_done)
+
+    def _revalidation_done(self, task: asyncio.Task) -> None:
+        self._revalidations.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background refresh failed, serving stale copy: {task.exception()}")
+
+    async def refresh_for_unknown_kid(self, jwks_uri: str) -> bool:
+        """Force a JWKS refresh for an unseen kid, at most once per interval.
+
+        Picks up key rotation straight away without letting a stream of
+        tokens with made-up kids turn into a stream of JWKS fetches. A
+        failed refresh raises its ``APIError``: the kid may be a rotated
+        key, so the token is not rejected on an outage's account.
+        """
+        now = time.time()
+        if now - self._last_forced_refresh < UNKNOWN_KID_REFRESH_INTERVAL:
+            return False
+        self._last_forced_refresh = now
+        await self._flight.do(('jwks', jwks_uri), lambda: self._fetch_jwks(jwks_uri))
+        return True
+
+    def start_background_refresh(self) -> None:
+        """Start renewing config and JWKS ahead of expiry on the running loop"""
+        loop = asyncio.get_running_loop()
+        task = self._refresh_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._refresh_task = detached(loop.create_task, self._refresh_loop())
+
+    async def stop_background_refresh(self) -> None:
+        task, self._refresh_task = self._refresh_task, None
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._next_refresh_delay())
+            try:
+                config = await self._flight.do('config', self._fetch_well_known_config)
+                await self._flight.do(
+                    ('jwks', config.jwks_uri), lambda: self._fetch_jwks(config.jwks_uri)
+                )
+            except Exception as e:
+                logger.warning(f"Background refresh failed, retrying: {e}")
+                await asyncio.sleep(REFRESH_RETRY_INTERVAL)
+
+    def _next_refresh_delay(self) -> float:
+        times = (self._config_cache_time, self._jwks_cache_time)
+        if None in times:
+            return 0
+        return max(0, min(times) + CACHE_TTL - REFRESH_AHEAD - time.time())
+
+    async def _fetch_jwks(self, jwks_uri: str) -> JWKS:
+        jwks_data = await self._fetch_json(jwks_uri, "Failed to fetch JWKS")
+        self._load_jwks(JWKS(**jwks_data))
+        if self._disk_cache:
+            self._disk_cache.save(jwks={
+                'data': jwks_data,
+                'fetched_at': self._jwks_cache_time,
+            })
+        return self._jwks_cache
+
+    def _load_disk_cache(self) -> None:
+        """Seed the in-memory caches from disk if the copies are still usable"""
+        data = self._disk_cache.load()
+        if not data:
+            return
+        usable_since = time.time() - CACHE_TTL - self.stale_grace
+        try:
+            config = data.get('config')
+            if config and config['fetched_at'] > usable_since:
+                self._config_cache = WellKnownConfig(**config['data'])
+                self._config_cache_time = config['fetched_at']
+            jwks = data.get('jwks')
+            if jwks and jwks['fetched_at'] > usable_since:
+                self._load_jwks(JWKS(**jwks['data']), fetched_at=jwks['fetched_at'])
+        except (KeyError, TypeError) as e:
+            logger.warning(f"Ignoring malformed auth cache: {e}")
+
+    async def _fetch_json(self, url: str, error_message: str) -> dict:
+        try:
+            response = await self._transport.request("GET", url)
+        except RowndTimeoutError:
+            raise
+        except APIError as e:
+            raise APIError(f"{error_message}: {str(e)}")
+        if response.status != 200:
+            raise APIError(error_message, status_code=response.status)
+        return response.json()
+
+    async def close(self) -> None:
+        """Stop background refresh and close the transport if it is ours"""
+        await self.stop_background_refresh()
+        if self._owns_transport:
+            await self._transport.aclose()
+
+    def _load_jwks(self, jwks: JWKS, fetched_at: Optional[float] = None) -> None:
+        """Install a JWKS and rebuild the kid-indexed key ring from it"""
+        self._key_ring = KeyRing(jwks.keys)
+        self._jwks_cache = jwks
+        self._jwks_cache_time = time.time() if fetched_at is None else fetched_at
+        # Tokens signed by a rotated-out key must not survive in any cache
+        for token_cache in list(self._token_caches):
+            token_cache.retain_kids(self._key_ring.kids())
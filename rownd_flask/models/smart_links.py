@@ -1,15 +1,16 @@
 from typing import Optional, Dict, Any
-import requests
 from ..exceptions import APIError, RowndError
+from ..utils.http import Transport
 
 class SmartLinkManager:
-    def __init__(self, base_url, app_key, app_secret):
+    def __init__(self, base_url, app_key, app_secret, transport=None):
         self.base_url = base_url
         self.headers = {
             "x-rownd-app-key": app_key,
             "x-rownd-app-secret": app_secret,
             "Content-Type": "application/json"
         }
+        self._transport = transport or Transport()
 
     async def create_magic_link(
         self,
@@ -40,13 +41,9 @@ class SmartLinkManager:
         if group_to_join:
             payload["group_to_join"] = group_to_join
 
-        try:
-            response = requests.post(url, json=payload, headers=self.headers)
-            
-            if response.status_code != 200:
-                raise APIError(f"Failed to create magic link: {response.text}")
-                
-            return response.json()
+        response = await self._transport.request("POST", url, headers=self.headers, json=payload)
+        
+        if response.status != 200:
+            raise APIError(f"Failed to create magic link: {response.text}")
             
-        except requests.RequestException as e:
-            raise APIError(f"Request failed: {str(e)}")
+        return response.json()
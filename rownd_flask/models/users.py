@@ -1,55 +1,44 @@
-from dataclasses import dataclass
 from typing import Dict, Any, Optional
-import json
 from ..exceptions import RowndError, APIError
-import requests
-
-@dataclass
-class User:
-    id: str
-    data: Dict[str, Any]
-    auth_level: Optional[str] = None
-    state: Optional[str] = None
-    verified_data: Optional[Dict[str, Any]] = None
-    groups: Optional[list] = None
-    meta: Optional[Dict[str, Any]] = None
-    connection_map: Optional[Dict[str, Any]] = None
-    rownd_user: Optional[str] = None
-    
+from .base import Model
+
+class User(Model):
+    """A Rownd user; see ``Model`` for fields the SDK does not know yet"""
+    __slots__ = (
+        'id', 'data', 'auth_level', 'state', 'verified_data',
+        'groups', 'meta', 'connection_map', 'rownd_user',
+    )
+    _fields = (
+        ('id', None),
+        ('data', dict),
+        ('auth_level', None),
+        ('state', None),
+        ('verified_data', None),
+        ('groups', list),
+        ('meta', dict),
+        ('connection_map', dict),
+        ('rownd_user', None),
+    )
+
     def __init__(self, id: str, **kwargs):
-        self.id = id
-        # Set known fields
-        self.data = kwargs.get('data', {})
-        self.auth_level = kwargs.get('auth_level')
-        self.state = kwargs.get('state')
-        self.verified_data = kwargs.get('verified_data')
-        self.groups = kwargs.get('groups', [])
-        self.meta = kwargs.get('meta', {})
-        self.connection_map = kwargs.get('connection_map', {})
-        self.rownd_user = kwargs.get('rownd_user')
-        
-        # Store any additional fields that might be added in the future
-        self._additional_fields = {
-            k: v for k, v in kwargs.items() 
-            if k not in ['data', 'auth_level', 'state', 'verified_data', 
-                        'groups', 'meta', 'connection_map', 'rownd_user']
-        }
+        super().__init__(id=id, **kwargs)
+
+    @property
+    def _additional_fields(self) -> Dict[str, Any]:
+        return self.extra or {}
 
 class RowndUsers:
     def __init__(self, client):
         self.client = client
         
-    async def get_user(self, user_id: str, token_info: Optional[Dict[str, Any]] = None) -> User:
-        """Get user details by ID"""
+    async def get_user(
+        self, user_id: str, token_info: Optional[Dict[str, Any]] = None, coalesce: bool = True
+    ) -> User:
+        """Get user details by ID; ``coalesce`` as in ``Transport.request``"""
         # Get app ID from token claims
         app_id = ""
         if token_info and token_info.decoded_token:
-            aud = token_info.decoded_token.get("aud")
-            if isinstance(aud, list) and len(aud) > 0:
-                if aud[0].startswith("app:"):
-                    app_id = aud[0][4:]
-            elif isinstance(aud, str) and aud.startswith("app:"):
-                app_id = aud[4:]
+            app_id = token_info.claims.app_id or ""
 
         # If no app ID in token, use the one from client config
         if not app_id:
@@ -65,15 +54,15 @@ class RowndUsers:
             "Content-Type": "application/json"
         }
 
-        response = requests.get(url, headers=headers)
+        response = await self.client._transport.request("GET", url, headers=headers, coalesce=coalesce)
         
-        if response.status_code == 404:
+        if response.status == 404:
             raise APIError(f"API error: User not found (404)")
-        elif response.status_code != 200:
+        elif response.status != 200:
             raise APIError(f"API error: {response.text}")
 
         user_data = response.json()
-        return User(id=user_id, **user_data)
+        return User.from_dict(user_data, id=user_id)
 
     async def update_user(self, app_id: str, user_id: str, user_data: Dict[str, Any]) -> User:
         """Update or create user"""
@@ -94,9 +83,12 @@ class RowndUsers:
             "Content-Type": "application/json"
         }
 
-        response = requests.put(url, headers=headers, json=payload)
+        # A retried PUT to __UUID__ would create a second user
+        response = await self.client._transport.request(
+            "PUT", url, headers=headers, json=payload, idempotent=not is_new_user
+        )
         
-        if response.status_code != 200:
+        if response.status != 200:
             raise APIError(f"API error: {response.text}")
 
         response_data = response.json()
@@ -107,7 +99,7 @@ class RowndUsers:
             if not user_id:
                 raise APIError(f"No user ID returned for new user. Response: {response_data}")
 
-        return User(id=user_id, **response_data)
+        return User.from_dict(response_data, id=user_id)
 
     async def patch_user(self, app_id: str, user_id: str, data: Dict[str, Any]) -> User:
         """Partially update user data"""
@@ -125,13 +117,13 @@ class RowndUsers:
             "Content-Type": "application/json"
         }
 
-        response = requests.patch(url, headers=headers, json=payload)
+        response = await self.client._transport.request("PATCH", url, headers=headers, json=payload)
         
-        if response.status_code != 200:
+        if response.status != 200:
             raise APIError(f"API error: {response.text}")
 
         user_data = response.json()
-        return User(id=user_id, **user_data)
+        return User.from_dict(user_data, id=user_id)
 
     async def get_user_field(self, app_id: str, user_id: str, field: str) -> Any:
         """Get a specific user field"""
@@ -149,9 +141,9 @@ class RowndUsers:
             "Content-Type": "application/json"
         }
 
-        response = requests.get(url, headers=headers)
+        response = await self.client._transport.request("GET", url, headers=headers)
         
-        if response.status_code != 200:
+        if response.status != 200:
             raise APIError(f"API error: {response.text}")
 
         user_data = response.json()
@@ -173,9 +165,9 @@ class RowndUsers:
             "Content-Type": "application/json"
         }
 
-        response = requests.put(url, headers=headers, json=payload)
+        response = await self.client._transport.request("PUT", url, headers=headers, json=payload)
         
-        if response.status_code not in (200, 204):
+        if response.status not in (200, 204):
             raise APIError(f"API error: {response.text}")
 
     async def delete_user(self, app_id: str, user_id: str) -> None:
@@ -192,7 +184,7 @@ class RowndUsers:
             "x-rownd-app-secret": self.client.app_secret,
         }
 
-        response = requests.delete(url, headers=headers)
+        response = await self.client._transport.request("DELETE", url, headers=headers)
         
-        if response.status_code not in [200, 204]:
+        if response.status not in [200, 204]:
             raise APIError(f"API error: {response.text}")
@@ -0,0 +1,104 @@
+from typing import Any, Callable, Dict, Optional
+from .exceptions import AuthorizationError, ConfigurationError
+from .models.auth import (
+    AUTH_LEVEL_GUEST,
+    AUTH_LEVEL_INSTANT,
+    AUTH_LEVEL_UNVERIFIED,
+    AUTH_LEVEL_VERIFIED,
+    CLAIM_AUTH_LEVEL,
+    CLAIM_IS_ANONYMOUS,
+    CLAIM_IS_VERIFIED_USER,
+    TokenValidationResponse,
+)
+
+# Weakest to strongest
+AUTH_LEVELS = (AUTH_LEVEL_GUEST, AUTH_LEVEL_UNVERIFIED, AUTH_LEVEL_INSTANT, AUTH_LEVEL_VERIFIED)
+
+
+class Policy:
+    """Declarative requirements on a token's Rownd claims.
+
+    Compiled once, at decoration time, into a single predicate over the
+    raw claims dict. Each decision is stored on the validation result, so
+    a token served from the token cache is not re-checked against the
+    same policy until it is evicted.
+    """
+
+    __slots__ = ('min_auth_level', 'require_verified', 'allow_anonymous', '_predicate')
+
+    def __init__(
+        self,
+        min_auth_level: Optional[str] = None,
+        require_verified: bool = False,
+        allow_anonymous: bool = True,
+    ):
+        if min_auth_level is not None and min_auth_level not in AUTH_LEVELS:
+            raise ConfigurationError(
+                f"Unknown auth level {min_auth_level!r}, expected one of {', '.join(AUTH_LEVELS)}"
+            )
+        self.min_auth_level = min_auth_level
+        self.require_verified = require_verified
+        self.allow_anonymous = allow_anonymous
+        self._predicate = self._compile()
+
+    @classmethod
+    def from_options(
+        cls,
+        min_auth_level: Optional[str] = None,
+        require_verified: bool = False,
+        allow_anonymous: bool = True,
+    ) -> Optional['Policy']:
+        """A policy for the given options, or None when they require nothing"""
+        if min_auth_level is None and not require_verified and allow_anonymous:
+            return None
+        return cls(min_auth_level, require_verified, allow_anonymous)
+
+    def _compile(self) -> Callable[[Dict[str, Any]], bool]:
+        levels = None
+        if self.min_auth_level is not None:
+            levels = frozenset(AUTH_LEVELS[AUTH_LEVELS.index(self.min_auth_level):])
+        verified, anonymous = self.require_verified, not self.allow_anonymous
+
+        # Only the checks this policy needs end up in the predicate
+        if levels is not None and not verified and not anonymous:
+            return lambda c: c.get(CLAIM_AUTH_LEVEL) in levels
+        if levels is None and verified and not anonymous:
+            return lambda c: bool(c.get(CLAIM_IS_VERIFIED_USER))
+        if levels is None and not verified and anonymous:
+            return lambda c: not c.get(CLAIM_IS_ANONYMOUS)
+        return lambda c: (
+            (levels is None or c.get(CLAIM_AUTH_LEVEL) in levels)
+            and (not verified or bool(c.get(CLAIM_IS_VERIFIED_USER)))
+            and (not anonymous or not c.get(CLAIM_IS_ANONYMOUS))
+        )
+
+    def check(self, token_info: TokenValidationResponse) -> Optional[str]:
+        """Return why the token is refused, or None if the policy allows it"""
+        decisions = token_info._decisions
+        try:
+            return decisions[self]
+        except KeyError:
+            pass
+        claims = token_info.decoded_token
+        reason = None if self._predicate(claims) else self._explain(claims)
+        decisions[self] = reason
+        return reason
+
+    def enforce(self, token_info: TokenValidationResponse) -> None:
+        """Raise ``AuthorizationError`` if the policy refuses the token"""
+        reason = self.check(token_info)
+        if reason is not None:
+            raise AuthorizationError(reason)
+
+    def _explain(self, claims: Dict[str, Any]) -> str:
+        if not self.allow_anonymous and claims.get(CLAIM_IS_ANONYMOUS):
+            return "Anonymous users are not allowed"
+        if self.require_verified and not claims.get(CLAIM_IS_VERIFIED_USER):
+            return "User is not verified"
+        return f"Auth level {self.min_auth_level} or higher is required"
+
+    def __repr__(self) -> str:
+        return (
+            f"Policy(min_auth_level={self.min_auth_level!r}, "
+            f"require_verified={self.require_verified!r}, allow_anonymous={self.allow_anonymous!r})"
+        )
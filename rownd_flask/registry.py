@@ -0,0 +1,116 @@
+from typing import Any, Dict, Optional, Tuple
+from .client import RowndClient
+from .exceptions import AuthenticationError, ConfigurationError
+from .models.auth import TokenValidationResponse
+from .models.jwks import KeyProvider
+from .utils.http import Transport
+from .utils.jwt import parse_unverified
+
+# RowndClient options that configure the transport shared per base_url
+_TRANSPORT_OPTIONS = (
+    'pool_size', 'pool_per_host', 'keepalive_timeout',
+    'retry', 'breaker_threshold', 'breaker_reset_timeout',
+    'rate_limits', 'concurrency', 'coalesce', 'timeout',
+    'compress_requests', 'pool_hosts',
+)
+
+# RowndClient arguments register() supplies itself, per app or per base_url
+_PER_APP_OPTIONS = (
+    'app_key', 'app_secret', 'app_id', 'base_url', 'transport', 'key_provider',
+)
+
+
+class RowndRegistry:
+    """Many Rownd applications served from one process.
+
+    Clients registered for the same base_url share one ``Transport`` and
+    one ``KeyProvider``, so hundreds of apps cost about the same JWKS
+    fetches, key ring memory and connections as one. Tokens are routed to
+    their app through an index of ``app:<id>`` audiences.
+    """
+
+    def __init__(self, **client_options: Any):
+        clashing = sorted(k for k in _PER_APP_OPTIONS if k in client_options)
+        if clashing:
+            raise ConfigurationError(
+                f"{', '.join(clashing)} cannot be shared; pass app and URL options to register()"
+            )
+        # Options such as stale_grace or background_refresh apply to every app
+        self._client_options = client_options
+        self._shared: Dict[str, Tuple[Transport, KeyProvider]] = {}
+        self._by_audience: Dict[str, RowndClient] = {}
+
+    def register(
+        self,
+        app_key: str,
+        app_secret: str,
+        app_id: str,
+        base_url: str = "https://api.rownd.io",
+    ) -> RowndClient:
+        """Create a client for an app, sharing transport and keys by base_url"""
+        if not app_id:
+            raise ConfigurationError("app_id is required to register an app")
+        audience = f"app:{app_id}"
+        if audience in self._by_audience:
+            raise ConfigurationError(f"App {app_id} is already registered")
+
+        if base_url not in self._shared:
+            transport_class = Transport
+            if self._client_options.get('http2'):
+                from .utils.http2 import HTTP2Transport as transport_class
+            transport = transport_class(**{
+                k: self._client_options[k]
+                for k in _TRANSPORT_OPTIONS
+                if k in self._client_options
+            })
+            keys = KeyProvider(
+                base_url,
+                stale_grace=self._client_options.get('stale_grace', 300.0),
+                background_refresh=self._client_options.get('background_refresh', False),
+                cache_dir=self._client_options.get('cache_dir'),
+                transport=transport,
+            )
+            self._shared[base_url] = (transport, keys)
+        transport, keys = self._shared[base_url]
+
+        client = RowndClient(
+            app_key=app_key,
+            app_secret=app_secret,
+            app_id=app_id,
+            base_url=base_url,
+            transport=transport,
+            key_provider=keys,
+            **self._client_options,
+        )
+        self._by_audience[audience] = client
+        return client
+
+    def get(self, app_id: str) -> Optional[RowndClient]:
+        return self._by_audience.get(f"app:{app_id}")
+
+    def client_for_token(self, token: str) -> RowndClient:
+        """Pick the registered app a token is addressed to.
+
+        The audience is read without verifying the signature; it only
+        selects which app's validation runs, and that validation checks
+        the signature and the audience properly.
+        """
+        _, payload = parse_unverified(token)
+        aud = payload.get('aud')
+        for audience in ([aud] if isinstance(aud, str) else aud or []):
+            client = self._by_audience.get(audience) if isinstance(audience, str) else None
+            if client is not None:
+                return client
+        raise AuthenticationError("Invalid audience")
+
+    async def validate_token(self, token: str) -> TokenValidationResponse:
+        return await self.client_for_token(token).auth.validate_token(token)
+
+    async def close(self) -> None:
+        for transport, keys in self._shared.values():
+            await keys.close()
+            await transport.aclose()
+        self._shared.clear()
+
+    def __len__(self) -> int:
+        return len(self._by_audience)
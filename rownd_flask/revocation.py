@@ -0,0 +1,132 @@
+from bisect import bisect_left
+from heapq import merge
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional
+import asyncio
+import logging
+import threading
+import time
+from .utils.bloom import BloomFilter
+from .utils.deadline import detached
+
+logger = logging.getLogger(__name__)
+
+# Pushed revocations are buffered here before being merged into the sorted array
+_MERGE_THRESHOLD = 4096
+
+
+class RevocationList:
+    """Local denylist of revoked token ids (``jti``) and users.
+
+    Each kind of identifier sits behind its own Bloom filter, so the common
+    "not revoked" answer is a single filter probe. Only possible hits
+    consult the exact store, a sorted list of the revoked jti strings
+    themselves, so a filter hit never rejects a token by accident. A
+    revoked user maps to the time of revocation, and only tokens issued at
+    or before that time are rejected, so the user can sign in again.
+
+    Feed it with pushed updates (``revoke_token`` / ``revoke_user``) or a
+    periodic bulk sync (``replace`` / ``start_sync``). Bloom filters cannot
+    forget entries, so un-revoking happens through a bulk replace.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._sync_task = None
+        self._build((), {})
+
+    def _build(self, jtis: Iterable[str], users: Mapping[str, float]) -> None:
+        revoked = sorted(set(jtis))
+        capacity = max(self.capacity, 2 * len(revoked), 2 * len(users))
+        jti_filter = BloomFilter(capacity, self.error_rate)
+        user_filter = BloomFilter(max(self.capacity // 10, 2 * len(users)), self.error_rate)
+        for jti in jtis:
+            jti_filter.add(jti)
+        for user_id in users:
+            user_filter.add(user_id)
+        with self._lock:
+            self._jti_filter = jti_filter
+            self._user_filter = user_filter
+            self._jtis: List[str] = revoked
+            self._pending = set()
+            self._users = dict(users)
+
+    def revoke_token(self, jti: str) -> None:
+        with self._lock:
+            self._jti_filter.add(jti)
+            self._pending.add(jti)
+            if len(self._pending) >= _MERGE_THRESHOLD:
+                # Duplicates are harmless to the binary search, so no dedup pass
+                self._jtis = list(merge(self._jtis, sorted(self._pending)))
+                self._pending = set()
+
+    def revoke_user(self, user_id: str, revoked_at: Optional[float] = None) -> None:
+        """Reject every token for the user issued at or before ``revoked_at``"""
+        revoked_at = time.time() if revoked_at is None else revoked_at
+        with self._lock:
+            self._user_filter.add(user_id)
+            self._users[user_id] = max(revoked_at, self._users.get(user_id, revoked_at))
+
+    def replace(self, jtis: Iterable[str] = (), users: Optional[Mapping[str, float]] = None) -> None:
+        """Swap in a complete snapshot from a bulk sync"""
+        self._build(list(jtis), users or {})
+
+    def is_revoked(self, jti: Optional[str], user_id: Optional[str], iat: Optional[float]) -> bool:
+        if jti is not None and jti in self._jti_filter and self._has_jti(jti):
+            return True
+        if user_id is not None and user_id in self._user_filter:
+            revoked_at = self._users.get(user_id)
+            if revoked_at is not None and (iat is None or iat <= revoked_at):
+                return True
+        return False
+
+    def _has_jti(self, jti: str) -> bool:
+        with self._lock:
+            if jti in self._pending:
+                return True
+            jtis = self._jtis
+            i = bisect_left(jtis, jti)
+            return i < len(jtis) and jtis[i] == jti
+
+    def check(self, claims: Mapping[str, Any]) -> Optional[str]:
+        """Return a rejection reason if the token's claims are revoked"""
+        if self.is_revoked(claims.get('jti'), getattr(claims, 'user_id', None), claims.get('iat')):
+            return "Token has been revoked"
+        return None
+
+    def start_sync(
+        self,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+        interval: float = 60,
+    ) -> None:
+        """Periodically replace the list with ``await fetch()`` on the running loop.
+
+        ``fetch`` returns ``{"jtis": [...], "users": {user_id: revoked_at}}``.
+        A failed sync keeps the previous snapshot.
+        """
+        loop = asyncio.get_running_loop()
+        if self._sync_task is not None and not self._sync_task.done():
+            self._sync_task.cancel()
+        self._sync_task = detached(loop.create_task, self._sync_loop(fetch, interval))
+
+    async def stop_sync(self) -> None:
+        task, self._sync_task = self._sync_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _sync_loop(self, fetch, interval: float) -> None:
+        while True:
+            try:
+                snapshot = await fetch()
+                self.replace(snapshot.get('jtis', ()), snapshot.get('users'))
+            except Exception as e:
+                logger.warning(f"Revocation sync failed, keeping previous list: {e}")
+            await asyncio.sleep(interval)
+
+    def __len__(self) -> int:
+        return len(self._jtis) + len(self._pending) + len(self._users)
@@ -0,0 +1,136 @@
+from typing import Any, Optional, Tuple
+import functools
+import inspect
+from .client import RowndClient
+from .models.auth import TokenValidationResponse
+from .models.users import User
+from .policies import Policy
+from .utils.http import Transport
+from .utils.loop import get_background_loop
+
+# Plain methods that still need a running loop, so they are called on it
+_LOOP_BOUND = frozenset({"start_background_refresh"})
+
+
+class _SyncProxy:
+    """Blocking view of one async component (auth, users, groups, smart_links).
+
+    Coroutine methods run on the process's background loop and block the
+    calling thread for their result, async generator methods become plain
+    generators stepped on that loop; other attributes are passed through.
+    """
+
+    def __init__(self, target: Any, timeout: Optional[float] = None):
+        self._target = target
+        self._timeout = timeout
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if inspect.iscoroutinefunction(attr):
+            call = _blocking(attr, self._timeout)
+        elif inspect.isasyncgenfunction(attr):
+            call = _iterating(attr, self._timeout)
+        elif name in _LOOP_BOUND:
+            call = _blocking(_on_loop(attr), self._timeout)
+        else:
+            return attr
+        # Cache the wrapper so later lookups skip __getattr__
+        setattr(self, name, call)
+        return call
+
+    def __repr__(self) -> str:
+        return f"<sync {self._target!r}>"
+
+
+def _blocking(method, timeout: Optional[float]):
+    @functools.wraps(method)
+    def call(*args, **kwargs):
+        return get_background_loop().run(method(*args, **kwargs), timeout)
+    return call
+
+
+def _iterating(method, timeout: Optional[float]):
+    @functools.wraps(method)
+    def call(*args, **kwargs):
+        loop = get_background_loop()
+        agen = method(*args, **kwargs)
+        try:
+            while True:
+                try:
+                    item = loop.run(agen.__anext__(), timeout)
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            # Runs the generator's cleanup when the caller stops early
+            loop.run(agen.aclose(), timeout)
+    return call
+
+
+def _on_loop(method):
+    async def call(*args, **kwargs):
+        return method(*args, **kwargs)
+    return call
+
+
+class RowndClientSync:
+    """Blocking facade over ``RowndClient`` for WSGI apps and scripts.
+
+    Mirrors the async API (``auth``, ``users``, ``groups``,
+    ``smart_links`` and ``authenticate``) with plain methods. Every call
+    runs on one long-lived background event loop per process, so
+    connection pools, token and key caches and background refreshes
+    survive across requests, and many threads may call it at once.
+    ``timeout`` bounds how long a call blocks its thread.
+
+    Takes the same arguments as ``RowndClient``, or an existing ``client``,
+    which ``close`` then leaves open for its owner.
+    """
+
+    def __init__(self, *args, client: Optional[RowndClient] = None, timeout: Optional[float] = None, **kwargs):
+        self._owns_client = client is None
+        self.client = client or RowndClient(*args, **kwargs)
+        self.timeout = timeout
+        self.auth = _SyncProxy(self.client.auth, timeout)
+        self.users = _SyncProxy(self.client.users, timeout)
+        self.groups = _SyncProxy(self.client.groups, timeout)
+        self.smart_links = _SyncProxy(self.client.smart_links, timeout)
+
+    @property
+    def transport(self) -> Transport:
+        return self.client.transport
+
+    def run(self, coro, timeout: Optional[float] = None) -> Any:
+        """Run any coroutine on the background loop and wait for its result"""
+        return get_background_loop().run(coro, timeout if timeout is not None else self.timeout)
+
+    def authenticate(
+        self,
+        token: str,
+        fetch_user: bool = False,
+        speculative: bool = False,
+        policy: Optional[Policy] = None,
+    ) -> Tuple[TokenValidationResponse, Optional[User]]:
+        """Validate a token and optionally fetch its user.
+
+        A cached token is answered in the calling thread without a hop to
+        the loop.
+        """
+        if not fetch_user:
+            token_info = self.client.auth.validate_cached(token)
+            if token_info is not None:
+                if policy is not None:
+                    policy.enforce(token_info)
+                return token_info, None
+        return self.run(self.client.authenticate(token, fetch_user, speculative, policy))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Stop background work and close the client's connections if this facade created it"""
+        if self._owns_client:
+            self.run(self.client.aclose())
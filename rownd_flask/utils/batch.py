@@ -0,0 +1,57 @@
+from typing import Any, Dict, List, Optional, Tuple
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+from ..exceptions import AuthenticationError
+from .jwt import parse_unverified, verify_token
+
+# Public keys rebuilt inside each worker process, keyed by their raw bytes
+_worker_keys: Dict[bytes, Ed25519PublicKey] = {}
+
+
+def precheck(token: str, kids, audience: str, now: float) -> Optional[str]:
+    """Cheap structural checks run before any signature verification.
+
+    Returns the rejection message, or None if the token still needs its
+    signature checked. Rejections here use the same messages as
+    ``RowndAuth.validate_token``. ``kids`` of None skips the kid lookup,
+    for callers that have no keys loaded yet.
+    """
+    try:
+        header, payload = parse_unverified(token)
+    except AuthenticationError as e:
+        return str(e)
+    kid = header.get('kid')
+    if kid is None:
+        return "No 'kid' in token headers"
+    if kids is not None and kid not in kids:
+        return f"No matching key found for kid: {kid}"
+    aud = payload.get('aud')
+    if not (aud == audience or (isinstance(aud, list) and audience in aud)):
+        return "Invalid audience"
+    exp = payload.get('exp')
+    if isinstance(exp, (int, float)) and exp <= now:
+        return "Token has expired"
+    return None
+
+
+def verify_chunk(
+    raw_keys: Dict[str, bytes], audience: str, tokens: List[str]
+) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """Verify a chunk of tokens in a worker process.
+
+    Returns ``(claims, None)`` or ``(None, error message)`` per token so that
+    nothing but plain data crosses the process boundary.
+    """
+    results = []
+    for token in tokens:
+        try:
+            header, _ = parse_unverified(token)
+            raw = raw_keys[header['kid']]
+            key = _worker_keys.get(raw)
+            if key is None:
+                key = _worker_keys[raw] = Ed25519PublicKey.from_public_bytes(raw)
+            results.append((verify_token(token, key, audience), None))
+        except AuthenticationError as e:
+            results.append((None, str(e)))
+        except Exception as e:
+            results.append((None, f"Unexpected error: {str(e)}"))
+    return results
@@ -0,0 +1,41 @@
+import math
+
+_MASK64 = (1 << 64) - 1
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings.
+
+    Positions are derived from Python's (per-process, cached) string hash by
+    double hashing, so a probe for an item whose hash is already cached does
+    no hashing work and, for a non-member, usually stops at the first bit.
+    The filter is therefore only meaningful within one process.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.num_bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def add(self, item: str) -> None:
+        h = hash(item) & _MASK64
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        bits, m = self._bits, self.num_bits
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % m
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        h = hash(item) & _MASK64
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        bits, m = self._bits, self.num_bits
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % m
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
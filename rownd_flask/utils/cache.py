@@ -0,0 +1,114 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Any, Iterable, Optional
+import threading
+import time
+
+
+def token_key(token: str) -> bytes:
+    """Hash a raw token so caches never hold bearer credentials"""
+    return sha256(token.encode("utf-8")).digest()
+
+
+@dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class ExpiringLRUCache:
+    """Bounded LRU keyed by token hash whose entries each carry an expiry"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str, now: Optional[float] = None) -> Optional[Any]:
+        if self.maxsize <= 0:
+            return None
+        key = token_key(token)
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, _tag = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _store(self, token: str, value: Any, expires_at: float, tag: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        key = token_key(token)
+        with self._lock:
+            self._entries[key] = (value, expires_at, tag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TokenCache(ExpiringLRUCache):
+    """Bounded LRU cache of successful token validations.
+
+    Entries are keyed by a SHA-256 of the token and carry the token's ``exp``
+    and ``kid`` so that nothing outlives the token itself or a key rotation.
+    """
+
+    def set(self, token: str, value: Any, expires_at: float, kid: str) -> None:
+        self._store(token, value, expires_at, kid)
+
+    def retain_kids(self, kids: Iterable[str]) -> None:
+        """Drop every entry signed by a key that is no longer published"""
+        kids = set(kids)
+        with self._lock:
+            stale = [k for k, (_, _, kid) in self._entries.items() if kid not in kids]
+            for key in stale:
+                del self._entries[key]
+
+
+class NegativeCache(ExpiringLRUCache):
+    """Short-lived memory of rejected tokens and why they were rejected.
+
+    Lets clients replaying the same bad token be turned away in constant
+    time with the original error message. Bounded in both size and age so
+    it cannot be used to exhaust memory.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        super().__init__(maxsize)
+        self.ttl = ttl
+
+    def set(self, token: str, reason: str) -> None:
+        self._store(token, reason, time.time() + self.ttl, None)
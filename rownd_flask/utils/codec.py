@@ -0,0 +1,48 @@
+from typing import Any, Callable
+import json
+
+# The fastest JSON codec installed: orjson, msgspec, then the stdlib
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional speedup
+    msgspec = None
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _with_fallback(encode: Callable[[Any], bytes]) -> Callable[[Any], bytes]:
+    def dumps(obj: Any) -> bytes:
+        try:
+            return encode(obj)
+        except TypeError:
+            # Non-str keys, ints beyond 64 bits, ...: the stdlib accepts more
+            return _json_dumps(obj)
+    return dumps
+
+
+if orjson is not None:
+    loads: Callable[[bytes], Any] = orjson.loads
+    dumps: Callable[[Any], bytes] = _with_fallback(orjson.dumps)
+    BACKEND = "orjson"
+elif msgspec is not None:  # pragma: no cover
+    _decode = msgspec.json.Decoder().decode
+
+    def loads(data: bytes) -> Any:
+        try:
+            return _decode(data)
+        except msgspec.DecodeError as e:
+            # Callers expect the stdlib's ValueError
+            raise ValueError(str(e)) from None
+
+    dumps = _with_fallback(msgspec.json.Encoder().encode)
+    BACKEND = "msgspec"
+else:  # pragma: no cover
+    loads = json.loads
+    dumps = _json_dumps
+    BACKEND = "json"
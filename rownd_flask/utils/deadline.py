@@ -0,0 +1,48 @@
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Iterator, Optional
+import time
+
+# Absolute time.monotonic() by which the current call has to be done
+_deadline: ContextVar[Optional[float]] = ContextVar("rownd_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Cap the total time of every SDK call made inside the block.
+
+    The budget covers retries and their backoff, rate-limit waits, key
+    fetches and user prefetches started from the block; a call that runs
+    out of it raises ``RowndTimeoutError``. Nested blocks can shorten the
+    budget but never extend it. Without a block, each request gets the
+    client's ``timeout``.
+    """
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None and current < at:
+        at = current
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining(default: Optional[float] = None) -> Optional[float]:
+    """Seconds left before the current deadline, or ``default`` if there is none"""
+    at = _deadline.get()
+    if at is None:
+        return default
+    return at - time.monotonic()
+
+
+def detached(fn: Callable[..., Any], *args: Any) -> Any:
+    """Call ``fn`` (typically ``loop.create_task``) outside the current deadline.
+
+    For work that outlives its caller, such as shared fetches and
+    background refreshes, which must not inherit the deadline of whichever
+    call happened to start them.
+    """
+    context = copy_context()
+    context.run(_deadline.set, None)
+    return context.run(fn, *args)
@@ -0,0 +1,60 @@
+from hashlib import sha256
+from typing import Any, Dict, Optional
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """Atomically written JSON file holding the JWKS and well-known config.
+
+    One file per (base_url, app_id) pair so that new worker processes can
+    verify tokens without waiting on the network. Read and write failures
+    are logged and otherwise ignored; the cache is only ever an optimisation.
+    """
+
+    def __init__(self, directory: str, base_url: str, app_id: Optional[str]):
+        digest = sha256(f"{base_url}|{app_id or ''}".encode("utf-8")).hexdigest()[:16]
+        self.directory = directory
+        self.path = os.path.join(directory, f"rownd-auth-{digest}.json")
+        self.base_url = base_url
+        self.app_id = app_id
+        # Saves write from memory, never re-reading a file another process may be replacing
+        self._entries: Dict[str, Any] = {}
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable auth cache {self.path}: {e}")
+            return None
+        if not isinstance(data, dict):
+            logger.warning(f"Ignoring malformed auth cache {self.path}")
+            return None
+        # Guard against hash collisions and hand-copied files
+        if data.get("base_url") != self.base_url or data.get("app_id") != self.app_id:
+            return None
+        self._entries.update(data)
+        return data
+
+    def save(self, **entries: Any) -> None:
+        """Write the entries loaded or saved so far plus these, replacing the file atomically"""
+        self._entries.update(entries, base_url=self.base_url, app_id=self.app_id)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".rownd-auth-")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to write auth cache {self.path}: {e}")
@@ -0,0 +1,423 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+import asyncio
+import gzip
+import logging
+import threading
+import time
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from ..exceptions import APIError, RowndTimeoutError, ValidationError
+from .codec import dumps, loads
+from .deadline import deadline, remaining
+from .ratelimit import AdaptiveLimiter, TokenBucket
+from .retry import (
+    IDEMPOTENT_METHODS,
+    RETRYABLE_STATUSES,
+    CircuitBreaker,
+    RetryBudget,
+    RetryPolicy,
+    endpoint_family,
+    parse_retry_after,
+)
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Cheap enough per request; higher levels cost far more CPU for a few bytes
+COMPRESS_LEVEL = 6
+
+
+@dataclass
+class Response:
+    """A fully read HTTP response, independent of the client library"""
+    status: int
+    body: bytes
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return loads(self.body) if self.body else None
+
+# Headers that decide whose view of a resource a response is
+_AUTH_HEADERS = ('authorization', 'x-rownd-app-key', 'x-rownd-app-secret')
+
+
+def _auth_identity(headers: Optional[Mapping[str, str]]) -> Tuple[Tuple[str, str], ...]:
+    if not headers:
+        return ()
+    return tuple(sorted(
+        (name.lower(), value) for name, value in headers.items() if name.lower() in _AUTH_HEADERS
+    ))
+
+
+
+class Transport:
+    """Keep-alive HTTP connection pools shared by every component of a client.
+
+    Holds one pooled ``requests.Session`` for blocking calls and a lazily
+    created aiohttp session for async ones. ``pool_size`` caps the open
+    connections, ``pool_per_host`` the connections to a single host (0
+    means no extra cap), and ``pool_hosts`` the hosts the blocking pool
+    keeps connections to. Idle async connections are dropped after
+    ``keepalive_timeout`` seconds; the blocking pool keeps them until the
+    server closes them. Neither pool carries per-app default headers, so
+    clients for different apps can share one transport; credentials are
+    passed per request. Each event loop the transport is used from gets
+    its own async session, and the sessions of loops that have since
+    been closed are released.
+
+    Requests are retried according to ``retry`` (see ``RetryPolicy``) and
+    each endpoint family (users, groups, ...) has its own circuit breaker,
+    opened by ``breaker_threshold`` consecutive failures for
+    ``breaker_reset_timeout`` seconds.
+
+    ``rate_limits`` maps endpoint families to ``(requests_per_second,
+    burst)`` token buckets, applied to every attempt. Async calls also go
+    through an adaptive limit on requests in flight: by default one
+    ``AdaptiveLimiter`` per endpoint family, learned independently. Pass
+    a limiter as ``concurrency`` to share one across all families, or
+    ``False`` to disable it.
+
+    Each request, retries included, has to finish within ``timeout``
+    seconds or the deadline of an enclosing ``deadline()`` block, and
+    raises ``RowndTimeoutError`` otherwise.
+
+    With ``coalesce``, identical async GETs (same URL and credentials)
+    that overlap share one upstream request; ``dedup.collapsed`` counts
+    the calls that did not go upstream.
+
+    JSON bodies are serialized once per request, not once per attempt.
+    With ``compress_requests`` set, bodies of at least that many bytes are
+    sent gzipped (``Content-Encoding: gzip``). Compressed responses are
+    negotiated by every backend (gzip and deflate, plus brotli when it is
+    installed) and decompressed as they stream in, so only the decoded
+    body is ever held in full.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 100,
+        pool_per_host: int = 0,
+        keepalive_timeout: float = 30.0,
+        retry: Optional[RetryPolicy] = None,
+        breaker_threshold: int = 5,
+        breaker_reset_timeout: float = 30.0,
+        rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        concurrency: Union[AdaptiveLimiter, bool, None] = None,
+        coalesce: bool = True,
+        timeout: Optional[float] = 30.0,
+        compress_requests: Optional[int] = None,
+        pool_hosts: int = 10,
+    ):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.compress_requests = compress_requests
+        self.pool_per_host = pool_per_host
+        self.pool_hosts = pool_hosts
+        self.keepalive_timeout = keepalive_timeout
+        self.retry = retry or RetryPolicy()
+        self.retry_budget = RetryBudget(self.retry.budget_ratio, self.retry.budget_min_per_second)
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset_timeout = breaker_reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self.rate_limits = {
+            family: TokenBucket(rate, burst) for family, (rate, burst) in (rate_limits or {}).items()
+        }
+        # By default each endpoint family gets its own limiter, like its breaker
+        self._limit_per_family = concurrency is None or concurrency is True
+        self.concurrency = None if self._limit_per_family else (concurrency or None)
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self.dedup = SingleFlight() if coalesce else None
+        self.session = self._make_session()
+        self._async_sessions: Dict[asyncio.AbstractEventLoop, Any] = {}
+
+    def _make_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_hosts, pool_maxsize=self.pool_per_host or self.pool_size
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    async def get_async_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._async_sessions.get(loop)
+        if session is None or self._session_closed(session):
+            self._release_dead_loops()
+            session = self._async_sessions[loop] = self._make_async_session()
+        return session
+
+    def _make_async_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    def _session_closed(self, session: aiohttp.ClientSession) -> bool:
+        return session.closed
+
+    def _release_dead_loops(self) -> None:
+        """Release the sessions of event loops that have been closed"""
+        for loop, session in list(self._async_sessions.items()):
+            if loop.is_closed() and self._async_sessions.pop(loop, None) is session:
+                self._abandon_session(session)
+
+    def _abandon_session(self, session: aiohttp.ClientSession) -> None:
+        # Its loop is closed, so nothing can be awaited; mark both closed
+        connector = session.connector
+        session.detach()
+        if connector is not None:
+            connector._close()
+
+    async def _close_async_session(self, session: aiohttp.ClientSession) -> None:
+        if not session.closed:
+            await session.close()
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """The circuit breaker guarding the endpoint family of ``url``"""
+        family = endpoint_family(url)
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            with self._breakers_lock:
+                breaker = self._breakers.setdefault(family, CircuitBreaker(
+                    family, self.breaker_threshold, self.breaker_reset_timeout
+                ))
+        return breaker
+
+    def limiter(self, url: str) -> Optional[AdaptiveLimiter]:
+        """The concurrency limit applied to ``url``, if any"""
+        if not self._limit_per_family:
+            return self.concurrency
+        family = endpoint_family(url)
+        limiter = self._limiters.get(family)
+        if limiter is None:
+            with self._breakers_lock:
+                limiter = self._limiters.setdefault(
+                    family, AdaptiveLimiter(max_limit=self.pool_size or 256)
+                )
+        return limiter
+
+    def _retry_delay(
+        self, method: str, attempt: int, response: Optional[Response], idempotent: Optional[bool] = None
+    ) -> Optional[float]:
+        """Seconds to wait before retrying, or None to give up"""
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        if not idempotent or attempt + 1 >= self.retry.max_attempts:
+            return None
+        delay = self.retry.backoff(attempt)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers)
+            if retry_after is not None:
+                if retry_after > self.retry.max_retry_after:
+                    return None
+                delay = retry_after
+        left = remaining()
+        if left is not None and delay >= left:
+            logger.debug(f"Not retrying {method}: the deadline is {left:.2f}s away")
+            return None
+        if not self.retry_budget.withdraw():
+            logger.warning(f"Retry budget exhausted, not retrying {method}")
+            return None
+        return delay
+
+    def _record(self, breaker: CircuitBreaker, response: Optional[Response]) -> bool:
+        """Update the breaker and return whether the outcome may be retried"""
+        if response is None or response.status >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response is None or response.status in RETRYABLE_STATUSES
+
+    def _encode(
+        self, headers: Optional[Dict[str, str]], json: Any
+    ) -> Tuple[Optional[Dict[str, str]], Optional[bytes]]:
+        """Serialize a JSON body, gzipping it when it is large enough"""
+        if json is None:
+            return headers, None
+        try:
+            body = dumps(json)
+        except (TypeError, ValueError) as e:
+            raise ValidationError(f"Request body is not JSON serializable: {e}") from e
+        headers = dict(headers or {})
+        if not any(name.lower() == 'content-type' for name in headers):
+            headers['Content-Type'] = 'application/json'
+        if self.compress_requests is not None and len(body) >= self.compress_requests:
+            body = gzip.compress(body, compresslevel=COMPRESS_LEVEL)
+            headers['Content-Encoding'] = 'gzip'
+        return headers, body
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json: Any = None,
+        coalesce: bool = True,
+        idempotent: Optional[bool] = None,
+    ) -> Response:
+        """Send a request on the async pool, with retries, and read the whole response.
+
+        Pass ``coalesce=False`` for a GET whose cancellation has to reach
+        the upstream request rather than leave a shared one running.
+        ``idempotent`` overrides whether the method may be retried, e.g.
+        ``False`` for a PUT that creates a resource.
+        """
+        if not coalesce or self.dedup is None or method != "GET" or json is not None:
+            headers, body = self._encode(headers, json)
+            return await self._request(method, url, headers, body, idempotent)
+        key = (url, _auth_identity(headers))
+        response = await self.dedup.do(key, lambda: self._request(method, url, headers, None, idempotent))
+        # Every caller gets its own Response; the body bytes are immutable
+        return Response(response.status, response.body, response.headers)
+
+    async def _request(self, method, url, headers, body, idempotent=None) -> Response:
+        budget = remaining(self.timeout)
+        if budget is None:
+            return await self._attempts(method, url, headers, body, idempotent)
+        if budget <= 0:
+            raise RowndTimeoutError(f"Deadline exceeded before {method} {url}")
+        # The block makes the absolute deadline visible to the retry logic
+        with deadline(budget):
+            try:
+                return await asyncio.wait_for(
+                    self._attempts(method, url, headers, body, idempotent), budget
+                )
+            except asyncio.TimeoutError:
+                raise RowndTimeoutError(f"{method} {url} timed out after {budget:.2f}s")
+
+    async def _attempts(self, method, url, headers, body, idempotent=None) -> Response:
+        breaker = self.breaker(url)
+        bucket = self.rate_limits.get(endpoint_family(url))
+        self.retry_budget.deposit()
+        attempt = 0
+        while True:
+            breaker.check()
+            if bucket is not None:
+                await bucket.acquire()
+            try:
+                response = await self._send_limited(method, url, headers, body)
+                error = None
+            except APIError as e:
+                response, error = None, e
+            except BaseException:
+                breaker.release()
+                raise
+            retryable = self._record(breaker, response)
+            delay = self._retry_delay(method, attempt, response, idempotent) if retryable else None
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            logger.debug(f"Retrying {method} {url} in {delay:.2f}s (attempt {attempt + 1})")
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _send_limited(self, method, url, headers, body) -> Response:
+        limiter = self.limiter(url)
+        if limiter is None:
+            return await self._send(method, url, headers, body)
+        await limiter.acquire()
+        start, status = time.monotonic(), None
+        try:
+            response = await self._send(method, url, headers, body)
+            status = response.status
+            return response
+        finally:
+            # A request that errored out tells nothing about queueing upstream
+            limiter.release(
+                time.monotonic() - start if status is not None else None, status, endpoint_family(url)
+            )
+
+    async def _send(self, method, url, headers, body) -> Response:
+        session = await self.get_async_session()
+        try:
+            async with session.request(method, url, headers=headers, data=body) as response:
+                return Response(response.status, await response.read(), response.headers)
+        except aiohttp.ClientError as e:
+            raise APIError(f"HTTP request failed: {str(e)}")
+
+    def request_sync(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json: Any = None,
+        idempotent: Optional[bool] = None,
+    ) -> Response:
+        """Send a request on the blocking pool, with retries; ``idempotent`` as in ``request``"""
+        headers, body = self._encode(headers, json)
+        budget = remaining(self.timeout)
+        if budget is None:
+            return self._attempts_sync(method, url, headers, body, idempotent)
+        with deadline(budget):
+            return self._attempts_sync(method, url, headers, body, idempotent)
+
+    def _attempts_sync(self, method, url, headers, body, idempotent=None) -> Response:
+        breaker = self.breaker(url)
+        bucket = self.rate_limits.get(endpoint_family(url))
+        self.retry_budget.deposit()
+        attempt = 0
+        while True:
+            breaker.check()
+            if bucket is not None:
+                bucket.acquire_sync()
+            left = remaining()
+            if left is not None and left <= 0:
+                raise RowndTimeoutError(f"{method} {url} ran out of its deadline")
+            try:
+                response = self._send_sync(method, url, headers, body, left)
+                error = None
+            except APIError as e:
+                response, error = None, e
+            except BaseException:
+                breaker.release()
+                raise
+            retryable = self._record(breaker, response)
+            delay = self._retry_delay(method, attempt, response, idempotent) if retryable else None
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            logger.debug(f"Retrying {method} {url} in {delay:.2f}s (attempt {attempt + 1})")
+            attempt += 1
+            time.sleep(delay)
+
+    def _send_sync(self, method, url, headers, body, timeout=None) -> Response:
+        try:
+            response = self.session.request(method, url, headers=headers, data=body, timeout=timeout)
+        except requests.Timeout:
+            raise RowndTimeoutError(f"{method} {url} timed out")
+        except requests.RequestException as e:
+            raise APIError(f"HTTP request failed: {str(e)}")
+        return Response(response.status_code, response.content, response.headers)
+
+    def close(self) -> None:
+        """Close the blocking pool; use ``aclose`` to also close the async one"""
+        self.session.close()
+
+    async def aclose(self) -> None:
+        """Close the async sessions of every loop, and the blocking pool"""
+        sessions, self._async_sessions = self._async_sessions, {}
+        current = asyncio.get_running_loop()
+        for loop, session in sessions.items():
+            if loop is current:
+                await self._close_async_session(session)
+            elif loop.is_closed():
+                self._abandon_session(session)
+            else:
+                asyncio.run_coroutine_threadsafe(self._close_async_session(session), loop)
+        self.close()
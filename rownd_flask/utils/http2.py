@@ -0,0 +1,71 @@
+from typing import Any, Dict, Optional
+from ..exceptions import APIError, ConfigurationError, RowndTimeoutError
+from .http import Response, Transport
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - the http2 extra is optional
+    httpx = None
+
+
+class HTTP2Transport(Transport):
+    """``Transport`` speaking HTTP/2 through httpx (``pip install rownd-flask[http2]``).
+
+    Concurrent requests to a host are multiplexed as streams over a few
+    connections instead of one connection each. Retries, circuit
+    breakers and rate limits behave exactly as in the HTTP/1.1 transport.
+    HTTP/2 is negotiated with ALPN over TLS; set ``prior_knowledge`` to
+    speak it over plain-text connections to servers known to support it.
+    """
+
+    def __init__(self, *args, prior_knowledge: bool = False, **kwargs):
+        if httpx is None:
+            raise ConfigurationError("HTTP/2 needs httpx: pip install 'rownd-flask[http2]'")
+        self.prior_knowledge = prior_knowledge
+        super().__init__(*args, **kwargs)
+
+    def _make_session(self) -> "httpx.Client":
+        return httpx.Client(**self._client_options())
+
+    def _client_options(self) -> Dict[str, Any]:
+        return {
+            "http1": not self.prior_knowledge,
+            "http2": True,
+            # The transport's deadline bounds every request instead
+            "timeout": None,
+            "limits": httpx.Limits(
+                max_connections=self.pool_size or None,
+                keepalive_expiry=self.keepalive_timeout,
+            ),
+        }
+
+    def _make_async_session(self) -> "httpx.AsyncClient":
+        return httpx.AsyncClient(**self._client_options())
+
+    def _session_closed(self, client: "httpx.AsyncClient") -> bool:
+        return client.is_closed
+
+    def _abandon_session(self, client: "httpx.AsyncClient") -> None:
+        # httpx has no synchronous close; its connections die with their loop
+        pass
+
+    async def _close_async_session(self, client: "httpx.AsyncClient") -> None:
+        if not client.is_closed:
+            await client.aclose()
+
+    async def _send(self, method, url, headers, body) -> Response:
+        client = await self.get_async_session()
+        try:
+            response = await client.request(method, url, headers=headers, content=body)
+        except httpx.HTTPError as e:
+            raise APIError(f"HTTP request failed: {str(e)}")
+        return Response(response.status_code, response.content, response.headers)
+
+    def _send_sync(self, method, url, headers, body, timeout=None) -> Response:
+        try:
+            response = self.session.request(method, url, headers=headers, content=body, timeout=timeout)
+        except httpx.TimeoutException:
+            raise RowndTimeoutError(f"{method} {url} timed out")
+        except httpx.HTTPError as e:
+            raise APIError(f"HTTP request failed: {str(e)}")
+        return Response(response.status_code, response.content, response.headers)
@@ -0,0 +1,170 @@
+from base64 import urlsafe_b64decode
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+import json
+import logging
+import time
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+from ..exceptions import AuthenticationError
+
+logger = logging.getLogger(__name__)
+
+
+def b64url_decode(value: str) -> bytes:
+    """Decode unpadded base64url as used by JWS and JWK"""
+    return urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+
+class KeyRing:
+    """Ready-to-use Ed25519 public keys indexed by ``kid``.
+
+    Keys are decoded once when the JWKS is loaded; anything that is not a
+    well-formed Ed25519 OKP key is dropped here rather than on the hot path.
+    """
+
+    def __init__(self, jwks_keys: Iterable[Dict[str, Any]] = ()):
+        self._keys: Dict[str, Ed25519PublicKey] = {}
+        self._raw: Dict[str, bytes] = {}
+        for jwk in jwks_keys:
+            kid = jwk.get('kid')
+            try:
+                self._raw[kid] = self._load_key(jwk)
+                self._keys[kid] = Ed25519PublicKey.from_public_bytes(self._raw[kid])
+            except ValueError as e:
+                logger.warning(f"Skipping JWKS key {kid!r}: {e}")
+
+    @staticmethod
+    def _load_key(jwk: Dict[str, Any]) -> bytes:
+        if not jwk.get('kid'):
+            raise ValueError("missing kid")
+        if jwk.get('kty') not in (None, 'OKP') or jwk.get('crv') not in (None, 'Ed25519'):
+            raise ValueError(f"unsupported key type {jwk.get('kty')}/{jwk.get('crv')}")
+        if jwk.get('alg') not in (None, 'EdDSA'):
+            raise ValueError(f"unsupported algorithm {jwk.get('alg')}")
+        try:
+            raw = b64url_decode(jwk['x'])
+            Ed25519PublicKey.from_public_bytes(raw)
+            return raw
+        except Exception as e:
+            raise ValueError(f"malformed key material: {e}")
+
+    def get(self, kid: str) -> Optional[Ed25519PublicKey]:
+        return self._keys.get(kid)
+
+    def kids(self):
+        return self._keys.keys()
+
+    def raw_keys(self) -> Dict[str, bytes]:
+        """Raw public key bytes by kid, for shipping to worker processes"""
+        return dict(self._raw)
+
+    def __contains__(self, kid: str) -> bool:
+        return kid in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class ParsedToken(NamedTuple):
+    header: Dict[str, Any]
+    signing_input: bytes
+    payload_segment: str
+    signature: bytes
+
+
+def parse_token(token: str) -> ParsedToken:
+    """Split a compact JWS once and decode its header and signature"""
+    try:
+        header_segment, payload_segment, signature_segment = token.split('.')
+        header = json.loads(b64url_decode(header_segment))
+        signature = b64url_decode(signature_segment)
+    except Exception:
+        raise AuthenticationError("Invalid token format")
+    if not isinstance(header, dict):
+        raise AuthenticationError("Invalid token format")
+    signing_input = f"{header_segment}.{payload_segment}".encode('ascii')
+    return ParsedToken(header, signing_input, payload_segment, signature)
+
+
+def parse_unverified(token: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Decode a JWS header and payload without verifying the signature"""
+    parsed = parse_token(token)
+    try:
+        payload = json.loads(b64url_decode(parsed.payload_segment))
+    except Exception:
+        raise AuthenticationError("Invalid token format")
+    if not isinstance(payload, dict):
+        raise AuthenticationError("Invalid token format")
+    return parsed.header, payload
+
+
+def _numeric_claim(claims: Dict[str, Any], name: str, message: str) -> int:
+    if claims.get(name) is None:
+        raise AuthenticationError(f'Token validation failed: Token is missing the "{name}" claim')
+    try:
+        return int(claims[name])
+    except (ValueError, TypeError, OverflowError):
+        raise AuthenticationError(f"Token validation failed: {message}")
+
+
+def verify_parsed(
+    parsed: ParsedToken,
+    public_key: Ed25519PublicKey,
+    audience: str,
+    issuer: Optional[str] = None,
+    now: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Verify a parsed EdDSA token in a single pass and return its claims.
+
+    Checks run in the same order, and fail with the same messages, as the
+    two ``jwt.decode`` passes this replaces: signature, audience, then
+    exp/iat/nbf/iss.
+    """
+    if parsed.header.get('alg') != 'EdDSA':
+        raise AuthenticationError("Token validation failed: The specified alg value is not allowed")
+    try:
+        public_key.verify(parsed.signature, parsed.signing_input)
+    except InvalidSignature:
+        raise AuthenticationError("Token validation failed: Signature verification failed")
+
+    try:
+        claims = json.loads(b64url_decode(parsed.payload_segment))
+    except Exception as e:
+        raise AuthenticationError(f"Token validation failed: Invalid payload string: {e}")
+    if not isinstance(claims, dict):
+        raise AuthenticationError("Token validation failed: Invalid payload string: must be a json object")
+
+    aud = claims.get('aud')
+    if not aud:
+        raise AuthenticationError('Token validation failed: Token is missing the "aud" claim')
+    if isinstance(aud, str):
+        aud = [aud]
+    if not isinstance(aud, list) or not all(isinstance(a, str) for a in aud):
+        raise AuthenticationError("Invalid audience")
+    if audience not in aud:
+        raise AuthenticationError("Invalid audience")
+
+    now = time.time() if now is None else now
+    exp = _numeric_claim(claims, 'exp', "Expiration Time claim (exp) must be an integer.")
+    iat = _numeric_claim(claims, 'iat', "Issued At claim (iat) must be an integer.")
+    if iat > now:
+        raise AuthenticationError("Token validation failed: The token is not yet valid (iat)")
+    if claims.get('nbf') is not None:
+        try:
+            nbf = int(claims['nbf'])
+        except (ValueError, TypeError, OverflowError):
+            raise AuthenticationError("Token validation failed: Not Before claim (nbf) must be an integer.")
+        if nbf > now:
+            raise AuthenticationError("Token validation failed: The token is not yet valid (nbf)")
+    if exp <= now:
+        raise AuthenticationError("Token has expired")
+    if issuer is not None and claims.get('iss') != issuer:
+        raise AuthenticationError("Token validation failed: Invalid issuer")
+    return claims
+
+
+def verify_token(
+    token: str, public_key: Ed25519PublicKey, audience: str, issuer: Optional[str] = None
+) -> Dict[str, Any]:
+    """Verify an EdDSA access token and return its claims"""
+    return verify_parsed(parse_token(token), public_key, audience, issuer)
@@ -0,0 +1,69 @@
+from typing import Any, Coroutine, Optional
+import asyncio
+import atexit
+import os
+import threading
+
+
+class BackgroundLoop:
+    """An event loop running forever on a daemon thread.
+
+    Lets synchronous code (WSGI views, scripts) drive the async client
+    without building a new loop per call, so aiohttp sessions, in-flight
+    fetches and background refreshes survive across requests.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, name="rownd-event-loop", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and block the calling thread for its result"""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("BackgroundLoop.run() called from its own loop thread")
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stop(self) -> None:
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+
+
+_loop: Optional[BackgroundLoop] = None
+_loop_pid: Optional[int] = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Return this process's shared background loop, starting it if needed.
+
+    A loop inherited across ``fork`` (e.g. gunicorn ``--preload``) has no
+    thread behind it, so each process gets its own.
+    """
+    global _loop, _loop_pid
+    pid = os.getpid()
+    if _loop is None or _loop_pid != pid:
+        with _loop_lock:
+            if _loop is None or _loop_pid != pid:
+                _loop = BackgroundLoop()
+                _loop_pid = pid
+    return _loop
+
+
+@atexit.register
+def _stop_background_loop() -> None:
+    if _loop is not None and _loop_pid == os.getpid():
+        _loop.stop()
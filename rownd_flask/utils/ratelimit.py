@@ -0,0 +1,144 @@
+from collections import deque
+from typing import Dict, List, Optional
+import asyncio
+import threading
+import time
+
+# 429 and 503 mean the API wants less traffic, whatever the latency says
+THROTTLE_STATUSES = frozenset({429, 503})
+# Latency within this much of the best seen is never treated as queueing
+LATENCY_SLACK = 0.010
+# The best latency is forgotten this often so a slower baseline is relearned
+RTT_WINDOW = 30.0
+
+
+class TokenBucket:
+    """Client-side rate limit of ``rate`` requests per second, bursting to ``burst``.
+
+    Callers reserve a token up front and sleep off any deficit outside the
+    lock, so waiting callers are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long to wait until it is valid"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self) -> None:
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+
+class AdaptiveLimiter:
+    """AIMD limit on concurrent requests, driven by latency and throttling.
+
+    Each response that comes back about as fast as the best recent one
+    raises the limit by ``1 / limit`` (one slot per round of requests). A
+    429/503, or a smoothed latency above ``tolerance`` times the best
+    recent one, multiplies it by ``backoff``, at most once per round
+    trip. Latency is only compared with that of the same ``family`` of
+    requests, so a fast endpoint does not make a slower one look like
+    queueing. Waiters may live on different event loops, so the state is
+    guarded by a thread lock and slots are handed over thread-safely.
+    """
+
+    def __init__(
+        self,
+        initial: int = 32,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        backoff: float = 0.5,
+        tolerance: float = 2.0,
+    ):
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.in_flight = 0
+        self.decreases = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+        # [best, when the best was seen, smoothed] latency per family
+        self._rtt: Dict[Optional[str], List[float]] = {}
+        self._last_decrease = 0.0
+
+    async def acquire(self) -> None:
+        with self._lock:
+            if not self._waiters and self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove((loop, future))
+                    granted = False
+                except ValueError:
+                    granted = future.done() and not future.cancelled()
+            if granted:
+                self.release()
+            raise
+
+    def release(
+        self,
+        latency: Optional[float] = None,
+        status: Optional[int] = None,
+        family: Optional[str] = None,
+    ) -> None:
+        """Free a slot, learning from the request's latency and status if given"""
+        with self._lock:
+            if latency is not None:
+                self._update(latency, status, family)
+            self.in_flight -= 1
+            while self._waiters and self.in_flight < int(self.limit):
+                loop, future = self._waiters.popleft()
+                if future.done():
+                    continue
+                self.in_flight += 1
+                loop.call_soon_threadsafe(self._grant, future)
+
+    def _grant(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            # Cancelled after the slot was handed over
+            self.release()
+        else:
+            future.set_result(None)
+
+    def _update(self, latency: float, status: Optional[int], family: Optional[str]) -> None:
+        now = time.monotonic()
+        rtt = self._rtt.get(family)
+        if rtt is None:
+            rtt = self._rtt[family] = [latency, now, latency]
+        elif latency < rtt[0] or now - rtt[1] > RTT_WINDOW:
+            rtt[0], rtt[1] = latency, now
+        smoothed = rtt[2] = 0.8 * rtt[2] + 0.2 * latency
+
+        if status in THROTTLE_STATUSES or smoothed > self.tolerance * rtt[0] + LATENCY_SLACK:
+            if now - self._last_decrease >= smoothed:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+                self.decreases += 1
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
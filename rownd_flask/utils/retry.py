@@ -0,0 +1,151 @@
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+from urllib.parse import urlsplit
+import random
+import threading
+import time
+from ..exceptions import CircuitOpenError
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+_NAMED_PATHS = {"/hub/auth/magic": "magic_links"}
+
+
+def endpoint_family(url: str) -> str:
+    """Group a URL with the others hitting the same API resource.
+
+    ``/applications/{app}/users/...`` becomes ``users``,
+    ``/applications/{app}/groups/...`` becomes ``groups`` and
+    ``/hub/auth/magic`` becomes ``magic_links``; other paths (such as
+    ``/hub/auth/keys``) stand for themselves.
+    """
+    path = urlsplit(url).path
+    parts = path.split('/')
+    if len(parts) > 3 and parts[1] == 'applications':
+        return parts[3]
+    return _NAMED_PATHS.get(path, path)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds to wait according to a ``Retry-After`` header, if any"""
+    value = headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """When and how long to wait before retrying a request.
+
+    Only idempotent methods are retried, after a transport error or a
+    retryable status, with exponential backoff and full jitter. A
+    ``Retry-After`` header overrides the backoff, but a response asking
+    for more than ``max_retry_after`` seconds is returned as is. Retries
+    are drawn from a budget that earns ``budget_ratio`` of a retry per
+    request plus ``budget_min_per_second``, so during an incident retries
+    add at most that fraction of traffic.
+    """
+    max_attempts: int = 3
+    backoff_base: float = 0.1
+    backoff_max: float = 5.0
+    max_retry_after: float = 30.0
+    budget_ratio: float = 0.2
+    budget_min_per_second: float = 1.0
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+class RetryBudget:
+    """Token bucket bounding retries relative to requests"""
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        # Enough for a burst of ten seconds' worth of the floor rate
+        self.capacity = max(1.0, 10 * min_per_second)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed, self._updated = now - self._updated, now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.min_per_second)
+
+    def deposit(self) -> None:
+        """Credit one request"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one retry, or return False if the budget is spent"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class CircuitBreaker:
+    """Fails fast while an endpoint keeps failing.
+
+    Opens after ``threshold`` consecutive failures. After
+    ``reset_timeout`` seconds, a single trial request is let through;
+    its success closes the circuit and its failure re-opens it.
+    """
+
+    def __init__(self, name: str, threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def check(self) -> None:
+        """Raise ``CircuitOpenError`` unless a request may be sent"""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at >= self.reset_timeout and not self._trial:
+                self._trial = True
+                return
+        raise CircuitOpenError(f"Circuit open for {self.name}: failing fast")
+
+    def release(self) -> None:
+        """Give up a trial that ended without an outcome, e.g. by cancellation"""
+        with self._lock:
+            self._trial = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self._opened_at = time.monotonic()
+                self._trial = False
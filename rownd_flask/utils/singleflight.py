@@ -0,0 +1,54 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+from ..exceptions import RowndTimeoutError
+from .deadline import detached, remaining
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution.
+
+    The first caller for a key starts the work; everyone who arrives while it
+    is in flight awaits the same task and receives its result or exception.
+    The shared task is shielded so a cancelled waiter never cancels it for
+    the others. It runs outside the first caller's deadline; each waiter
+    gives up on it when its own deadline passes.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.collapsed = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        task = self._calls.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.collapsed += 1
+            return await self._wait(task)
+
+        self.calls += 1
+        task = detached(loop.create_task, fn())
+        self._calls[key] = task
+        task.add_done_callback(lambda t: self._forget(key, t))
+        return await self._wait(task)
+
+    @staticmethod
+    async def _wait(task: asyncio.Task) -> Any:
+        left = remaining()
+        if left is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), max(left, 0))
+        except asyncio.TimeoutError:
+            raise RowndTimeoutError("Deadline exceeded waiting for a shared request")
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self, key: Hashable) -> bool:
+        task = self._calls.get(key)
+        return task is not None and not task.done()
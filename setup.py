@@ -40,6 +40,15 @@ setup(
 
     ],
     extras_require={
+        "speedups": [
+            "orjson>=3.8.0"
+        ],
+        "http2": [
+            "httpx[http2]>=0.24.0"
+        ],
+        "compression": [
+            "brotli>=1.0.9"
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-asyncio>=0.21.0",
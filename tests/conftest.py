@@ -50,4 +50,171 @@ async def delete_test_user(client, user_id):
             user_id=user_id
         )
     except APIError:
-        pass
\ No newline at end of file
+        pass
+
+# Offline fixtures: a locally generated signing key and a client whose
+# well-known config and JWKS are pre-seeded so no network is needed.
+OFFLINE_APP_ID = "app_offline"
+OFFLINE_KID = "sig-offline"
+
+@pytest.fixture
+def signing_key():
+    """Generate an Ed25519 key pair for signing test tokens"""
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+    return Ed25519PrivateKey.generate()
+
+def jwk_for(private_key, kid=OFFLINE_KID):
+    """Build the public JWK for an Ed25519 private key"""
+    import base64
+    from cryptography.hazmat.primitives import serialization
+    raw = private_key.public_key().public_bytes(
+        serialization.Encoding.Raw, serialization.PublicFormat.Raw
+    )
+    x = base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+    return {"kty": "OKP", "crv": "Ed25519", "alg": "EdDSA", "kid": kid, "x": x}
+
+@pytest.fixture
+def make_token(signing_key):
+    """Factory that signs tokens with the offline key"""
+    import time
+    import jwt
+
+    def _make(kid=OFFLINE_KID, key=None, **overrides):
+        now = int(time.time())
+        claims = {
+            "jti": "test-jti",
+            "aud": [f"app:{OFFLINE_APP_ID}"],
+            "sub": "user_offline",
+            "iat": now,
+            "exp": now + 3600,
+            "iss": "https://api.rownd.io",
+            "https://auth.rownd.io/app_user_id": "user_offline",
+            "https://auth.rownd.io/is_verified_user": True,
+            "https://auth.rownd.io/auth_level": "verified",
+        }
+        claims.update(overrides)
+        claims = {k: v for k, v in claims.items() if v is not None}
+        return jwt.encode(claims, key or signing_key, algorithm="EdDSA", headers={"kid": kid})
+
+    return _make
+
+@pytest.fixture
+async def offline_client(signing_key):
+    """Client with its auth config and JWKS caches pre-seeded"""
+    import time
+    from rownd_flask.models.auth import JWKS
+    from rownd_flask.models.models import WellKnownConfig
+
+    offline = RowndClient(
+        app_key="key_offline",
+        app_secret="secret_offline",
+        app_id=OFFLINE_APP_ID,
+        base_url="http://127.0.0.1:9",
+    )
+    offline.auth.keys._config_cache = WellKnownConfig(
+        issuer="https://api.rownd.io",
+        jwks_uri="http://127.0.0.1:9/hub/auth/keys",
+        token_endpoint="http://127.0.0.1:9/hub/auth/token",
+    )
+    offline.auth.keys._config_cache_time = time.time()
+    offline.auth.keys._load_jwks(JWKS(keys=[jwk_for(signing_key)]))
+    # Just refreshed, so an unknown kid is rejected without a fetch
+    offline.auth.keys._last_forced_refresh = time.time()
+    yield offline
+    await offline.aclose()
+
+class AuthStub:
+    """Local stand-in for the Rownd well-known config and JWKS endpoints"""
+
+    def __init__(self, jwks):
+        self.jwks = jwks
+        self.hits = {"config": 0, "jwks": 0}
+        self.users = {}
+        self.user_hits = 0
+        self.user_delay = None
+        self.aborted_user_fetches = 0
+        self.peers = set()
+        self.delay = 0.0
+        self.status = 200
+        self.base_url = None
+
+    def app(self):
+        import asyncio
+        from aiohttp import web
+
+        async def config(request):
+            self.hits["config"] += 1
+            await asyncio.sleep(self.delay)
+            return web.json_response({
+                "issuer": "https://api.rownd.io",
+                "jwks_uri": f"{self.base_url}/hub/auth/keys",
+                "token_endpoint": f"{self.base_url}/hub/auth/token",
+            }, status=self.status)
+
+        async def keys(request):
+            self.hits["jwks"] += 1
+            await asyncio.sleep(self.delay)
+            return web.json_response(self.jwks, status=self.status)
+
+        async def user_data(request):
+            self.user_hits += 1
+            self.peers.add(request.transport.get_extra_info("peername"))
+            try:
+                await asyncio.sleep(self.delay if self.user_delay is None else self.user_delay)
+            except asyncio.CancelledError:
+                # The client hung up; aiohttp cancels the handler
+                self.aborted_user_fetches += 1
+                raise
+            user = self.users.get(request.match_info["user_id"])
+            if user is None:
+                return web.json_response({"message": "not found"}, status=404)
+            return web.json_response(user)
+
+        async def write_user(request):
+            self.user_hits += 1
+            await asyncio.sleep(self.delay)
+            user_id = request.match_info["user_id"]
+            if request.method == "DELETE":
+                self.users.pop(user_id, None)
+                return web.json_response({})
+            user = self.users.setdefault(user_id, {"data": {}})
+            user["data"].update((await request.json())["data"])
+            return web.json_response(user)
+
+        async def magic(request):
+            await asyncio.sleep(self.delay)
+            payload = await request.json()
+            return web.json_response({"link": f"https://rownd.link/{payload['data']['email']}"})
+
+        app = web.Application()
+        app.router.add_get("/hub/auth/.well-known/oauth-authorization-server", config)
+        app.router.add_post("/hub/auth/magic", magic)
+        app.router.add_route("PATCH", "/applications/{app_id}/users/{user_id}/data", write_user)
+        app.router.add_delete("/applications/{app_id}/users/{user_id}/data", write_user)
+        app.router.add_get("/hub/auth/keys", keys)
+        app.router.add_get("/applications/{app_id}/users/{user_id}/data", user_data)
+        return app
+
+@pytest.fixture
+async def auth_stub(signing_key):
+    """Serve config and JWKS for the offline key from a local server"""
+    from aiohttp.test_utils import TestServer
+
+    stub = AuthStub({"keys": [jwk_for(signing_key)]})
+    server = TestServer(stub.app())
+    await server.start_server()
+    stub.base_url = str(server.make_url("")).rstrip("/")
+    yield stub
+    await server.close()
+
+@pytest.fixture
+async def stub_client(auth_stub):
+    """Client pointed at the local auth stub with cold caches"""
+    stubbed = RowndClient(
+        app_key="key_offline",
+        app_secret="secret_offline",
+        app_id=OFFLINE_APP_ID,
+        base_url=auth_stub.base_url,
+    )
+    yield stubbed
+    await stubbed.aclose()
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import pytest
+from rownd_flask.asgi import RequireAuth, RowndMiddleware, get_token_info, get_user
+from rownd_flask.exceptions import AuthenticationError
+from rownd_flask.utils.deadline import deadline
+
+pytestmark = pytest.mark.asyncio
+
+class Scope:
+    """Minimal stand-in for a framework request object"""
+
+    def __init__(self, scope):
+        self.scope = scope
+
+async def call(app, token=None, path="/", type="http"):
+    """Drive an ASGI app with one request and collect what it sends"""
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    scope = {"type": type, "path": path, "headers": headers}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return scope, sent
+
+async def endpoint(scope, receive, send):
+    """ASGI app echoing the user id the middleware left on the scope"""
+    token_info = get_token_info(scope)
+    body = json.dumps({"user_id": token_info.user_id if token_info else None}).encode()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+async def test_claims_on_scope(offline_client, make_token):
+    """Test that validated token info is placed on the request scope"""
+    scope, sent = await call(RowndMiddleware(endpoint, offline_client), make_token())
+
+    assert sent[0]["status"] == 200
+    assert json.loads(sent[1]["body"]) == {"user_id": "user_offline"}
+    assert get_token_info(scope).claims.app_id == "app_offline"
+    assert get_user(scope) is None
+
+async def test_rejections(offline_client, make_token):
+    """Test 401 responses, optional auth and excluded paths"""
+    app = RowndMiddleware(endpoint, offline_client, exclude_paths=["/health"])
+
+    _, missing = await call(app)
+    _, expired = await call(app, make_token(exp=1))
+    _, health = await call(app, path="/health")
+    _, socket = await call(app, type="websocket")
+    _, anonymous = await call(RowndMiddleware(endpoint, offline_client, required=False))
+
+    assert missing[0]["status"] == 401
+    assert json.loads(missing[1]["body"]) == {"error": "No authorization header"}
+    assert json.loads(expired[1]["body"]) == {"error": "Token has expired"}
+    assert health[0]["status"] == 200
+    assert socket == [{"type": "websocket.close", "code": 1008}]
+    assert json.loads(anonymous[1]["body"]) == {"user_id": None}
+
+async def test_validates_on_server_loop(stub_client, auth_stub, make_token):
+    """Test that concurrent cold requests share one key fetch on the running loop"""
+    app = RowndMiddleware(endpoint, stub_client)
+    auth_stub.delay = 0.05
+    token = make_token()
+
+    results = await asyncio.gather(*(call(app, token) for _ in range(20)))
+
+    assert all(sent[0]["status"] == 200 for _, sent in results)
+    assert auth_stub.hits == {"config": 1, "jwks": 1}
+
+async def test_fetch_user(stub_client, auth_stub, make_token):
+    """Test fetching the user into the scope without blocking the loop"""
+    auth_stub.users["user_offline"] = {"data": {"first_name": "Ada"}}
+    app = RowndMiddleware(endpoint, stub_client, fetch_user=True)
+    auth_stub.delay = 0.1
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    scope, sent = await call(app, make_token())
+    ticking.cancel()
+
+    assert sent[0]["status"] == 200
+    assert get_user(scope).data == {"first_name": "Ada"}
+    assert auth_stub.user_hits == 1
+    assert ticks >= 5
+
+async def test_dependency(offline_client, make_token):
+    """Test the dependency with and without the middleware having run"""
+    scope, _ = await call(RowndMiddleware(endpoint, offline_client), make_token())
+    require = RequireAuth(offline_client)
+
+    assert await require(Scope(scope)) is get_token_info(scope)
+
+    fresh = Scope({"type": "http", "headers": [(b"authorization", f"Bearer {make_token()}".encode())]})
+    token_info = await require(fresh)
+    assert token_info.user_id == "user_offline"
+    assert get_token_info(fresh.scope) is token_info
+
+    with pytest.raises(AuthenticationError):
+        await require(Scope({"type": "http", "headers": []}))
+
+async def test_speculative_user_fetch(stub_client, auth_stub, make_token):
+    """Test that the user fetch overlaps with a cold key fetch"""
+    auth_stub.users["user_offline"] = {"data": {"first_name": "Ada"}}
+    auth_stub.delay = 0.1
+    app = RowndMiddleware(endpoint, stub_client, fetch_user=True, speculative=True)
+
+    start = asyncio.get_running_loop().time()
+    scope, sent = await call(app, make_token())
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert sent[0]["status"] == 200
+    assert get_user(scope).data == {"first_name": "Ada"}
+    # Config and JWKS take two round-trips; the user fetch hides behind them
+    assert elapsed < 0.28
+    assert auth_stub.user_hits == 1
+
+async def test_speculative_fetch_discarded_on_bad_signature(stub_client, auth_stub, make_token, monkeypatch):
+    """Test that a forged token gets a 401 and its speculative fetch is cancelled"""
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    cancelled = []
+
+    async def slow_get_user(user_id, token_info=None, coalesce=True):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(user_id)
+            raise
+
+    monkeypatch.setattr(stub_client.users, "get_user", slow_get_user)
+    app = RowndMiddleware(endpoint, stub_client, fetch_user=True, speculative=True)
+
+    scope, sent = await call(app, make_token(key=Ed25519PrivateKey.generate()))
+    await asyncio.sleep(0)
+
+    assert sent[0]["status"] == 401
+    assert json.loads(sent[1]["body"]) == {
+        "error": "Token validation failed: Signature verification failed"
+    }
+    assert get_user(scope) is None
+    assert cancelled == ["user_offline"]
+
+async def test_speculative_fetch_is_aborted_upstream(stub_client, auth_stub, make_token):
+    """Test that cancelling the speculative fetch closes its upstream request"""
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    auth_stub.users["user_offline"] = {"data": {}}
+    auth_stub.delay, auth_stub.user_delay = 0.05, 0.3
+    with pytest.raises(AuthenticationError):
+        await stub_client.authenticate(
+            make_token(key=Ed25519PrivateKey.generate()), fetch_user=True, speculative=True
+        )
+    await asyncio.sleep(0.4)
+
+    assert (auth_stub.user_hits, auth_stub.aborted_user_fetches) == (1, 1)
+
+async def test_no_speculation_on_tokens_failing_prechecks(stub_client, auth_stub, make_token):
+    """Test that expired, foreign or replayed bad tokens trigger no user fetch"""
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    auth_stub.users["user_offline"] = {"data": {}}
+    forged = make_token(key=Ed25519PrivateKey.generate())
+    with pytest.raises(AuthenticationError):
+        await stub_client.authenticate(forged, fetch_user=True, speculative=True)
+    fetched = auth_stub.user_hits
+
+    for token in (
+        make_token(exp=1),
+        make_token(aud=["app:other"]),
+        forged,
+    ):
+        with pytest.raises(AuthenticationError):
+            await stub_client.authenticate(token, fetch_user=True, speculative=True)
+    assert auth_stub.user_hits == fetched
+    assert stub_client._speculative_user_id(make_token()) == "user_offline"
+    assert stub_client._speculative_user_id(
+        make_token(**{"https://auth.rownd.io/app_user_id": "../../other"})
+    ) is None
+
+async def test_timeouts_are_503(stub_client, auth_stub, make_token):
+    """Test that Rownd not answering in time is not reported as a bad token"""
+    auth_stub.delay = 0.5
+    with deadline(0.05):
+        _, sent = await call(RowndMiddleware(endpoint, stub_client), make_token())
+
+    assert sent[0]["status"] == 503
+
+async def test_upstream_failures_are_503(stub_client, auth_stub, make_token):
+    """Test that an open breaker or failing key fetch is not reported as a bad token"""
+    auth_stub.status = 500
+    _, failed = await call(RowndMiddleware(endpoint, stub_client), make_token())
+    assert failed[0]["status"] == 503
+    assert b"www-authenticate" not in dict(failed[0]["headers"])
+
+    auth_stub.status = 200
+    _, refused = await call(RowndMiddleware(endpoint, stub_client), "not-a-token")
+    assert refused[0]["status"] == 401
+    assert dict(refused[0]["headers"])[b"www-authenticate"] == b"Bearer"
@@ -0,0 +1,57 @@
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from rownd_flask.exceptions import AuthenticationError
+from rownd_flask.models.auth import TokenValidationResponse
+from rownd_flask.utils.batch import precheck
+
+pytestmark = pytest.mark.asyncio
+
+async def test_validate_tokens_preserves_order(offline_client, make_token, signing_key):
+    """Test that batch results stream back in input order"""
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    tokens = []
+    for i in range(40):
+        tokens.append(make_token(jti=f"ok-{i}"))
+    tokens[3] = "not-a-token"
+    tokens[7] = make_token(exp=1)
+    tokens[11] = make_token(aud=["app:other"])
+    tokens[13] = make_token(key=Ed25519PrivateKey.generate())
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        results = [r async for r in offline_client.auth.validate_tokens(tokens, chunk_size=4, executor=pool)]
+
+    assert len(results) == 40
+    assert str(results[3]) == "Invalid token format"
+    assert str(results[7]) == "Token has expired"
+    assert str(results[11]) == "Invalid audience"
+    assert isinstance(results[13], AuthenticationError)
+    assert "Signature verification failed" in str(results[13])
+    valid = [i for i in range(40) if i not in (3, 7, 11, 13)]
+    assert all(isinstance(results[i], TokenValidationResponse) for i in valid)
+    assert [results[i].decoded_token["jti"] for i in valid] == [f"ok-{i}" for i in valid]
+
+async def test_validate_tokens_uses_token_cache(offline_client, make_token):
+    """Test that batch validation shares the validated-token cache"""
+    token = make_token()
+    first = await offline_client.auth.validate_token(token)
+    results = [r async for r in offline_client.auth.validate_tokens([token, token], max_workers=1)]
+    assert results == [first, first]
+
+async def test_precheck_rejects_missing_kid(offline_client, make_token):
+    """Test the structural pre-pass on a token without a kid"""
+    import jwt
+    token = jwt.encode({"aud": "app:x"}, "s" * 32, algorithm="HS256")
+    assert precheck(token, {"sig-offline"}, "app:x", 0) == "No 'kid' in token headers"
+
+async def test_validate_tokens_reports_pool_failures_per_token(offline_client, make_token):
+    """Test that a broken pool fails its tokens instead of the whole stream"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    pool.shutdown()
+    tokens = [make_token(jti=f"t-{i}") for i in range(3)] + [make_token(exp=1)]
+    results = [r async for r in offline_client.auth.validate_tokens(tokens, chunk_size=2, executor=pool)]
+
+    assert all(isinstance(r, AuthenticationError) for r in results)
+    assert [str(r).startswith("Token verification failed") for r in results] == [True] * 3 + [False]
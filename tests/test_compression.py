@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from rownd_flask.utils.http import Transport
+
+pytestmark = pytest.mark.asyncio
+
+USERS = {"results": [{"id": f"user_{i}", "data": {"email": f"user_{i}@example.com"}} for i in range(500)]}
+
+@pytest.fixture
+async def server():
+    """Server recording request bodies as sent and compressing its responses"""
+    class Server:
+        received = []
+        url = None
+
+    async def echo(request):
+        Server.received.append({
+            "content-length": int(request.headers["Content-Length"]),
+            "content-encoding": request.headers.get("Content-Encoding"),
+            "body": await request.json(),
+        })
+        return web.json_response({})
+
+    async def users(request):
+        Server.received.append({"accept-encoding": request.headers.get("Accept-Encoding", "")})
+        response = web.json_response(USERS)
+        response.enable_compression()
+        return response
+
+    app = web.Application()
+    app.router.add_post("/echo", echo)
+    app.router.add_get("/users", users)
+    test_server = TestServer(app)
+    await test_server.start_server()
+    Server.url = str(test_server.make_url("")).rstrip("/")
+    yield Server
+    await test_server.close()
+
+def make_transport(backend, **kwargs):
+    if backend == "http2":
+        pytest.importorskip("httpx")
+        from rownd_flask.utils.http2 import HTTP2Transport
+        return HTTP2Transport(**kwargs)
+    return Transport(**kwargs)
+
+async def send(transport, backend, *args, **kwargs):
+    if backend == "sync":
+        return await asyncio.to_thread(transport.request_sync, *args, **kwargs)
+    return await transport.request(*args, **kwargs)
+
+@pytest.mark.parametrize("backend", ["async", "sync", "http2"])
+async def test_large_request_bodies_are_gzipped(server, backend):
+    """Test that bodies over the threshold go out gzipped and small ones as they are"""
+    transport = make_transport(backend, compress_requests=1024)
+    await send(transport, backend, "POST", f"{server.url}/echo", json=USERS)
+    await send(transport, backend, "POST", f"{server.url}/echo", json={"data": {}})
+    await transport.aclose()
+
+    large, small = server.received
+    assert large["content-encoding"] == "gzip"
+    assert large["body"] == USERS
+    assert large["content-length"] < len(str(USERS)) // 5
+    assert small["content-encoding"] is None
+    assert small["body"] == {"data": {}}
+
+async def test_compression_is_opt_in(server):
+    """Test that request bodies are sent uncompressed by default"""
+    transport = Transport()
+    await transport.request("POST", f"{server.url}/echo", json=USERS)
+    await transport.aclose()
+    assert server.received[0]["content-encoding"] is None
+
+@pytest.mark.parametrize("backend", ["async", "sync", "http2"])
+async def test_compressed_responses_are_negotiated_and_decoded(server, backend):
+    """Test that every backend asks for gzip and decodes compressed responses"""
+    transport = make_transport(backend)
+    response = await send(transport, backend, "GET", f"{server.url}/users")
+    await transport.aclose()
+
+    assert "gzip" in server.received[0]["accept-encoding"]
+    assert response.json() == USERS
+    assert response.headers["Content-Encoding"] in ("gzip", "br", "deflate")
+
+async def test_bodies_the_stdlib_accepts_still_encode(server):
+    """Test non-str keys and big ints, and a clear error for the unserializable"""
+    from rownd_flask.exceptions import ValidationError
+
+    transport = Transport()
+    await transport.request("POST", f"{server.url}/echo", json={"data": {1: "a", "n": 2 ** 70}})
+    with pytest.raises(ValidationError):
+        await transport.request("POST", f"{server.url}/echo", json={"data": object()})
+    await transport.aclose()
+
+    assert server.received[0]["body"] == {"data": {"1": "a", "n": 2 ** 70}}
@@ -0,0 +1,124 @@
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from rownd_flask.client import RowndClient
+from rownd_flask.exceptions import APIError, RowndTimeoutError
+from rownd_flask.utils.deadline import deadline, remaining
+from rownd_flask.utils.http import Transport
+from rownd_flask.utils.retry import RetryPolicy
+from .conftest import OFFLINE_APP_ID
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+async def throttled():
+    """Server always answering 503 with a short Retry-After"""
+    class Throttled:
+        hits = 0
+        url = None
+
+    async def handler(request):
+        Throttled.hits += 1
+        return web.json_response({}, status=503, headers={"Retry-After": "0.2"})
+
+    app = web.Application()
+    app.router.add_get("/applications/app_1/users/{user_id}/data", handler)
+    server = TestServer(app)
+    await server.start_server()
+    Throttled.url = str(server.make_url("/applications/app_1/users/user_1/data"))
+    yield Throttled
+    await server.close()
+
+async def test_deadline_blocks_nest_and_only_shorten():
+    """Test that an inner block cannot extend its enclosing deadline"""
+    assert remaining() is None
+    assert remaining(5) == 5
+    with deadline(1):
+        with deadline(10):
+            assert remaining() <= 1
+        with deadline(0.5):
+            assert remaining() <= 0.5
+    assert remaining() is None
+
+async def test_client_timeout_fails_fast(auth_stub):
+    """Test that a hung upstream raises RowndTimeoutError after the client timeout"""
+    auth_stub.delay = 1
+    auth_stub.users["user_1"] = {"data": {}}
+    client = RowndClient("key", "secret", app_id=OFFLINE_APP_ID, base_url=auth_stub.base_url, timeout=0.1)
+
+    start = asyncio.get_running_loop().time()
+    with pytest.raises(RowndTimeoutError) as raised:
+        await client.users.get_user("user_1")
+    assert asyncio.get_running_loop().time() - start < 0.3
+    assert isinstance(raised.value, APIError)
+    await client.aclose()
+
+async def test_per_call_deadline_overrides_the_default(stub_client, auth_stub):
+    """Test that a deadline block caps a call below the client-wide timeout"""
+    auth_stub.delay = 1
+    auth_stub.users["user_1"] = {"data": {}}
+
+    start = asyncio.get_running_loop().time()
+    with pytest.raises(RowndTimeoutError):
+        with deadline(0.1):
+            await stub_client.users.get_user("user_1")
+    assert asyncio.get_running_loop().time() - start < 0.3
+
+async def test_retries_stop_at_the_deadline(throttled):
+    """Test that a retry whose wait would overrun the budget is not attempted"""
+    # Uncoalesced, so the retries run under the caller's own deadline
+    transport = Transport(retry=RetryPolicy(max_attempts=10, budget_min_per_second=100), coalesce=False)
+
+    with deadline(0.3):
+        start = asyncio.get_running_loop().time()
+        response = await transport.request("GET", throttled.url)
+        took = asyncio.get_running_loop().time() - start
+    await transport.aclose()
+
+    # Retry-After 0.2 fits the budget once; the second wait would not
+    assert (response.status, throttled.hits) == (503, 2)
+    assert took < 0.3
+
+async def test_key_fetch_honours_the_deadline_but_keeps_running(stub_client, auth_stub, make_token):
+    """Test that a timed out caller leaves the shared key fetch running for others"""
+    auth_stub.delay = 0.2
+    token = make_token()
+
+    with pytest.raises(RowndTimeoutError):
+        with deadline(0.05):
+            await stub_client.auth.validate_token(token)
+
+    token_info = await stub_client.auth.validate_token(token)
+    assert token_info.user_id == "user_offline"
+    assert auth_stub.hits == {"config": 1, "jwks": 1}
+
+async def test_prefetch_and_background_work(stub_client, auth_stub, make_token, monkeypatch):
+    """Test that prefetches are bounded by the deadline and background refresh is not"""
+    auth_stub.delay = 0.2
+    auth_stub.users["user_offline"] = {"data": {}}
+    keys = stub_client.auth.keys
+    keys.background_refresh = True
+    seen = []
+    monkeypatch.setattr(keys, "_next_refresh_delay", lambda: seen.append(remaining()) or 3600)
+
+    start = asyncio.get_running_loop().time()
+    with pytest.raises(RowndTimeoutError):
+        with deadline(0.3):
+            # Config and keys take 0.4s; the speculative user fetch overlaps them
+            await stub_client.authenticate(make_token(), fetch_user=True, speculative=True)
+    assert asyncio.get_running_loop().time() - start < 0.45
+
+    await asyncio.sleep(0)
+    assert seen == [None]
+
+async def test_blocking_requests_time_out(auth_stub):
+    """Test the timeout on the blocking pool"""
+    auth_stub.delay = 1
+    auth_stub.users["user_1"] = {"data": {}}
+    transport = Transport(timeout=0.1)
+    url = f"{auth_stub.base_url}/applications/{OFFLINE_APP_ID}/users/user_1/data"
+
+    with pytest.raises(RowndTimeoutError):
+        await asyncio.to_thread(transport.request_sync, "GET", url)
+    transport.close()
@@ -0,0 +1,126 @@
+import asyncio
+import pytest
+from flask import Flask, jsonify
+from rownd_flask import RowndFlask, require_auth
+from rownd_flask.extension import current_token_info
+
+pytestmark = pytest.mark.asyncio
+
+def make_app(client):
+    """Flask app protected by require_auth, with nested decorators on /nested"""
+    app = Flask(__name__)
+    RowndFlask(app, client=client)
+
+    @app.route("/me")
+    @require_auth()
+    def me(token_info):
+        return jsonify({"user_id": token_info.user_id})
+
+    @app.route("/nested")
+    @require_auth()
+    @require_auth()
+    def nested(token_info):
+        return jsonify({"memoized": current_token_info() is token_info})
+
+    @app.route("/async")
+    @require_auth()
+    async def async_view(token_info):
+        return jsonify({"app_id": token_info.claims.app_id})
+
+    return app
+
+async def test_validates_once_per_request(offline_client, make_token, monkeypatch):
+    """Test that nested decorators share one validation through flask.g"""
+    calls = []
+    validate_cached = offline_client.auth.validate_cached
+    monkeypatch.setattr(
+        offline_client.auth, "validate_cached",
+        lambda token: calls.append(token) or validate_cached(token),
+    )
+    headers = {"Authorization": f"Bearer {make_token()}"}
+
+    with make_app(offline_client).test_client() as http:
+        response = http.get("/nested", headers=headers)
+
+    assert response.status_code == 200
+    assert response.get_json() == {"memoized": True}
+    assert len(calls) == 1
+
+async def test_warm_cache_skips_event_loop(offline_client, make_token, monkeypatch):
+    """Test that a cached token is answered without the background loop"""
+    token = make_token()
+    headers = {"Authorization": f"Bearer {token}"}
+    app = make_app(offline_client)
+    with app.test_client() as http:
+        assert http.get("/me", headers=headers).status_code == 200
+
+        def fail(*args, **kwargs):
+            raise AssertionError("background loop used for a cached token")
+        monkeypatch.setattr(app.extensions["rownd"], "run", fail)
+        response = http.get("/me", headers=headers)
+
+    assert response.get_json() == {"user_id": "user_offline"}
+
+async def test_cold_cache_uses_background_loop(stub_client, auth_stub, make_token):
+    """Test that a cold client fetches its keys once on the shared loop"""
+    headers = {"Authorization": f"Bearer {make_token()}"}
+
+    app = make_app(stub_client)
+
+    def requests():
+        with app.test_client() as http:
+            return [http.get("/me", headers=headers) for _ in range(3)]
+
+    # The stub serves from this test's loop, so keep the blocking views off it
+    responses = await asyncio.to_thread(requests)
+    app.extensions["rownd"].close()
+
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert auth_stub.hits == {"config": 1, "jwks": 1}
+
+async def test_async_view(offline_client, make_token):
+    """Test that async views are protected too"""
+    pytest.importorskip("asgiref", reason="async views need Flask's async extra")
+    headers = {"Authorization": f"Bearer {make_token()}"}
+
+    with make_app(offline_client).test_client() as http:
+        response = http.get("/async", headers=headers)
+
+    assert response.status_code == 200
+    assert response.get_json() == {"app_id": "app_offline"}
+
+async def test_rejections(offline_client, make_token):
+    """Test the 401 responses for missing and invalid tokens"""
+    with make_app(offline_client).test_client() as http:
+        missing = http.get("/me")
+        expired = http.get("/me", headers={"Authorization": f"Bearer {make_token(exp=1)}"})
+
+    assert missing.status_code == 401
+    assert missing.get_json() == {"error": "No authorization header"}
+    assert expired.status_code == 401
+    assert expired.get_json() == {"error": "Token has expired"}
+
+async def test_init_app_from_config(offline_client):
+    """Test that init_app builds a client from the app config"""
+    app = Flask(__name__)
+    app.config.update(ROWND_APP_KEY="key", ROWND_APP_SECRET="secret", ROWND_APP_ID="app_1")
+    rownd = RowndFlask(app)
+
+    assert app.extensions["rownd"] is rownd
+    assert app.rownd_client is rownd.client
+    assert rownd.client.app_id == "app_1"
+    await rownd.client.aclose()
+
+async def test_upstream_failures_are_503(offline_client, make_token, monkeypatch):
+    """Test that an open circuit breaker is answered with 503, not 401"""
+    from rownd_flask.exceptions import CircuitOpenError
+
+    def breaker_open(token):
+        raise CircuitOpenError("Circuit open for /hub/auth/keys")
+
+    monkeypatch.setattr(offline_client.auth, "validate_cached", breaker_open)
+    with make_app(offline_client).test_client() as http:
+        response = http.get("/me", headers={"Authorization": f"Bearer {make_token()}"})
+
+    assert response.status_code == 503
+    assert "WWW-Authenticate" not in response.headers
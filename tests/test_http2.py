@@ -0,0 +1,96 @@
+import asyncio
+import socket
+import pytest
+from rownd_flask.client import RowndClient
+from .conftest import OFFLINE_APP_ID
+
+pytest.importorskip("httpx")
+pytest.importorskip("h2")
+
+from rownd_flask.utils.http2 import HTTP2Transport
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+async def h2c_server():
+    """Plain-text HTTP/2 server recording the protocol and connection of each request"""
+    pytest.importorskip("hypercorn")
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    class Server:
+        requests = []
+        base_url = None
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        Server.requests.append((scope["http_version"], scope["client"]))
+        await asyncio.sleep(0.05)
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b'{"data": {"first_name": "Ada"}}'})
+
+    # hypercorn does not report the port it picked, so find a free one up front
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    shutdown = asyncio.Event()
+    server = asyncio.ensure_future(serve(app, config, shutdown_trigger=shutdown.wait))
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.02)
+        else:
+            writer.close()
+            break
+    Server.base_url = f"http://127.0.0.1:{port}"
+    yield Server
+    shutdown.set()
+    await server
+
+async def test_http2_backend_is_selectable(auth_stub):
+    """Test that http2=True swaps the transport and falls back to HTTP/1.1 servers"""
+    auth_stub.users["user_1"] = {"data": {"first_name": "Ada"}}
+    client = RowndClient(
+        "key_offline", "secret_offline", app_id=OFFLINE_APP_ID,
+        base_url=auth_stub.base_url, http2=True,
+    )
+    assert isinstance(client.transport, HTTP2Transport)
+    assert client.groups._transport is client.transport
+
+    user = await client.users.get_user("user_1")
+    assert user.data["first_name"] == "Ada"
+    await client.aclose()
+    assert client.transport._async_sessions == {}
+
+async def test_concurrent_requests_share_one_connection(h2c_server):
+    """Test that concurrent calls are multiplexed as streams on one connection"""
+    transport = HTTP2Transport(prior_knowledge=True)
+    start = asyncio.get_running_loop().time()
+    responses = await asyncio.gather(*(
+        transport.request("GET", f"{h2c_server.base_url}/applications/a/users/u{i}/data")
+        for i in range(20)
+    ))
+    elapsed = asyncio.get_running_loop().time() - start
+    await transport.aclose()
+
+    assert [r.json()["data"]["first_name"] for r in responses] == ["Ada"] * 20
+    assert {version for version, _ in h2c_server.requests} == {"2"}
+    assert len({peer for _, peer in h2c_server.requests}) == 1
+    assert elapsed < 0.5
+
+async def test_connection_errors_map_to_api_error():
+    """Test that httpx errors surface as APIError like the HTTP/1.1 transport"""
+    from rownd_flask.exceptions import APIError
+    from rownd_flask.utils.retry import RetryPolicy
+
+    transport = HTTP2Transport(retry=RetryPolicy(max_attempts=1))
+    with pytest.raises(APIError, match="HTTP request failed"):
+        await transport.request("GET", "http://127.0.0.1:9/applications/a/users/u/data")
+    with pytest.raises(APIError, match="HTTP request failed"):
+        transport.request_sync("GET", "http://127.0.0.1:9/applications/a/users/u/data")
+    await transport.aclose()
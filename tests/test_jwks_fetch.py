@@ -0,0 +1,144 @@
+import asyncio
+import os
+import time
+import pytest
+from rownd_flask import RowndClient
+from rownd_flask.exceptions import APIError, AuthenticationError
+from rownd_flask.models.auth import CACHE_TTL, REFRESH_AHEAD
+from .conftest import jwk_for, OFFLINE_APP_ID
+
+pytestmark = pytest.mark.asyncio
+
+async def test_concurrent_cold_misses_fetch_once(stub_client, auth_stub, make_token):
+    """Test that concurrent validations on a cold cache share one fetch"""
+    auth_stub.delay = 0.05
+    tokens = [make_token(jti=f"jti-{i}") for i in range(20)]
+
+    results = await asyncio.gather(*(stub_client.auth.validate_token(t) for t in tokens))
+
+    assert len(results) == 20
+    assert auth_stub.hits == {"config": 1, "jwks": 1}
+    assert stub_client.auth.keys._flight.collapsed == 38
+
+async def test_fetch_error_is_shared(stub_client, auth_stub, make_token):
+    """Test that every waiter sees the upstream failure"""
+    auth_stub.status = 500
+    auth_stub.delay = 0.05
+
+    results = await asyncio.gather(
+        *(stub_client.auth.validate_token(make_token()) for _ in range(5)),
+        return_exceptions=True,
+    )
+
+    # An upstream failure is reported as such, not as a bad token
+    assert all(isinstance(r, APIError) for r in results)
+    assert "Failed to fetch well-known config" in str(results[0])
+    assert auth_stub.hits["config"] == 1
+
+async def expire_caches(auth, age):
+    """Backdate the config and JWKS fetch times"""
+    auth.keys._config_cache_time -= age
+    auth.keys._jwks_cache_time -= age
+
+async def test_stale_copy_served_while_revalidating(stub_client, auth_stub, make_token):
+    """Test that an expired cache within grace is served and refreshed behind"""
+    await stub_client.auth.validate_token(make_token())
+    await expire_caches(stub_client.auth, CACHE_TTL + 10)
+    auth_stub.delay = 0.2
+
+    await asyncio.wait_for(stub_client.auth.validate_token(make_token(jti="other")), 0.1)
+    assert stub_client.auth.keys._revalidations
+    await asyncio.gather(*stub_client.auth.keys._revalidations)
+    assert auth_stub.hits["config"] == 2
+
+async def test_stale_copy_survives_upstream_outage(stub_client, auth_stub, make_token):
+    """Test that a failed background refresh keeps the stale copy in service"""
+    await stub_client.auth.validate_token(make_token())
+    await expire_caches(stub_client.auth, CACHE_TTL + 10)
+    auth_stub.status = 503
+
+    await stub_client.auth.validate_token(make_token(jti="other"))
+    await asyncio.gather(*stub_client.auth.keys._revalidations, return_exceptions=True)
+    await stub_client.auth.validate_token(make_token(jti="third"))
+
+async def test_unknown_kid_refresh_is_rate_limited(stub_client, auth_stub, make_token, signing_key):
+    """Test that unknown kids force at most one JWKS refresh per interval"""
+    await stub_client.auth.validate_token(make_token())
+    auth_stub.jwks = {"keys": [jwk_for(signing_key), jwk_for(signing_key, kid="sig-rotated")]}
+
+    assert await stub_client.auth.validate_token(make_token(kid="sig-rotated"))
+    for i in range(5):
+        with pytest.raises(AuthenticationError):
+            await stub_client.auth.validate_token(make_token(kid=f"sig-bogus-{i}"))
+    assert auth_stub.hits["jwks"] == 2
+
+async def test_failed_unknown_kid_refresh_is_an_upstream_error(stub_client, auth_stub, make_token):
+    """Test that an unknown kid during a JWKS outage raises APIError, not a rejection"""
+    await stub_client.auth.validate_token(make_token())
+    auth_stub.status = 503
+
+    with pytest.raises(APIError) as raised:
+        await stub_client.auth.validate_token(make_token(kid="sig-rotated"))
+    assert not isinstance(raised.value, AuthenticationError)
+    # Still rate limited: the next unknown kid does not refetch
+    with pytest.raises(AuthenticationError):
+        await stub_client.auth.validate_token(make_token(kid="sig-bogus"))
+
+async def test_background_refresh_renews_before_expiry(stub_client, auth_stub, make_token):
+    """Test that the background refresher fetches ahead of expiry"""
+    await stub_client.auth.validate_token(make_token())
+    await expire_caches(stub_client.auth, CACHE_TTL - REFRESH_AHEAD)
+
+    stub_client.auth.start_background_refresh()
+    for _ in range(50):
+        if auth_stub.hits["jwks"] == 2:
+            break
+        await asyncio.sleep(0.01)
+    await stub_client.auth.stop_background_refresh()
+    assert auth_stub.hits == {"config": 2, "jwks": 2}
+
+async def test_disk_cache_warms_new_worker(auth_stub, make_token, tmp_path):
+    """Test that a second client starts from the on-disk JWKS and config"""
+    first = RowndClient("key", "secret", app_id=OFFLINE_APP_ID,
+                        base_url=auth_stub.base_url, cache_dir=str(tmp_path))
+    await first.auth.validate_token(make_token())
+    await first.aclose()
+
+    second = RowndClient("key", "secret", app_id=OFFLINE_APP_ID,
+                         base_url=auth_stub.base_url, cache_dir=str(tmp_path))
+    await second.auth.validate_token(make_token(jti="other"))
+    await second.aclose()
+
+    assert auth_stub.hits == {"config": 1, "jwks": 1}
+    assert [p.name for p in tmp_path.iterdir()] == [os.path.basename(second.auth.keys._disk_cache.path)]
+
+async def test_disk_cache_ignores_expired_copy(auth_stub, make_token, tmp_path):
+    """Test that a cache file older than TTL plus grace is not used"""
+    first = RowndClient("key", "secret", app_id=OFFLINE_APP_ID,
+                        base_url=auth_stub.base_url, cache_dir=str(tmp_path), stale_grace=0)
+    await first.auth.validate_token(make_token())
+    await first.aclose()
+    first.auth.keys._disk_cache.save(
+        config={"data": {}, "fetched_at": time.time() - CACHE_TTL - 1},
+        jwks={"data": {}, "fetched_at": time.time() - CACHE_TTL - 1},
+    )
+
+    second = RowndClient("key", "secret", app_id=OFFLINE_APP_ID,
+                         base_url=auth_stub.base_url, cache_dir=str(tmp_path), stale_grace=0)
+    assert second.auth.keys._config_cache is None
+    assert second.auth.keys._jwks_cache is None
+
+async def test_disk_cache_ignores_non_dict_file(auth_stub, make_token, tmp_path):
+    """Test that a cache file holding valid JSON of the wrong shape is a miss"""
+    first = RowndClient("key", "secret", app_id=OFFLINE_APP_ID,
+                        base_url=auth_stub.base_url, cache_dir=str(tmp_path))
+    with open(first.auth.keys._disk_cache.path, "w") as f:
+        f.write("[1, 2, 3]")
+
+    second = RowndClient("key", "secret", app_id=OFFLINE_APP_ID,
+                         base_url=auth_stub.base_url, cache_dir=str(tmp_path))
+    assert second.auth.keys._jwks_cache is None
+    await second.auth.validate_token(make_token())
+    await second.aclose()
+    await first.aclose()
+    assert auth_stub.hits == {"config": 1, "jwks": 1}
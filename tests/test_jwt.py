@@ -0,0 +1,110 @@
+import pytest
+from rownd_flask.exceptions import AuthenticationError
+from rownd_flask.utils.jwt import KeyRing, verify_token
+from .conftest import jwk_for
+
+pytestmark = pytest.mark.asyncio
+
+async def test_key_ring_indexes_valid_keys(signing_key):
+    """Test that the key ring decodes keys once and indexes them by kid"""
+    ring = KeyRing([jwk_for(signing_key, kid="a"), jwk_for(signing_key, kid="b")])
+    assert len(ring) == 2
+    assert "a" in ring
+    assert ring.get("b") is not None
+    assert ring.get("missing") is None
+
+async def test_key_ring_rejects_bad_keys_at_load(signing_key):
+    """Test that unsupported and malformed keys are dropped at load time"""
+    good = jwk_for(signing_key, kid="good")
+    ring = KeyRing([
+        good,
+        {**good, "kid": "rsa", "kty": "RSA"},
+        {**good, "kid": "short", "x": "AAAA"},
+        {**good, "kid": None},
+    ])
+    assert list(ring.kids()) == ["good"]
+
+async def test_unknown_kid_is_rejected(offline_client, make_token):
+    """Test validation against a kid that is not in the key ring"""
+    with pytest.raises(AuthenticationError) as exc_info:
+        await offline_client.auth.validate_token(make_token(kid="sig-unknown"))
+    assert str(exc_info.value) == "No matching key found for kid: sig-unknown"
+
+def reference_verify(token, public_key, audience):
+    """The two-pass jwt.decode path the single-pass verifier replaced.
+
+    ``require`` is the PyJWT 2 spelling of the old ``require_exp`` and
+    ``require_iat`` options, which PyJWT 2 silently ignores.
+    """
+    import jwt
+    try:
+        jwt.decode(token, key=public_key, algorithms=['EdDSA'], audience=audience,
+                   options={'verify_exp': False, 'verify_iat': False, 'require_exp': False, 'require_iat': False})
+        return jwt.decode(token, key=public_key, algorithms=['EdDSA'],
+                          options={'verify_aud': False, 'require': ['exp', 'iat']})
+    except jwt.InvalidAudienceError:
+        raise AuthenticationError("Invalid audience")
+    except jwt.ExpiredSignatureError:
+        raise AuthenticationError("Token has expired")
+    except Exception as e:
+        raise AuthenticationError(f"Token validation failed: {str(e)}")
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"aud": "app:app_offline"},
+    {"aud": ["app:other"]},
+    {"aud": None},
+    {"exp": 1},
+    {"exp": None},
+    {"iat": None},
+    {"iat": "soon"},
+    {"iat": 4102444800},
+    {"nbf": 4102444800},
+    {"aud": ["app:other"], "exp": 1},
+])
+async def test_single_pass_matches_two_pass(signing_key, make_token, overrides):
+    """Test that the single-pass verifier agrees with the jwt.decode path"""
+    token = make_token(**overrides)
+    public_key = signing_key.public_key()
+
+    try:
+        expected = reference_verify(token, public_key, "app:app_offline")
+    except AuthenticationError as e:
+        expected = str(e)
+    try:
+        actual = verify_token(token, public_key, "app:app_offline")
+    except AuthenticationError as e:
+        actual = str(e)
+    assert actual == expected
+
+async def test_single_pass_rejects_forged_signature(make_token):
+    """Test that a token signed by another key fails signature verification"""
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+    token = make_token()
+    with pytest.raises(AuthenticationError) as exc_info:
+        verify_token(token, Ed25519PrivateKey.generate().public_key(), "app:app_offline")
+    assert str(exc_info.value) == "Token validation failed: Signature verification failed"
+
+async def test_malformed_token_format(offline_client):
+    """Test that tokens that do not split into three segments are rejected"""
+    for token in ("invalid_token", "a.b", "a.b.c.d", "%%%.e30.e30"):
+        with pytest.raises(AuthenticationError) as exc_info:
+            await offline_client.auth.validate_token(token)
+        assert str(exc_info.value) == "Invalid token format"
+
+async def test_token_claims_attributes(offline_client, make_token):
+    """Test the typed claim attributes on a validation result"""
+    token = make_token(aud=["other", "app:app_offline"], **{"https://auth.rownd.io/is_anonymous": True})
+    validation = await offline_client.auth.validate_token(token)
+    claims = validation.claims
+
+    assert validation.user_id == "user_offline"
+    assert claims.app_id == "app_offline"
+    assert claims.aud == ("other", "app:app_offline")
+    assert claims.auth_level == "verified"
+    assert claims.is_verified is True
+    assert claims.is_anonymous is True
+    assert claims.exp == validation.decoded_token["exp"]
+    assert claims["sub"] == "user_offline"
+    assert dict(claims) == validation.decoded_token
+    assert not hasattr(claims, "__dict__")
@@ -0,0 +1,52 @@
+import asyncio
+import pytest
+from .conftest import OFFLINE_APP_ID
+
+pytestmark = pytest.mark.asyncio
+
+DELAY = 0.2
+
+async def test_concurrent_get_user_calls_overlap(stub_client, auth_stub):
+    """Test that N concurrent get_user calls take about one delay, not N"""
+    auth_stub.delay = DELAY
+    for i in range(10):
+        auth_stub.users[f"user_{i}"] = {"data": {"first_name": f"User {i}"}}
+
+    start = asyncio.get_running_loop().time()
+    users = await asyncio.gather(*(stub_client.users.get_user(f"user_{i}") for i in range(10)))
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert [u.data["first_name"] for u in users] == [f"User {i}" for i in range(10)]
+    assert elapsed < 3 * DELAY
+
+async def test_user_writes_do_not_block_the_loop(stub_client, auth_stub):
+    """Test that writes and field reads overlap with each other too"""
+    auth_stub.delay = DELAY
+    auth_stub.users["user_1"] = {"data": {"first_name": "Ada"}}
+    users = stub_client.users
+
+    start = asyncio.get_running_loop().time()
+    patched, field, _ = await asyncio.gather(
+        users.patch_user(OFFLINE_APP_ID, "user_1", {"last_name": "Lovelace"}),
+        users.get_user_field(OFFLINE_APP_ID, "user_1", "first_name"),
+        users.delete_user(OFFLINE_APP_ID, "user_2"),
+    )
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert patched.data == {"first_name": "Ada", "last_name": "Lovelace"}
+    assert field == "Ada"
+    assert elapsed < 2 * DELAY
+
+async def test_concurrent_magic_links_overlap(stub_client, auth_stub):
+    """Test that create_magic_link calls overlap"""
+    auth_stub.delay = DELAY
+
+    start = asyncio.get_running_loop().time()
+    links = await asyncio.gather(*(
+        stub_client.smart_links.create_magic_link("email", {"email": f"user{i}@example.com"})
+        for i in range(5)
+    ))
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert [l["link"] for l in links] == [f"https://rownd.link/user{i}@example.com" for i in range(5)]
+    assert elapsed < 2 * DELAY
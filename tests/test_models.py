@@ -0,0 +1,95 @@
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from rownd_flask.models import Group, GroupMember, GroupManager, User
+from rownd_flask.utils.http import Response
+
+pytestmark = pytest.mark.asyncio
+
+GROUP = {
+    "id": "group_1",
+    "name": "Admins",
+    "admission_policy": "invite_only",
+    "meta": {},
+    "members": [{"id": "member_1", "user_id": "user_1", "roles": ["owner"], "state": "active"}],
+    "created_at": "2024-01-01T00:00:00Z",
+}
+
+@pytest.fixture
+async def group_manager():
+    """GroupManager pointed at a server answering with canned group bodies"""
+    async def group(request):
+        return web.json_response(GROUP)
+
+    async def members(request):
+        return web.json_response({"total_results": 1, "results": GROUP["members"]})
+
+    app = web.Application()
+    app.router.add_route("*", "/applications/{app_id}/groups/{group_id}", group)
+    app.router.add_get("/applications/{app_id}/groups/{group_id}/members", members)
+    server = TestServer(app)
+    await server.start_server()
+    manager = GroupManager(str(server.make_url("")).rstrip("/"), "key", "secret")
+    yield manager
+    await manager._transport.aclose()
+    await server.close()
+
+async def test_models_are_slotted_and_keep_unknown_fields():
+    """Test that models have no __dict__ and park unknown fields in extra"""
+    user = User.from_dict({"data": {"first_name": "Ada"}, "state": "enabled", "tier": "gold"}, id="user_1")
+    assert not hasattr(user, "__dict__")
+    assert (user.id, user.data, user.state) == ("user_1", {"first_name": "Ada"}, "enabled")
+    assert user.groups == [] and user.meta == {}
+    assert user.extra == {"tier": "gold"}
+    assert user._additional_fields == {"tier": "gold"}
+
+    assert User.from_dict({"data": {}}, id="user_2").extra is None
+    assert User("user_3", data={"a": 1}).data == {"a": 1}
+
+async def test_models_read_like_the_old_dicts():
+    """Test mapping access and to_dict for code written against raw responses"""
+    group = Group.from_dict(GROUP)
+    assert group["name"] == group.name == "Admins"
+    assert group.get("created_at") == "2024-01-01T00:00:00Z"
+    assert group.get("missing", 1) == 1
+    with pytest.raises(KeyError):
+        group["missing"]
+
+    assert isinstance(group.members[0], GroupMember)
+    assert group["members"][0]["user_id"] == "user_1"
+    assert group.to_dict()["members"][0] == {
+        "id": "member_1", "user_id": "user_1", "roles": ["owner"], "state": "active", "profile": None,
+    }
+
+async def test_group_manager_decodes_into_models(group_manager):
+    """Test that single objects and result pages come back as models"""
+    group = await group_manager.get_group("app_1", "group_1")
+    assert isinstance(group, Group)
+    assert group.admission_policy == "invite_only"
+
+    page = await group_manager.list_group_members("app_1", "group_1")
+    assert page["total_results"] == 1
+    assert [type(m) for m in page["results"]] == [GroupMember]
+    assert page.get("results", [])[0]["roles"] == ["owner"]
+
+async def test_pages_build_rows_when_read():
+    """Test that decode_page leaves its input alone and builds each row once"""
+    from rownd_flask.models.base import ModelList, decode_page
+
+    data = {"total_results": 2, "results": [{"id": "group_1"}, {"id": "group_2"}]}
+    page = decode_page(data, Group)
+    assert data["results"] == [{"id": "group_1"}, {"id": "group_2"}]
+    assert isinstance(page["results"], ModelList) and len(page["results"]) == 2
+
+    first = page["results"][0]
+    assert isinstance(first, Group) and page["results"][0] is first
+    assert [g.id for g in page["results"]] == ["group_1", "group_2"]
+    assert page["results"][-1:] == [page["results"][1]]
+    assert page["results"] == [Group.from_dict(g) for g in data["results"]]
+
+async def test_response_decoding():
+    """Test the fast decoder, empty bodies and stdlib-compatible errors"""
+    assert Response(200, b'{"a": [1, 2.5, "x", null]}').json() == {"a": [1, 2.5, "x", None]}
+    assert Response(204, b"").json() is None
+    with pytest.raises(ValueError):
+        Response(200, b"not json").json()
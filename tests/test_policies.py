@@ -0,0 +1,117 @@
+import json
+import pytest
+from flask import Flask, jsonify
+from rownd_flask import RowndFlask, require_auth
+from rownd_flask.asgi import RequireAuth, RowndMiddleware
+from rownd_flask.exceptions import AuthorizationError, ConfigurationError
+from rownd_flask.models.auth import (
+    CLAIM_AUTH_LEVEL, CLAIM_IS_ANONYMOUS, CLAIM_IS_VERIFIED_USER, TokenValidationResponse,
+)
+from rownd_flask.policies import Policy
+from .test_asgi import Scope, call, endpoint
+
+pytestmark = pytest.mark.asyncio
+
+def token_info(**claims):
+    return TokenValidationResponse(decoded_token=claims, access_token="token")
+
+async def test_policy_decisions():
+    """Test each requirement and the reason given for refusing"""
+    policy = Policy(min_auth_level="instant", require_verified=True, allow_anonymous=False)
+
+    assert policy.check(token_info(**{CLAIM_AUTH_LEVEL: "verified", CLAIM_IS_VERIFIED_USER: True})) is None
+    assert policy.check(token_info(**{CLAIM_AUTH_LEVEL: "guest", CLAIM_IS_VERIFIED_USER: True})) == (
+        "Auth level instant or higher is required"
+    )
+    assert policy.check(token_info(**{CLAIM_AUTH_LEVEL: "verified"})) == "User is not verified"
+    assert policy.check(token_info(**{CLAIM_IS_ANONYMOUS: True})) == "Anonymous users are not allowed"
+    assert Policy(min_auth_level="verified").check(token_info(**{CLAIM_AUTH_LEVEL: "instant"})) is not None
+    assert Policy(allow_anonymous=False).check(token_info()) is None
+
+async def test_policy_options():
+    """Test that empty options compile to no policy and unknown levels are rejected"""
+    assert Policy.from_options() is None
+    with pytest.raises(ConfigurationError):
+        Policy(min_auth_level="admin")
+
+async def test_decision_is_cached_on_validation():
+    """Test that a decision is reused for the same validation result"""
+    policy = Policy(min_auth_level="verified")
+    info = token_info(**{CLAIM_AUTH_LEVEL: "verified"})
+    assert policy.check(info) is None
+
+    info.decoded_token[CLAIM_AUTH_LEVEL] = "guest"
+    assert policy.check(info) is None
+    assert policy.check(token_info(**{CLAIM_AUTH_LEVEL: "guest"})) is not None
+
+async def test_require_auth_policy(offline_client, make_token):
+    """Test that require_auth answers a refused token with 403"""
+    app = Flask(__name__)
+    RowndFlask(app, client=offline_client)
+
+    @app.route("/verified")
+    @require_auth(min_auth_level="verified", allow_anonymous=False)
+    def verified(token_info):
+        return jsonify({"user_id": token_info.user_id})
+
+    with app.test_client() as http:
+        allowed = http.get("/verified", headers={"Authorization": f"Bearer {make_token()}"})
+        refused = http.get("/verified", headers={
+            "Authorization": f"Bearer {make_token(**{CLAIM_AUTH_LEVEL: 'unverified'})}"
+        })
+
+    assert allowed.status_code == 200
+    assert refused.status_code == 403
+    assert refused.get_json() == {"error": "Auth level verified or higher is required"}
+
+async def test_asgi_policy(offline_client, make_token):
+    """Test the policy on the middleware and the dependency"""
+    app = RowndMiddleware(endpoint, offline_client, require_verified=True)
+    unverified = make_token(**{CLAIM_IS_VERIFIED_USER: False})
+
+    _, allowed = await call(app, make_token())
+    _, refused = await call(app, unverified)
+
+    assert allowed[0]["status"] == 200
+    assert refused[0]["status"] == 403
+    assert json.loads(refused[1]["body"]) == {"error": "User is not verified"}
+
+    headers = [(b"authorization", f"Bearer {unverified}".encode())]
+    with pytest.raises(AuthorizationError):
+        await RequireAuth(offline_client, require_verified=True)(Scope({"type": "http", "headers": headers}))
+
+async def test_refused_tokens_fetch_no_user(offline_client, make_token, monkeypatch):
+    """Test that the policy is decided before any user fetch"""
+    fetched = []
+
+    async def get_user(user_id, token_info=None, coalesce=True):
+        fetched.append(user_id)
+        return None
+
+    monkeypatch.setattr(offline_client.users, "get_user", get_user)
+    refused = make_token(**{CLAIM_IS_VERIFIED_USER: False})
+
+    for speculative in (False, True):
+        app = RowndMiddleware(endpoint, offline_client, fetch_user=True,
+                              speculative=speculative, require_verified=True)
+        _, sent = await call(app, refused)
+        assert sent[0]["status"] == 403
+
+    headers = [(b"authorization", f"Bearer {refused}".encode())]
+    with pytest.raises(AuthorizationError):
+        await RequireAuth(offline_client, fetch_user=True, require_verified=True)(
+            Scope({"type": "http", "headers": headers})
+        )
+
+    flask_app = Flask(__name__)
+    RowndFlask(flask_app, client=offline_client)
+
+    @flask_app.route("/verified")
+    @require_auth(fetch_user=True, require_verified=True)
+    def verified(token_info, user):
+        return jsonify({})
+
+    with flask_app.test_client() as http:
+        assert http.get("/verified", headers={"Authorization": f"Bearer {refused}"}).status_code == 403
+
+    assert fetched == []
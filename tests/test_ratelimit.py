@@ -0,0 +1,137 @@
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from rownd_flask.utils.http import Transport
+from rownd_flask.utils.ratelimit import AdaptiveLimiter, TokenBucket
+from rownd_flask.utils.retry import RetryPolicy
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+async def upstream():
+    """Server tracking concurrency that throttles above a fixed capacity"""
+    class Upstream:
+        capacity = 1000
+        in_flight = 0
+        peak = 0
+        hits = 0
+        base_url = None
+
+    async def handler(request):
+        Upstream.hits += 1
+        if Upstream.in_flight >= Upstream.capacity:
+            return web.json_response({}, status=429)
+        Upstream.in_flight += 1
+        Upstream.peak = max(Upstream.peak, Upstream.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            Upstream.in_flight -= 1
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    server = TestServer(app)
+    await server.start_server()
+    Upstream.base_url = str(server.make_url("")).rstrip("/")
+    yield Upstream
+    await server.close()
+
+async def test_token_bucket_paces_calls():
+    """Test that calls beyond the burst wait for their token"""
+    bucket = TokenBucket(rate=50, burst=2)
+    start = asyncio.get_running_loop().time()
+    await asyncio.gather(*(bucket.acquire() for _ in range(7)))
+    assert asyncio.get_running_loop().time() - start >= 0.09
+
+async def test_rate_limits_per_family(upstream):
+    """Test that only the configured endpoint family is paced"""
+    transport = Transport(rate_limits={"groups": (100, 1)})
+    start = asyncio.get_running_loop().time()
+    await asyncio.gather(*(
+        transport.request("GET", f"{upstream.base_url}/applications/a/users/u{i}/data") for i in range(10)
+    ))
+    unpaced = asyncio.get_running_loop().time() - start
+
+    start = asyncio.get_running_loop().time()
+    await asyncio.gather(*(
+        transport.request("GET", f"{upstream.base_url}/applications/a/groups/g{i}") for i in range(10)
+    ))
+    paced = asyncio.get_running_loop().time() - start
+    await transport.aclose()
+
+    assert paced >= 0.09
+    assert unpaced < paced
+
+async def test_limiter_bounds_concurrency(upstream):
+    """Test that requests in flight never exceed the adaptive limit"""
+    limiter = AdaptiveLimiter(initial=4, max_limit=4)
+    transport = Transport(concurrency=limiter)
+
+    await asyncio.gather(*(
+        transport.request("GET", f"{upstream.base_url}/applications/a/users/u{i}/data") for i in range(40)
+    ))
+    await transport.aclose()
+
+    assert upstream.peak == 4
+    assert limiter.in_flight == 0
+
+async def test_limiter_backs_off_on_throttling(upstream):
+    """Test that 429s shrink the limit towards what upstream sustains"""
+    upstream.capacity = 8
+    limiter = AdaptiveLimiter(initial=64, max_limit=64)
+    transport = Transport(concurrency=limiter, retry=RetryPolicy(max_attempts=1))
+
+    for _ in range(5):
+        await asyncio.gather(*(
+            transport.request("POST", f"{upstream.base_url}/applications/a/groups") for _ in range(64)
+        ))
+    await transport.aclose()
+
+    assert limiter.decreases >= 2
+    assert limiter.limit <= 16
+
+async def test_limiter_grows_while_healthy():
+    """Test the additive increase and the latency signal"""
+    limiter = AdaptiveLimiter(initial=2, max_limit=100)
+    for _ in range(20):
+        await limiter.acquire()
+        limiter.release(0.01, 200)
+    assert limiter.limit > 5
+
+    await limiter.acquire()
+    limiter.release(1.0, 200)
+    assert limiter.decreases == 1
+
+async def test_latency_baselines_are_per_family():
+    """Test that a fast family does not make a slower one look like queueing"""
+    limiter = AdaptiveLimiter(initial=8, max_limit=100)
+    await limiter.acquire()
+    limiter.release(0.005, 304, "/hub/auth/keys")
+    for _ in range(20):
+        await limiter.acquire()
+        limiter.release(0.12, 200, "users")
+    assert limiter.decreases == 0
+    assert limiter.limit > 8
+
+    transport = Transport()
+    users = transport.limiter("https://api.rownd.io/applications/a/users/u/data")
+    assert users is transport.limiter("https://api.rownd.io/applications/b/users/v/data")
+    assert users is not transport.limiter("https://api.rownd.io/hub/auth/keys")
+    shared = AdaptiveLimiter()
+    assert Transport(concurrency=shared).limiter("https://api.rownd.io/hub/auth/keys") is shared
+    assert Transport(concurrency=False).limiter("https://api.rownd.io/hub/auth/keys") is None
+
+async def test_cancelled_waiter_gives_its_slot_back():
+    """Test that a waiter cancelled while queued does not leak a slot"""
+    limiter = AdaptiveLimiter(initial=1, max_limit=1)
+    await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    limiter.release()
+    await asyncio.sleep(0)
+
+    assert limiter.in_flight == 0
+    await asyncio.wait_for(limiter.acquire(), 1)
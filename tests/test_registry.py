@@ -0,0 +1,48 @@
+import asyncio
+import pytest
+from rownd_flask import RowndRegistry
+from rownd_flask.exceptions import AuthenticationError, ConfigurationError
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+async def registry(auth_stub):
+    """Registry with 100 apps on the local auth stub"""
+    registry = RowndRegistry()
+    for i in range(100):
+        registry.register(f"key_{i}", f"secret_{i}", f"app_{i}", base_url=auth_stub.base_url)
+    yield registry
+    await registry.close()
+
+async def test_apps_share_keys_and_transport(registry):
+    """Test that apps on one base_url share one key provider and transport"""
+    first, last = registry.get("app_0"), registry.get("app_99")
+    assert first.auth.keys is last.auth.keys
+    assert first._transport is last._transport
+    assert first.groups._transport is first._transport
+
+async def test_tokens_are_routed_by_audience(registry, auth_stub, make_token):
+    """Test routing tokens for many apps with a single JWKS fetch"""
+    tokens = [make_token(aud=[f"app:app_{i}"], jti=str(i)) for i in range(0, 100, 7)]
+
+    results = await asyncio.gather(*(registry.validate_token(t) for t in tokens))
+
+    assert [r.claims.app_id for r in results] == [f"app_{i}" for i in range(0, 100, 7)]
+    assert auth_stub.hits == {"config": 1, "jwks": 1}
+
+async def test_unregistered_audience_is_rejected(registry, make_token):
+    """Test that a token for an unknown app is rejected before verification"""
+    with pytest.raises(AuthenticationError) as exc_info:
+        await registry.validate_token(make_token(aud=["app:unknown"]))
+    assert str(exc_info.value) == "Invalid audience"
+
+async def test_duplicate_registration(registry, auth_stub):
+    """Test that an app id can only be registered once"""
+    with pytest.raises(ConfigurationError):
+        registry.register("key", "secret", "app_0", base_url=auth_stub.base_url)
+
+async def test_per_app_options_are_rejected_up_front():
+    """Test that options register() sets itself cannot be shared"""
+    with pytest.raises(ConfigurationError) as exc_info:
+        RowndRegistry(base_url="https://example.com", transport=object())
+    assert "base_url, transport" in str(exc_info.value)
@@ -0,0 +1,139 @@
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from rownd_flask.exceptions import APIError, CircuitOpenError
+from rownd_flask.utils.http import Transport
+from rownd_flask.utils.retry import (
+    CircuitBreaker, RetryBudget, RetryPolicy, endpoint_family, parse_retry_after,
+)
+
+pytestmark = pytest.mark.asyncio
+
+# No waiting between attempts unless a test asks for it
+FAST = RetryPolicy(backoff_base=0, budget_min_per_second=100)
+
+@pytest.fixture
+async def flaky():
+    """Server answering with scripted statuses, then 200"""
+    class Flaky:
+        script = []
+        hits = 0
+        url = None
+
+    async def handler(request):
+        Flaky.hits += 1
+        status, headers = Flaky.script.pop(0) if Flaky.script else (200, {})
+        return web.json_response({"ok": status == 200}, status=status, headers=headers)
+
+    app = web.Application()
+    app.router.add_route("*", "/applications/app_1/users/{user_id}/data", handler)
+    server = TestServer(app)
+    await server.start_server()
+    Flaky.url = str(server.make_url("/applications/app_1/users/user_1/data"))
+    yield Flaky
+    await server.close()
+
+@pytest.fixture
+async def transport():
+    transport = Transport(retry=FAST, breaker_threshold=3, breaker_reset_timeout=0.2)
+    yield transport
+    await transport.aclose()
+
+async def test_idempotent_requests_are_retried(flaky, transport):
+    """Test that GETs retry through retryable statuses and POSTs do not"""
+    flaky.script = [(503, {}), (502, {})]
+    response = await transport.request("GET", flaky.url)
+    assert (response.status, flaky.hits) == (200, 3)
+
+    flaky.script, flaky.hits = [(503, {})], 0
+    response = await transport.request("POST", flaky.url)
+    assert (response.status, flaky.hits) == (503, 1)
+
+    flaky.script, flaky.hits = [(404, {})], 0
+    response = await transport.request("GET", flaky.url)
+    assert (response.status, flaky.hits) == (404, 1)
+
+async def test_user_creation_is_sent_once(flaky):
+    """Test that a PUT creating a user is not retried, and an update is"""
+    from rownd_flask.client import RowndClient
+
+    base = flaky.url.split("/applications/")[0]
+    client = RowndClient(app_key="key", app_secret="secret", base_url=base, retry=FAST)
+    flaky.script = [(502, {})]
+    with pytest.raises(APIError):
+        await client.users.update_user("app_1", "", {"email": "ada@example.com"})
+    assert flaky.hits == 1
+
+    flaky.script, flaky.hits = [(502, {})], 0
+    await client.users.update_user("app_1", "user_1", {"email": "ada@example.com"})
+    assert flaky.hits == 2
+    await client.aclose()
+
+async def test_retry_after(flaky, transport):
+    """Test that Retry-After sets the wait and a too-long one is not waited for"""
+    flaky.script = [(429, {"Retry-After": "0.2"})]
+    start = asyncio.get_running_loop().time()
+    response = await transport.request("GET", flaky.url)
+    assert response.status == 200
+    assert asyncio.get_running_loop().time() - start >= 0.2
+
+    flaky.script, flaky.hits = [(503, {"Retry-After": "3600"})], 0
+    response = await transport.request("GET", flaky.url)
+    assert (response.status, flaky.hits) == (503, 1)
+
+    assert parse_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert parse_retry_after({}) is None
+
+async def test_circuit_breaker(flaky, transport):
+    """Test that an unhealthy endpoint fails fast until a trial succeeds"""
+    flaky.script = [(500, {})] * 3
+    for _ in range(3):
+        assert (await transport.request("POST", flaky.url)).status == 500
+
+    with pytest.raises(CircuitOpenError):
+        await transport.request("GET", flaky.url)
+    assert flaky.hits == 3
+    assert transport.breaker(flaky.url).state == "open"
+
+    await asyncio.sleep(0.2)
+    assert (await transport.request("GET", flaky.url)).status == 200
+    assert transport.breaker(flaky.url).state == "closed"
+
+async def test_retry_budget_caps_retries(flaky):
+    """Test that retries stop once the budget is spent"""
+    transport = Transport(retry=RetryPolicy(backoff_base=0, budget_ratio=0, budget_min_per_second=0.1))
+    flaky.script = [(503, {})] * 10
+
+    responses = [await transport.request("GET", flaky.url) for _ in range(3)]
+    await transport.aclose()
+
+    # The initial budget holds a single retry
+    assert [r.status for r in responses] == [503, 503, 503]
+    assert flaky.hits == 4
+
+async def test_connection_errors_are_retried_and_raised(transport):
+    """Test that a dead upstream raises APIError after the retries"""
+    with pytest.raises(APIError, match="HTTP request failed"):
+        await transport.request("GET", "http://127.0.0.1:9/applications/app/users/u/data")
+    assert transport.breaker("http://127.0.0.1:9/applications/app/users/u/data").failures == 3
+
+async def test_helpers():
+    """Test endpoint families, the budget and the breaker on their own"""
+    assert endpoint_family("https://api.rownd.io/applications/a/groups/g/members") == "groups"
+    assert endpoint_family("https://api.rownd.io/hub/auth/magic") == "magic_links"
+    assert endpoint_family("https://api.rownd.io/hub/auth/keys") == "/hub/auth/keys"
+
+    budget = RetryBudget(ratio=0.5, min_per_second=0)
+    assert budget.withdraw() and not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+
+    breaker = CircuitBreaker("users", threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    breaker.check()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.release()
+    breaker.check()
@@ -0,0 +1,69 @@
+import time
+import pytest
+from rownd_flask import RevocationList
+from rownd_flask.exceptions import AuthenticationError
+from rownd_flask.utils.bloom import BloomFilter
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+def revocations(offline_client):
+    """Attach a revocation list to the offline client"""
+    revocations = RevocationList(capacity=1000)
+    offline_client.auth.revocations = revocations
+    return revocations
+
+async def test_revoked_jti_is_rejected_even_when_cached(offline_client, revocations, make_token):
+    """Test that revoking a jti takes effect on already-cached tokens"""
+    token = make_token(jti="jti-1")
+    await offline_client.auth.validate_token(token)
+
+    revocations.revoke_token("jti-1")
+    with pytest.raises(AuthenticationError) as exc_info:
+        await offline_client.auth.validate_token(token)
+    assert str(exc_info.value) == "Token has been revoked"
+    assert await offline_client.auth.validate_token(make_token(jti="jti-2"))
+
+async def test_revoked_user_can_sign_in_again(offline_client, revocations, make_token):
+    """Test that user revocation only applies to tokens issued before it"""
+    now = int(time.time())
+    old_token = make_token(jti="old", iat=now - 60)
+    revocations.revoke_user("user_offline", revoked_at=now - 30)
+
+    with pytest.raises(AuthenticationError):
+        await offline_client.auth.validate_token(old_token)
+    assert await offline_client.auth.validate_token(make_token(jti="new", iat=now))
+
+async def test_bulk_replace_unrevokes(revocations):
+    """Test that a bulk sync snapshot replaces pushed revocations"""
+    revocations.revoke_token("a")
+    revocations.replace(jtis=["b"], users={"user_x": time.time()})
+    assert not revocations.is_revoked("a", None, None)
+    assert revocations.is_revoked("b", None, None)
+    assert revocations.is_revoked(None, "user_x", 0)
+
+async def test_many_pushed_revocations_merge(revocations):
+    """Test that pushed revocations stay exact across array merges"""
+    for i in range(10000):
+        revocations.revoke_token(f"jti-{i}")
+    assert all(revocations.is_revoked(f"jti-{i}", None, None) for i in range(0, 10000, 97))
+    assert not revocations.is_revoked("jti-absent", None, None)
+
+async def test_confirmation_compares_the_jti_itself(revocations):
+    """Test that a filter hit is confirmed by the jti, not by its hash"""
+    class Colliding(str):
+        def __hash__(self):
+            return hash("jti-1")
+
+    revocations.revoke_token("jti-1")
+    assert revocations._has_jti("jti-1")
+    assert not revocations._has_jti(Colliding("jti-2"))
+
+async def test_bloom_filter_error_rate():
+    """Test that the filter stays near its configured false positive rate"""
+    bloom = BloomFilter(10000, error_rate=0.01)
+    for i in range(10000):
+        bloom.add(f"member-{i}")
+    assert all(f"member-{i}" in bloom for i in range(10000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 200
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import pytest
+from rownd_flask import RowndClientSync
+from rownd_flask.utils.loop import get_background_loop
+from .conftest import OFFLINE_APP_ID
+
+pytestmark = pytest.mark.asyncio
+
+# The stubs serve from the test's loop, so every blocking call runs in a thread
+
+@pytest.fixture
+async def sync_client(stub_client):
+    client = RowndClientSync(client=stub_client, timeout=5)
+    yield client
+    await asyncio.to_thread(client.close)
+
+async def test_mirrors_the_async_api(sync_client, auth_stub, make_token):
+    """Test that manager methods and authenticate block for their results"""
+    auth_stub.users["user_offline"] = {"data": {"first_name": "Ada"}}
+    token = make_token()
+
+    def calls():
+        token_info, user = sync_client.authenticate(token, fetch_user=True)
+        field = sync_client.users.get_user_field(OFFLINE_APP_ID, "user_offline", "first_name")
+        link = sync_client.smart_links.create_magic_link("email", {"email": "ada@example.com"})
+        return token_info.user_id, user.data, field, link["link"]
+
+    assert await asyncio.to_thread(calls) == (
+        "user_offline", {"first_name": "Ada"}, "Ada", "https://rownd.link/ada@example.com",
+    )
+    assert sync_client.auth.validate_cached == sync_client.client.auth.validate_cached
+    assert sync_client.users.get_user.__name__ == "get_user"
+
+async def test_async_generators_become_generators(sync_client, make_token):
+    """Test that validate_tokens streams its results to a blocking caller"""
+    from rownd_flask.exceptions import AuthenticationError
+
+    tokens = [make_token(jti="a"), "not-a-token", make_token(jti="b")]
+
+    def calls():
+        results = list(sync_client.auth.validate_tokens(tokens, max_workers=1))
+        partial = sync_client.auth.validate_tokens(tokens, max_workers=1)
+        first = next(partial)
+        partial.close()
+        return results, first
+
+    results, first = await asyncio.to_thread(calls)
+    assert [r.decoded_token["jti"] for r in (results[0], results[2])] == ["a", "b"]
+    assert isinstance(results[1], AuthenticationError)
+    assert first.decoded_token["jti"] == "a"
+
+async def test_state_survives_across_calls(sync_client, auth_stub, make_token):
+    """Test that keys, caches and connections persist between calls"""
+    auth_stub.users["user_1"] = {"data": {}}
+    token = make_token()
+
+    def calls():
+        return [
+            (sync_client.auth.validate_token(token).user_id, sync_client.users.get_user("user_1").id)
+            for _ in range(5)
+        ]
+
+    assert await asyncio.to_thread(calls) == [("user_offline", "user_1")] * 5
+    assert auth_stub.hits == {"config": 1, "jwks": 1}
+    assert len(auth_stub.peers) == 1
+    session = sync_client.transport._async_sessions[get_background_loop().loop]
+    assert session._loop is get_background_loop().loop
+    await asyncio.to_thread(sync_client.close)
+    # The facade was handed stub_client, so it leaves it open
+    assert not session.closed
+
+async def test_close_only_closes_an_owned_client(auth_stub):
+    """Test that a facade closes the client it created"""
+    owner = RowndClientSync("key", "secret", app_id=OFFLINE_APP_ID, base_url=auth_stub.base_url)
+    auth_stub.users["user_1"] = {"data": {}}
+    await asyncio.to_thread(owner.users.get_user, "user_1")
+    session = owner.transport._async_sessions[get_background_loop().loop]
+
+    await asyncio.to_thread(owner.close)
+    assert session.closed
+
+async def test_many_threads_share_the_loop(sync_client, auth_stub):
+    """Test that calls from concurrent threads overlap on the background loop"""
+    auth_stub.delay = 0.2
+    for i in range(16):
+        auth_stub.users[f"user_{i}"] = {"data": {"n": i}}
+    results = {}
+
+    def fetch(i):
+        results[i] = sync_client.users.get_user(f"user_{i}").data["n"]
+
+    def run_threads():
+        threads = [threading.Thread(target=fetch, args=(i,)) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    start = asyncio.get_running_loop().time()
+    await asyncio.to_thread(run_threads)
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert results == {i: i for i in range(16)}
+    assert elapsed < 0.6
+
+async def test_cached_tokens_skip_the_loop(offline_client, make_token, monkeypatch):
+    """Test that a warm token is answered in the calling thread"""
+    client = RowndClientSync(client=offline_client)
+    token = make_token()
+    assert client.authenticate(token)[0].user_id == "user_offline"
+
+    monkeypatch.setattr(client, "run", lambda *args: pytest.fail("loop used for a cached token"))
+    assert client.authenticate(token)[0].user_id == "user_offline"
@@ -0,0 +1,77 @@
+import time
+import pytest
+from rownd_flask.exceptions import AuthenticationError
+from rownd_flask.utils.cache import NegativeCache, TokenCache
+
+pytestmark = pytest.mark.asyncio
+
+async def test_repeat_validation_hits_cache(offline_client, make_token):
+    """Test that a second validation of the same token is served from cache"""
+    token = make_token()
+    first = await offline_client.auth.validate_token(token)
+    second = await offline_client.auth.validate_token(token)
+
+    assert second is first
+    stats = offline_client.auth.token_cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.size == 1
+
+async def test_failed_validation_is_not_cached(offline_client, make_token):
+    """Test that rejected tokens never enter the cache"""
+    token = make_token(aud=["app:someone_else"])
+    with pytest.raises(AuthenticationError):
+        await offline_client.auth.validate_token(token)
+    assert len(offline_client.auth.token_cache) == 0
+
+async def test_entry_does_not_outlive_exp():
+    """Test that cached entries expire with the token"""
+    cache = TokenCache(maxsize=4)
+    cache.set("token", "validation", expires_at=time.time() + 1, kid="k1")
+    assert cache.get("token") == "validation"
+    assert cache.get("token", now=time.time() + 2) is None
+    assert len(cache) == 0
+
+async def test_lru_eviction_and_kid_rotation():
+    """Test size bound and purging of entries for rotated keys"""
+    cache = TokenCache(maxsize=2)
+    expires_at = time.time() + 60
+    cache.set("a", 1, expires_at, kid="old")
+    cache.set("b", 2, expires_at, kid="new")
+    cache.get("a")
+    cache.set("c", 3, expires_at, kid="new")
+
+    assert cache.get("b") is None
+    assert cache.stats().evictions == 1
+
+    cache.retain_kids(["new"])
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+
+async def test_rejected_token_is_remembered(offline_client, make_token):
+    """Test that a replayed bad token is rejected from the negative cache"""
+    token = make_token(exp=1)
+    for _ in range(3):
+        with pytest.raises(AuthenticationError) as exc_info:
+            await offline_client.auth.validate_token(token)
+        assert str(exc_info.value) == "Token has expired"
+
+    stats = offline_client.auth.negative_cache.stats()
+    assert stats.hits == 2
+    assert stats.size == 1
+
+async def test_unknown_kid_is_not_remembered(offline_client, make_token):
+    """Test that unknown-kid rejections stay eligible for a key rotation"""
+    with pytest.raises(AuthenticationError):
+        await offline_client.auth.validate_token(make_token(kid="sig-next"))
+    assert len(offline_client.auth.negative_cache) == 0
+
+async def test_negative_cache_is_bounded():
+    """Test the negative cache size cap and TTL"""
+    cache = NegativeCache(maxsize=2, ttl=10)
+    for token in ("a", "b", "c"):
+        cache.set(token, "Invalid token format")
+    assert cache.get("a") is None
+    assert cache.get("c") == "Invalid token format"
+    assert cache.get("c", now=time.time() + 11) is None
+    assert cache.stats().evictions == 1
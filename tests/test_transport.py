@@ -0,0 +1,113 @@
+import asyncio
+import pytest
+from rownd_flask.client import RowndClient
+from rownd_flask.utils.http import Transport
+from .conftest import OFFLINE_APP_ID
+
+pytestmark = pytest.mark.asyncio
+
+async def test_async_calls_reuse_connections(stub_client, auth_stub):
+    """Test that repeated API calls share one keep-alive connection"""
+    auth_stub.users["user_1"] = {"data": {}}
+
+    for _ in range(10):
+        await stub_client.users.get_user("user_1")
+
+    assert auth_stub.user_hits == 10
+    assert len(auth_stub.peers) == 1
+
+async def test_sync_calls_reuse_connections(stub_client, auth_stub):
+    """Test that blocking calls go through the pooled session too"""
+    auth_stub.users["user_1"] = {"data": {"first_name": "Ada"}}
+    url = f"{auth_stub.base_url}/applications/{OFFLINE_APP_ID}/users/user_1/data"
+
+    def fetch_fields():
+        return [
+            stub_client.transport.request_sync("GET", url).json()["data"]["first_name"]
+            for _ in range(5)
+        ]
+
+    # The stub runs on this loop, so make the blocking calls from a thread
+    assert await asyncio.to_thread(fetch_fields) == ["Ada"] * 5
+    assert len(auth_stub.peers) == 1
+
+async def test_components_share_the_client_transport(stub_client):
+    """Test that every manager and the key provider use the client's transport"""
+    transport = stub_client._transport
+    assert stub_client.users.client._transport is transport
+    assert stub_client.groups._transport is transport
+    assert stub_client.smart_links._transport is transport
+    assert stub_client.auth.keys._transport is transport
+
+async def test_pool_limits_and_lifecycle():
+    """Test pool configuration and that aclose closes only an owned transport"""
+    client = RowndClient("key", "secret", pool_size=8, pool_per_host=4, keepalive_timeout=5)
+    session = await client._transport.get_async_session()
+    assert (session.connector.limit, session.connector.limit_per_host) == (8, 4)
+
+    shared = Transport()
+    borrower = RowndClient("key", "secret", transport=shared)
+    shared_session = await shared.get_async_session()
+    await borrower.aclose()
+    assert not shared_session.closed
+
+    await client.aclose()
+    await shared.aclose()
+    assert session.closed and shared_session.closed
+
+async def test_sessions_of_closed_loops_are_released():
+    """Test that one event loop per call does not leak a session per loop"""
+    transport = Transport(pool_hosts=3)
+    assert transport.session.get_adapter("https://api.rownd.io")._pool_connections == 3
+
+    def per_call_loops():
+        sessions = [asyncio.run(transport.get_async_session()) for _ in range(3)]
+        assert len(transport._async_sessions) == 1
+        asyncio.run(transport.aclose())
+        return sessions
+
+    sessions = await asyncio.to_thread(per_call_loops)
+    assert transport._async_sessions == {}
+    assert all(session.closed for session in sessions)
+    assert all(session.connector is None for session in sessions)
+
+async def test_concurrent_identical_gets_are_coalesced(stub_client, auth_stub):
+    """Test that overlapping GETs for one user share a single upstream call"""
+    auth_stub.delay = 0.1
+    auth_stub.users["user_1"] = {"data": {"first_name": "Ada"}}
+
+    users = await asyncio.gather(*(stub_client.users.get_user("user_1") for _ in range(10)))
+
+    assert auth_stub.user_hits == 1
+    assert stub_client.transport.dedup.collapsed == 9
+    # Each caller decoded its own copy
+    users[0].data["first_name"] = "Changed"
+    assert [u.data["first_name"] for u in users[1:]] == ["Ada"] * 9
+
+    # Once the shared call has finished, the next GET goes upstream again
+    await stub_client.users.get_user("user_1")
+    assert auth_stub.user_hits == 2
+
+async def test_coalescing_respects_credentials_and_methods(stub_client, auth_stub):
+    """Test that other credentials, writes and disabled coalescing are not shared"""
+    auth_stub.delay = 0.1
+    auth_stub.users["user_1"] = {"data": {}}
+    transport = stub_client.transport
+    url = f"{auth_stub.base_url}/applications/{OFFLINE_APP_ID}/users/user_1/data"
+
+    await asyncio.gather(
+        transport.request("GET", url, headers={"x-rownd-app-key": "a", "x-rownd-app-secret": "s"}),
+        transport.request("GET", url, headers={"x-rownd-app-key": "b", "x-rownd-app-secret": "s"}),
+        transport.request("GET", url, headers={"X-Rownd-App-Key": "b", "x-rownd-app-secret": "s"}),
+    )
+    assert (auth_stub.user_hits, transport.dedup.collapsed) == (2, 1)
+
+    await asyncio.gather(*(
+        stub_client.users.patch_user(OFFLINE_APP_ID, "user_1", {"n": i}) for i in range(3)
+    ))
+    assert auth_stub.user_hits == 5
+
+    plain = Transport(coalesce=False)
+    await asyncio.gather(plain.request("GET", url), plain.request("GET", url))
+    await plain.aclose()
+    assert auth_stub.user_hits == 7